@@ -20,24 +20,25 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "hardware")))
 
-from actuators.ultrasonic import UltrasonocController
-from sensors.mq135 import MQ135Sensor
-from sensors.mq7 import MQ7Sensor
-from sensors.mq4 import MQ4Sensor
-from sensors.ens import ENSSensor
-from sensors.gp2y import GP2YSensor
-from actuators.fan import FanController
-
-# 센서 초기화
-mq135 = MQ135Sensor()
-mq7 = MQ7Sensor()
-mq4 = MQ4Sensor()
-ens = ENSSensor()
-gp2y = GP2YSensor()
-fan1 = FanController(pin=19)
-fan2 = FanController(pin=13)
-ultrasonic1 = UltrasonocController(pin=6)
-ultrasonic2 = UltrasonocController(pin=5)
+from hal import create_backend
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from smell_classifier import SmellClassifier
+from windowing import build_dataset, WINDOW_SIZE, X_COLUMNS, Y_COLUMNS
+from sensor_ring import SensorRingBuffer
+from csv_logger import BufferedCSVLogger
+
+# 센서 초기화 (HARDWARE_BACKEND=sim 이면 시뮬레이터)
+hardware = create_backend()
+mq135 = hardware.mq135()
+mq7 = hardware.mq7()
+mq4 = hardware.mq4()
+ens = hardware.ens()
+gp2y = hardware.gp2y()
+fan1 = hardware.fan(pin=19)
+fan2 = hardware.fan(pin=13)
+ultrasonic1 = hardware.ultrasonic(pin=6)
+ultrasonic2 = hardware.ultrasonic(pin=5)
 time.sleep(0.1)
 ultrasonic1.turn_off()
 ultrasonic2.turn_off()
@@ -47,8 +48,9 @@ DATA_FILE = "air_quality_data.csv"
 AIR_QUALITY_MODEL_FILE = "air_quality_model.keras"
 AIR_QUALITY_SCALER_FILE = "air_quality_scaler.pkl"
 SMELL_MODEL_FILE = "smell_classification_model.pkl"
+data_logger = BufferedCSVLogger(DATA_FILE)
 
-sensor_data_list = []
+sensor_history = SensorRingBuffer()
 real_value_history = []
 prediction_history = []
 prediction_count = 0
@@ -61,13 +63,7 @@ DIFFUSER_COOLDOWN = 300
 def collect_data(interval=3):
     global collecting
 
-    if os.path.exists(SMELL_MODEL_FILE):
-        class_model, class_scaler = joblib.load(SMELL_MODEL_FILE)
-        smell_labels = ["✅ 약함", "⚠️ 보통", "🚨 강함"]
-        print("✅ 냄새 분류 모델 로드 완료")
-    else:
-        class_model = None
-        print("⚠️ 냄새 분류 모델이 없어 냄새 예측을 건너뜁니다")
+    smell_classifier = SmellClassifier(SMELL_MODEL_FILE)
 
     while collecting:
         ens_data = ens.get_data() or {}
@@ -89,34 +85,21 @@ def collect_data(interval=3):
         }
 
         smell_level = None
-        if class_model:
-            class_input_data = pd.DataFrame([[
-                record.get("tvoc", 0),
-                record.get("eco2", 0),
-                record.get("pm2.5", 0),
-                record.get("mq4", 0),
-                record.get("mq7", 0),
-                record.get("mq135", 0),
-            ]], columns=["tvoc", "eco2", "pm2.5", "mq4", "mq7", "mq135"])
-
-            scaled_input = class_scaler.transform(class_input_data)
-            smell_prediction = class_model.predict(scaled_input)[0]
-            smell_level = smell_labels[smell_prediction]
-
+        smell_prediction = smell_classifier.classify(record)
+        if smell_prediction is not None:
+            smell_level = SmellClassifier.label(smell_prediction)
             record["smell_level"] = smell_prediction
-
         else:
             record["smell_level"] = 0
 
-        sensor_data_list.append(record)
+        sensor_history.append(record)
         print("Collected:", record)
         if smell_level:
             print(f"👃 smell: {smell_level}")
 
         calculate_air_quality_score(record)
     
-        df = pd.DataFrame([record])
-        df.to_csv(DATA_FILE, mode='a', index=False, header=not os.path.exists(DATA_FILE))
+        data_logger.write(record)
         
         time.sleep(interval)
 
@@ -157,23 +140,13 @@ def calculate_air_quality_score(record):
 
 # 모델 학습 함수
 def train_regression_model():
+    data_logger.flush()
     df = pd.read_csv(DATA_FILE)
     df = df.dropna()
     
-    X_columns = ["tvoc", "eco2", "pm2.5", "mq4", "mq7", "mq135", "air_quality", "smell_level"]
-    future_df = df.shift(-2)
-    y_columns = ["eco2", "pm2.5", "air_quality"]
-
-    X_list = []
-    for i in range(14, len(df)-2):
-        merged = []
-        for j in range(14, -1, -1):
-            merged += df.iloc[i-j][X_columns].tolist()
-        X_list.append(merged)
-
-    y = future_df[y_columns].iloc[14:-2].values
-
-    X = np.array(X_list)
+    # (샘플, 15, 특성) 윈도우와 2 스텝 뒤 타깃을 한 번에 생성 후 스케일링을 위해 평탄화
+    X, y = build_dataset(df)
+    X = X.reshape(X.shape[0], -1)
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
     X_scaler = StandardScaler()
@@ -257,22 +230,9 @@ def predict_air_quality():
     X_scaler, y_scaler = joblib.load(AIR_QUALITY_SCALER_FILE)
 
     while True:
-        if len(sensor_data_list) >= 15:
-            merged_input = []
-            for i in range(15):
-                latest_data = sensor_data_list[-(15-i)]
-                merged_input += [
-                    latest_data.get("tvoc", 0),
-                    latest_data.get("eco2", 0),
-                    latest_data.get("pm2.5", 0),
-                    latest_data.get("mq4", 0),
-                    latest_data.get("mq7", 0),
-                    latest_data.get("mq135", 0),
-                    latest_data.get("air_quality", 0),
-                    latest_data.get("smell_level", 0),
-                ]
-            
-            input_data = np.array(merged_input).reshape(1, -1)  # (1, 특성수)
+        window = sensor_history.window(WINDOW_SIZE, X_COLUMNS)
+        if window is not None:
+            input_data = window.reshape(1, -1)  # (1, 특성수)
             reg_input = X_scaler.transform(input_data)
             reg_input = reg_input.reshape(1, 15, -1)
 
@@ -285,16 +245,12 @@ def predict_air_quality():
     
         print(f"✅ 예측된 eCO2: {predicted_eco2:.2f}, PM2.5: {predicted_pm25:.2f}, air_quality: {predicted_air_quality:.2f}")
         
-        current_smell = merged_input[-1]
+        current_smell = window[-1, X_COLUMNS.index("smell_level")]
         set_fan_pump_by_air_quality(predicted_air_quality, current_smell)
 
         # 예측값/실제값 저장
         prediction_history.append(air_quality_prediction)
-        real_value_history.append([
-            sensor_data_list[-2].get("eco2", 0),
-            sensor_data_list[-2].get("pm2.5", 0),
-            sensor_data_list[-2].get("air_quality", 0),
-        ])
+        real_value_history.append(sensor_history.row(-2, Y_COLUMNS).tolist())
 
         if len(prediction_history) > 10:
             prediction_history.pop(0)
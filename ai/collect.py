@@ -1,7 +1,5 @@
 import time
 import os
-import csv
-import pandas as pd
 from datetime import datetime
 
 import sys
@@ -13,6 +11,9 @@ from sensors.mq135 import MQ135Sensor
 from sensors.mq7 import MQ7Sensor
 from sensors.mq4 import MQ4Sensor
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from csv_logger import BufferedCSVLogger
+
 # 🔹 센서 및 액추에이터 초기화
 mq135 = MQ135Sensor()
 mq7 = MQ7Sensor()
@@ -24,13 +25,12 @@ gp2y = GP2YSensor()
 location = input("장소 또는 상황명을 입력하세요: ").strip()
 filename = f"{location}.csv"
 
-# 🔹 기존 파일이 있는지 확인 (헤더 존재 여부 판단)
-file_exists = os.path.isfile(filename)
+# 🔹 기존 파일이 있으면 이어서 저장, 없으면 헤더와 함께 새로 생성
+data_logger = BufferedCSVLogger(filename, flush_rows=10, encoding="utf-8-sig")
 
 # 🔹 1분 동안 센서 데이터 측정
 print("측정 시작...\n")
 start_time = time.time()
-collected_data = []
 
 while time.time() - start_time < 60:
     # ✅ 센서 데이터 읽기
@@ -52,17 +52,11 @@ while time.time() - start_time < 60:
         "air_quality": ens_data.get("air_quality"),
     }
     
-    collected_data.append(sensor_data)
+    data_logger.write(sensor_data)
     print(sensor_data)  # 디버깅용 출력
     time.sleep(2)  # 2초 간격으로 측정
 
-# 🔹 측정된 데이터 CSV로 저장
-df = pd.DataFrame(collected_data)
-
-# ✅ 기존 파일이 있다면 이어서 저장, 없으면 새로 생성
-if file_exists:
-    df.to_csv(filename, mode='a', header=False, index=False, encoding="utf-8-sig")
-else:
-    df.to_csv(filename, mode='w', header=True, index=False, encoding="utf-8-sig")
+# 🔹 남은 데이터 저장 후 파일 닫기
+data_logger.close()
 
 print(f"\n✅ 데이터 저장 완료! {filename} 파일에 저장되었습니다.")
\ No newline at end of file
@@ -17,6 +17,9 @@ from sensors.mq4 import MQ4Sensor
 from sensors.ens import ENSSensor
 from sensors.gp2y import GP2YSensor
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from csv_logger import BufferedCSVLogger
+
 # 센서 초기화
 mq135 = MQ135Sensor()
 mq7 = MQ7Sensor()
@@ -26,6 +29,7 @@ gp2y = GP2YSensor()
 
 DATA_FILE = "smell_data.csv"
 MODEL_FILE = "smell_classification_model.pkl"
+data_logger = BufferedCSVLogger(DATA_FILE)
 
 # 악취 라벨 포함 데이터 수집 함수
 def collect_smell_data(interval=5, max_records=20):
@@ -70,8 +74,9 @@ def collect_smell_data(interval=5, max_records=20):
         print("\n🛑 수집이 중단되어 데이터는 저장되지 않습니다.")
         return
 
-    df = pd.DataFrame(records)
-    df.to_csv(DATA_FILE, mode='a', index=False, header=not os.path.exists(DATA_FILE))
+    # 중단 없이 끝난 측정만 한 묶음으로 저장
+    data_logger.write_rows(records)
+    data_logger.close()
     print(f"\n✅ 총 {records_collected}개 데이터가 저장되었습니다 → {DATA_FILE}")
 
 # 악취 분류 모델 학습
@@ -0,0 +1,81 @@
+import atexit
+import csv
+import os
+import threading
+import time
+
+
+class BufferedCSVLogger:
+    def __init__(self, path, fieldnames=None, flush_rows=30, flush_interval=60.0, encoding="utf-8", fsync=True):
+        """행 단위 CSV 기록을 모아서 한 번에 쓰는 로거
+        - 파일 핸들을 열어 둔 채로 flush_rows 행 또는 flush_interval 초마다 일괄 기록
+        - 기록 후 fsync 하므로 비정상 종료 시 잃는 데이터는 최대 한 묶음
+        - 종료 시(atexit) 남은 행을 기록하고 파일을 닫음
+        - fieldnames 를 생략하면 첫 레코드의 키 순서를 헤더로 사용
+        """
+        self.path = path
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.encoding = encoding
+        self.fsync = fsync
+
+        self._file = None
+        self._writer = None
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _open(self):
+        if self.fieldnames is None:
+            self.fieldnames = list(self._buffer[0].keys())
+        self._file = open(self.path, "a", newline="", encoding=self.encoding)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore", lineterminator="\n")
+        # 🔹 새 파일(또는 빈 파일)일 때만 헤더 기록
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def _flush_locked(self):
+        if self._buffer:
+            if self._file is None:
+                self._open()
+            self._writer.writerows(self._buffer)
+            self._buffer = []
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def write_rows(self, records):
+        with self._lock:
+            self._buffer.extend(records)
+            self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """남은 행을 기록하고 파일을 닫음 (다음 write 시 다시 열림)"""
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._writer = None
+
+    def discard(self):
+        """기록하지 않은 행을 버리고 파일을 닫음 (파일 삭제 전 사용)"""
+        with self._lock:
+            self._buffer = []
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._writer = None
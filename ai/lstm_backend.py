@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+
+# 단일 윈도우 추론 방식 (.env 의 LSTM_BACKEND 로 선택)
+# - predict: 기존 Keras model.predict (배치/콜백 구성 비용 포함)
+# - call:    tf.function 으로 고정한 model(x, training=False) 직접 호출
+# - tflite:  TFLite 로 변환 후 Interpreter 로 실행
+# - numpy:   내보낸 가중치(.npz)로 NumPy 순전파 (디바이스에서 TensorFlow import 불필요)
+BACKENDS = ("predict", "call", "tflite", "numpy")
+DEFAULT_BACKEND = "numpy"
+
+
+def selected_backend():
+    backend = os.getenv("LSTM_BACKEND", DEFAULT_BACKEND).strip().lower()
+    if backend not in BACKENDS:
+        print(f"⚠️ 알 수 없는 LSTM_BACKEND '{backend}', '{DEFAULT_BACKEND}' 사용")
+        backend = DEFAULT_BACKEND
+    return backend
+
+
+def _predict_runner(model):
+    def run(x):
+        return model.predict(x, verbose=0)[0]
+    return run
+
+
+def _call_runner(model):
+    import tensorflow as tf
+
+    input_shape = tuple(model.inputs[0].shape[1:])
+
+    @tf.function(input_signature=[tf.TensorSpec((1,) + input_shape, tf.float32)])
+    def forward(x):
+        return model(x, training=False)
+
+    def run(x):
+        return forward(np.asarray(x, dtype=np.float32)).numpy()[0]
+    return run
+
+
+def _tflite_runner(model):
+    import tempfile
+    import tensorflow as tf
+
+    input_shape = tuple(model.inputs[0].shape[1:])
+
+    # 🔹 배치 크기를 1로 고정한 SavedModel 을 거쳐야 LSTM 이 TFLite 내장 연산으로 변환됨
+    with tempfile.TemporaryDirectory() as export_dir:
+        model.export(export_dir, input_signature=[tf.TensorSpec((1,) + input_shape, tf.float32)], verbose=False)
+        tflite_model = tf.lite.TFLiteConverter.from_saved_model(export_dir).convert()
+
+    interpreter = tf.lite.Interpreter(model_content=tflite_model, num_threads=1)
+    interpreter.allocate_tensors()
+    input_index = interpreter.get_input_details()[0]["index"]
+    output_index = interpreter.get_output_details()[0]["index"]
+
+    def run(x):
+        interpreter.set_tensor(input_index, np.asarray(x, dtype=np.float32))
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)[0].copy()
+    return run
+
+
+def make_runner(model, backend=None):
+    """Keras 모델로 (1, 15, 특성) 입력 → (출력수,) 예측 함수를 생성"""
+    backend = backend or selected_backend()
+    if backend == "numpy":
+        from lstm_numpy import from_keras
+        return from_keras(model)
+    if backend == "tflite":
+        try:
+            return _tflite_runner(model)
+        except Exception as e:
+            print(f"⚠️ TFLite 변환 실패, call 방식으로 대체: {e}")
+            backend = "call"
+    if backend == "call":
+        return _call_runner(model)
+    return _predict_runner(model)
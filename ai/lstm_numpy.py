@@ -0,0 +1,154 @@
+import os
+
+import numpy as np
+
+# TensorFlow 없이 학습된 Sequential(LSTM, LSTM, Dense, Dense) 모델을 실행하기 위한 NumPy 런타임
+# - export_npz: 학습 프로세스에서 가중치와 스케일러를 .npz 하나로 저장
+# - load_npz:   디바이스에서 NumPy 만으로 (러너, X_scaler, y_scaler) 복원
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _hard_sigmoid(x):
+    return np.clip(x / 6.0 + 0.5, 0.0, 1.0)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "hard_sigmoid": _hard_sigmoid,
+}
+
+
+class ArrayScaler:
+    """StandardScaler 의 mean_/scale_ 만 보관하는 경량 스케일러"""
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+    def inverse_transform(self, X):
+        return np.asarray(X, dtype=np.float64) * self.scale_ + self.mean_
+
+
+class NumpyLSTMModel:
+    def __init__(self, layers):
+        """layers: [("lstm", kernel, recurrent_kernel, bias, activation, recurrent_activation, return_sequences)
+                    | ("dense", kernel, bias, activation), ...]"""
+        self.layers = layers
+
+    @staticmethod
+    def _lstm(x, kernel, recurrent_kernel, bias, activation, recurrent_activation, return_sequences):
+        """Keras LSTM 순전파 (게이트 순서 i, f, c, o)"""
+        units = recurrent_kernel.shape[0]
+        act = ACTIVATIONS[activation]
+        rec_act = ACTIVATIONS[recurrent_activation]
+
+        # 🔹 입력 투영은 전체 시퀀스에 대해 한 번에 계산
+        x_proj = x @ kernel + bias
+        h = np.zeros(units, dtype=x.dtype)
+        c = np.zeros(units, dtype=x.dtype)
+        outputs = np.empty((x.shape[0], units), dtype=x.dtype) if return_sequences else None
+
+        for t in range(x.shape[0]):
+            z = x_proj[t] + h @ recurrent_kernel
+            i = rec_act(z[:units])
+            f = rec_act(z[units:2 * units])
+            g = act(z[2 * units:3 * units])
+            o = rec_act(z[3 * units:])
+            c = f * c + i * g
+            h = o * act(c)
+            if return_sequences:
+                outputs[t] = h
+
+        return outputs if return_sequences else h
+
+    def __call__(self, x):
+        """x: (1, 시퀀스, 특성) 또는 (시퀀스, 특성) → (출력수,)"""
+        out = np.asarray(x, dtype=np.float32).reshape(-1, np.shape(x)[-1])
+        for layer in self.layers:
+            if layer[0] == "lstm":
+                out = self._lstm(out, *layer[1:])
+            else:
+                _, kernel, bias, activation = layer
+                out = ACTIVATIONS[activation](out @ kernel + bias)
+        return out
+
+
+def _activation_name(activation):
+    if isinstance(activation, str):
+        return activation
+    return getattr(activation, "__name__", str(activation))
+
+
+def from_keras(model):
+    """학습된 Keras 모델에서 NumPy 모델 생성"""
+    layers = []
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+        weights = [np.asarray(w, dtype=np.float32) for w in layer.get_weights()]
+        if kind == "LSTM":
+            kernel, recurrent_kernel, bias = weights
+            layers.append(("lstm", kernel, recurrent_kernel, bias,
+                           _activation_name(layer.activation),
+                           _activation_name(layer.recurrent_activation),
+                           bool(layer.return_sequences)))
+        elif kind == "Dense":
+            kernel, bias = weights
+            layers.append(("dense", kernel, bias, _activation_name(layer.activation)))
+        elif kind in ("InputLayer", "Dropout"):
+            continue
+        else:
+            raise ValueError(f"지원하지 않는 레이어: {kind}")
+    return NumpyLSTMModel(layers)
+
+
+def export_npz(model, X_scaler, y_scaler, path):
+    """Keras 모델 가중치와 스케일러를 .npz 하나로 저장 (임시 파일 후 교체)"""
+    numpy_model = from_keras(model)
+    arrays = {
+        "x_mean": X_scaler.mean_, "x_scale": X_scaler.scale_,
+        "y_mean": y_scaler.mean_, "y_scale": y_scaler.scale_,
+    }
+    layer_specs = []
+    for idx, layer in enumerate(numpy_model.layers):
+        if layer[0] == "lstm":
+            _, kernel, recurrent_kernel, bias, activation, recurrent_activation, return_sequences = layer
+            arrays[f"l{idx}_kernel"] = kernel
+            arrays[f"l{idx}_recurrent_kernel"] = recurrent_kernel
+            arrays[f"l{idx}_bias"] = bias
+            layer_specs.append(f"lstm:{activation}:{recurrent_activation}:{int(return_sequences)}")
+        else:
+            _, kernel, bias, activation = layer
+            arrays[f"l{idx}_kernel"] = kernel
+            arrays[f"l{idx}_bias"] = bias
+            layer_specs.append(f"dense:{activation}")
+    arrays["layers"] = np.array(layer_specs)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_npz(path):
+    """.npz 에서 (NumPy 모델, X_scaler, y_scaler) 복원"""
+    with np.load(path, allow_pickle=False) as data:
+        layers = []
+        for idx, spec in enumerate(data["layers"]):
+            parts = str(spec).split(":")
+            if parts[0] == "lstm":
+                layers.append(("lstm", data[f"l{idx}_kernel"], data[f"l{idx}_recurrent_kernel"], data[f"l{idx}_bias"],
+                               parts[1], parts[2], parts[3] == "1"))
+            else:
+                layers.append(("dense", data[f"l{idx}_kernel"], data[f"l{idx}_bias"], parts[1]))
+        X_scaler = ArrayScaler(data["x_mean"], data["x_scale"])
+        y_scaler = ArrayScaler(data["y_mean"], data["y_scale"])
+    return NumpyLSTMModel(layers), X_scaler, y_scaler
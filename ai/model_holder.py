@@ -0,0 +1,79 @@
+import os
+import threading
+
+import joblib
+import numpy as np
+
+from lstm_backend import make_runner, selected_backend
+
+
+class AirQualityModelHolder:
+    def __init__(self, model_file, scaler_file, npz_file):
+        """공기질 예측 모델 상주 홀더
+        - 모델/스케일러는 한 번만 로드하고 메모리에서 예측
+        - 재학습이 끝나면 (모델, X_scaler, y_scaler) 묶음을 한 번에 교체
+        - 예측은 항상 같은 시점의 묶음 하나만 사용하므로 반쯤 교체된 모델을 보지 않음
+        - 추론 방식은 lstm_backend (LSTM_BACKEND) 설정을 따름
+        - numpy 방식은 .npz 만 읽으므로 TensorFlow 를 import 하지 않음
+        """
+        self.model_file = model_file
+        self.scaler_file = scaler_file
+        self.npz_file = npz_file
+        self._bundle = None  # (runner, X_scaler, y_scaler)
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self._bundle is not None
+
+    def load(self):
+        """디스크에서 모델/스케일러를 읽어 교체, 파일이 없으면 False"""
+        if selected_backend() == "numpy":
+            return self._load_npz()
+
+        if not (os.path.exists(self.model_file) and os.path.exists(self.scaler_file)):
+            return False
+
+        from tensorflow.keras.models import load_model
+
+        with self._lock:
+            model = load_model(self.model_file)
+            X_scaler, y_scaler = joblib.load(self.scaler_file)
+            self._bundle = (make_runner(model), X_scaler, y_scaler)
+        print("✅ 공기질 예측 모델 로드 완료")
+        return True
+
+    def _load_npz(self):
+        if not os.path.exists(self.npz_file):
+            return False
+
+        from lstm_numpy import load_npz
+
+        with self._lock:
+            self._bundle = load_npz(self.npz_file)
+        print("✅ 공기질 예측 모델 로드 완료 (NumPy)")
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._bundle = None
+
+    def get(self):
+        """현재 묶음 반환, 아직 없으면 디스크에서 1회 로드 시도"""
+        bundle = self._bundle
+        if bundle is None and self.load():
+            bundle = self._bundle
+        return bundle
+
+    def predict(self, input_data):
+        """input_data: (1, 15 * 특성수) 평탄화된 입력 → 역정규화된 예측값 (eco2, pm2.5, air_quality)"""
+        bundle = self.get()
+        if bundle is None:
+            return None
+        runner, X_scaler, y_scaler = bundle
+
+        reg_input = X_scaler.transform(np.asarray(input_data).reshape(1, -1))
+        reg_input = reg_input.reshape(1, 15, -1)  # (샘플, 시퀀스 길이 15, 특성수)
+
+        prediction = runner(reg_input)
+        return y_scaler.inverse_transform([prediction])[0]
@@ -4,15 +4,19 @@ import math
 import time
 import joblib
 
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Input
-from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping
-from tensorflow.keras.models import load_model
 from sklearn.metrics import r2_score
 
+import sys
 import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from smell_classifier import SmellClassifier
+from model_holder import AirQualityModelHolder
+from windowing import build_dataset, WINDOW_SIZE, X_COLUMNS, Y_COLUMNS
+from sensor_ring import SensorRingBuffer
+from lstm_numpy import export_npz
+from train_worker import TrainingWorker
+from telemetry_store import TelemetryStore
 
 AI_RECOMMENDATION_MAP = {
     0: "약 3초 뒤에도 공기질이 양호할 것으로 예상됩니다. 쾌적한 환경입니다.",
@@ -37,15 +41,36 @@ DATA_FILE = os.path.join(BASE_DIR, "air_quality_data.csv")
 AIR_QUALITY_MODEL_FILE = os.path.join(BASE_DIR, "air_quality_model.keras")
 AIR_QUALITY_SCALER_FILE = os.path.join(BASE_DIR, "air_quality_scaler.pkl")
 SMELL_MODEL_FILE = os.path.join(BASE_DIR, "smell_classification_model.pkl")
+AIR_QUALITY_NPZ_FILE = os.path.join(BASE_DIR, "air_quality_model.npz")
+TELEMETRY_DIR = os.getenv("TELEMETRY_DIR", os.path.join(BASE_DIR, "telemetry"))
+# 학습에 사용할 최근 이력 시간 (비우면 전체), 저장소 보관 기간
+TRAIN_HISTORY_HOURS = float(os.getenv("TRAIN_HISTORY_HOURS", "24") or 0) or None
+TELEMETRY_RETENTION_HOURS = float(os.getenv("TELEMETRY_RETENTION_HOURS", "168"))
+# 새 센서 행 N개마다 예측 (메인 루프 2초 주기 기준 1 = 2초마다), 대기 중 중단 플래그 확인 간격(초)
+PREDICTION_EVERY = int(os.getenv("PREDICTION_EVERY", "1"))
+PREDICTION_WAIT_TIMEOUT = 5.0
+AIR_QUALITY_MODEL_TMP_FILE = os.path.join(BASE_DIR, "air_quality_model.tmp.keras")
+AIR_QUALITY_CHECKPOINT_FILE = os.path.join(BASE_DIR, "air_quality_model.ckpt.keras")
 print(DATA_FILE)
 
+# 냄새 분류 모델은 한 번만 로드하고, 파일이 바뀐 경우에만 다시 로드
+smell_classifier = SmellClassifier(SMELL_MODEL_FILE)
+# 공기질 예측 모델은 메모리에 상주시키고, 재학습이 끝나면 통째로 교체
+model_holder = AirQualityModelHolder(AIR_QUALITY_MODEL_FILE, AIR_QUALITY_SCALER_FILE, AIR_QUALITY_NPZ_FILE)
+# 센서 기록은 timestamp 가 있는 컬럼형 저장소에 일괄 저장 (30행 또는 60초마다)
+telemetry_store = TelemetryStore(TELEMETRY_DIR, retention_hours=TELEMETRY_RETENTION_HOURS)
+# 재학습은 별도 프로세스에서 (완료 전까지 기존 모델로 예측 유지)
+training_worker = TrainingWorker()
+
 previous_trend_messages = []
-sensor_data_list = []
+# 최근 센서 이력 (고정 크기 링 버퍼, 장시간 동작해도 메모리 일정)
+sensor_history = SensorRingBuffer()
 prediction_history = []
 real_value_history = []
 prediction_count = 0
 
 def clear_model():
+    telemetry_store.clear()
     if os.path.exists(DATA_FILE):
         os.remove(DATA_FILE)
         print("🗑️ 이전 공기질 데이터 초기화 완료!")
@@ -53,16 +78,12 @@ def clear_model():
         os.remove(AIR_QUALITY_MODEL_FILE)
         os.remove(AIR_QUALITY_SCALER_FILE)
         print("🗑️ 이전 공기질 예측 모델 초기화 완료!")
+    if os.path.exists(AIR_QUALITY_NPZ_FILE):
+        os.remove(AIR_QUALITY_NPZ_FILE)
+    model_holder.clear()
+    sensor_history.clear()
 
 def collect_data(raw, shared_prediction):
-    global sensor_data_list
-    if os.path.exists(SMELL_MODEL_FILE):
-        class_model, class_scaler = joblib.load(SMELL_MODEL_FILE)
-        smell_labels = ["✅ 약함", "⚠️ 보통", "🚨 강함"]
-    else:
-        class_model = None
-        print("⚠️ 냄새 분류 모델이 없어 냄새 예측을 건너뜁니다")
-
     if len(raw) == 0:
         return
     record = {
@@ -77,26 +98,14 @@ def collect_data(raw, shared_prediction):
         "air_quality": max(1, raw.get("air_quality") or 1),
     }
     smell_level = None
-    if class_model:
-        class_input_data = pd.DataFrame([[
-            record.get("tvoc", 0),
-            record.get("eco2", 0),
-            record.get("pm2.5", 0),
-            record.get("mq4", 0),
-            record.get("mq7", 0),
-            record.get("mq135", 0),
-        ]], columns=["tvoc", "eco2", "pm2.5", "mq4", "mq7", "mq135"])
-
-        scaled_input = class_scaler.transform(class_input_data)
-        smell_prediction = class_model.predict(scaled_input)[0]
-        smell_level = smell_labels[smell_prediction]
-
+    smell_prediction = smell_classifier.classify(record)
+    if smell_prediction is not None:
+        smell_level = SmellClassifier.label(smell_prediction)
         record["smell_level"] = smell_prediction
-
     else:
         record["smell_level"] = 0
 
-    sensor_data_list.append(record)
+    sensor_history.append(record)
     print("Collected:", record)
     if smell_level:
         print(f"👃 smell: {smell_level}")
@@ -104,8 +113,7 @@ def collect_data(raw, shared_prediction):
 
     shared_prediction["air_quality_score"] = calculate_air_quality_score(record)
 
-    df = pd.DataFrame([record])
-    df.to_csv(DATA_FILE, mode='a', index=False, header=not os.path.exists(DATA_FILE))
+    telemetry_store.append(record)
 
 
 # 종합 공기질 점수 계산 함수
@@ -143,30 +151,44 @@ def calculate_air_quality_score(record):
     print("🔔 종합공기질 점수: ", air_quality_score)
     return air_quality_score
 
-# 모델 학습 함수
+# LSTM 회귀 모델 구조 (15 스텝 윈도우 → eco2, pm2.5, air_quality)
+# TensorFlow 는 학습할 때만 import (디바이스 추론은 NumPy 런타임 사용)
+def build_regression_model(input_shape, n_outputs):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Input
+
+    model = Sequential()
+    model.add(Input(shape=input_shape))
+    model.add(LSTM(64, return_sequences=True, dropout=0.2))
+    model.add(LSTM(32))
+    model.add(Dense(32, activation='relu'))
+    model.add(Dense(n_outputs))
+    model.compile(optimizer='adam', loss='mse')
+    return model
+
+# 모델 학습 함수 (학습된 모델, X_scaler, y_scaler 반환)
 def train_regression_model():
-    global sensor_data_list
-    if not os.path.exists(DATA_FILE):
-        print("❌ 데이터 파일이 없습니다. 학습을 진행할 수 없습니다.")
+    # 최근 TRAIN_HISTORY_HOURS 시간 구간의 세그먼트만 읽음
+    history = telemetry_store.query(hours=TRAIN_HISTORY_HOURS)
+    if len(history["timestamp"]) == 0:
+        print("❌ 저장된 센서 데이터가 없습니다. 학습을 진행할 수 없습니다.")
         return
 
-    df = pd.read_csv(DATA_FILE)
+    df = pd.DataFrame(history)
     df = df.dropna()
 
-    X_columns = ["tvoc", "eco2", "pm2.5", "mq4", "mq7", "mq135", "air_quality", "smell_level"]
-    future_df = df.shift(-2)
-    y_columns = ["eco2", "pm2.5", "air_quality"]
-
-    X_list = []
-    for i in range(14, len(df)-2):
-        merged = []
-        for j in range(14, -1, -1):
-            merged += df.iloc[i-j][X_columns].tolist()
-        X_list.append(merged)
+    # (샘플, 15, 특성) 윈도우와 2 스텝 뒤 타깃을 한 번에 생성 후 스케일링을 위해 평탄화
+    X, y = build_dataset(df)
+    X = X.reshape(X.shape[0], -1)
+    if len(X) < 10:
+        print("❌ 학습 데이터가 부족합니다. 학습을 진행할 수 없습니다.")
+        return
 
-    y = future_df[y_columns].iloc[14:-2].values
+    # 무거운 학습 라이브러리는 데이터가 충분할 때만 로드
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping
 
-    X = np.array(X_list)
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
     X_scaler = StandardScaler()
@@ -180,16 +202,11 @@ def train_regression_model():
     y_train = y_scaler.fit_transform(y_train)
     y_test = y_scaler.transform(y_test)
 
-    model = Sequential()
-    model.add(Input(shape=(X_train.shape[1], X_train.shape[2])))
-    model.add(LSTM(64, return_sequences=True, dropout=0.2))
-    model.add(LSTM(32))
-    model.add(Dense(32, activation='relu'))
-    model.add(Dense(y_train.shape[1]))
-    model.compile(optimizer='adam', loss='mse')
+    model = build_regression_model((X_train.shape[1], X_train.shape[2]), y_train.shape[1])
 
     early_stop = EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True)
-    checkpoint = ModelCheckpoint(AIR_QUALITY_MODEL_FILE, save_best_only=True)
+    # 학습 중 체크포인트는 별도 파일에 저장 (사용 중인 모델 파일을 덮어쓰지 않음)
+    checkpoint = ModelCheckpoint(AIR_QUALITY_CHECKPOINT_FILE, save_best_only=True)
 
     epochs = 50
     batchsize = 32
@@ -202,9 +219,17 @@ def train_regression_model():
     r2 = r2_score(y_test, y_pred)
     print(f"✅ 공기질 예측 모델 결정 계수(R^2 Score): {r2:.2f}")
 
-    model.save(AIR_QUALITY_MODEL_FILE)
-    joblib.dump((X_scaler, y_scaler), AIR_QUALITY_SCALER_FILE)
+    # 임시 파일에 저장 후 교체하여 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+    model.save(AIR_QUALITY_MODEL_TMP_FILE)
+    joblib.dump((X_scaler, y_scaler), AIR_QUALITY_SCALER_FILE + ".tmp")
+    os.replace(AIR_QUALITY_MODEL_TMP_FILE, AIR_QUALITY_MODEL_FILE)
+    os.replace(AIR_QUALITY_SCALER_FILE + ".tmp", AIR_QUALITY_SCALER_FILE)
+    # 디바이스용 NumPy 런타임 가중치 (.npz) 도 함께 내보냄
+    export_npz(model, X_scaler, y_scaler, AIR_QUALITY_NPZ_FILE)
+    if os.path.exists(AIR_QUALITY_CHECKPOINT_FILE):
+        os.remove(AIR_QUALITY_CHECKPOINT_FILE)
     print("✅ 공기질 예측 모델 학습 완료 및 저장")
+    return model, X_scaler, y_scaler
 
 # 추세 분석
 def analyze_trend(real_value_history, prediction_history, shared_prediction):
@@ -264,39 +289,20 @@ def analyze_trend(real_value_history, prediction_history, shared_prediction):
 
 
 def predict_air_quality(shared_prediction):
-    global sensor_data_list
     global prediction_count
     global prediction_history
     global real_value_history
 
-    if not os.path.exists(AIR_QUALITY_MODEL_FILE):
+    if model_holder.get() is None:
         print("❌ 모델 파일이 없습니다. 먼저 학습을 실행하세요!")
+        start_training()
         return
 
-    reg_model = load_model(AIR_QUALITY_MODEL_FILE)
-    X_scaler, y_scaler = joblib.load(AIR_QUALITY_SCALER_FILE)
-
-    if len(sensor_data_list) >= 15:
-            merged_input = []
-            for i in range(15):
-                latest_data = sensor_data_list[-(15 - i)]
-                merged_input += [
-                    latest_data.get("tvoc", 0),
-                    latest_data.get("eco2", 0),
-                    latest_data.get("pm2.5", 0),
-                    latest_data.get("mq4", 0),
-                    latest_data.get("mq7", 0),
-                    latest_data.get("mq135", 0),
-                    latest_data.get("air_quality", 0),
-                    latest_data.get("smell_level", 0),
-                ]
-
-            input_data = np.array(merged_input).reshape(1, -1)  # (1, 특성수)
-            reg_input = X_scaler.transform(input_data)
-            reg_input = reg_input.reshape(1, 15, -1)  # (샘플, 시퀀스 길이 6, 특성수)
-
-            air_quality_prediction = reg_model.predict(reg_input)[0]
-            air_quality_prediction = y_scaler.inverse_transform([air_quality_prediction])[0]
+    # 최근 15 스텝 (15, 특성) 뷰
+    window = sensor_history.window(WINDOW_SIZE, X_COLUMNS)
+    if window is not None:
+            input_data = window.reshape(1, -1)  # (1, 특성수)
+            air_quality_prediction = model_holder.predict(input_data)
 
             predicted_eco2 = air_quality_prediction[0]
             predicted_pm25 = air_quality_prediction[1]
@@ -304,7 +310,7 @@ def predict_air_quality(shared_prediction):
 
             print(f"✅ 예측된 eCO2: {predicted_eco2:.2f}, PM2.5: {predicted_pm25:.2f}, air_quality: {predicted_air_quality:.2f}")
 
-            current_smell = merged_input[-1]
+            current_smell = window[-1, X_COLUMNS.index("smell_level")]
 
             # Update shared prediction dictionary
             shared_prediction["predicted_air_quality"] = predicted_air_quality
@@ -313,11 +319,7 @@ def predict_air_quality(shared_prediction):
 
             # 예측값/실제값 저장
             prediction_history.append(air_quality_prediction)
-            real_value_history.append([
-                sensor_data_list[-2].get("eco2", 0),
-                sensor_data_list[-2].get("pm2.5", 0),
-                sensor_data_list[-2].get("air_quality", 0),
-            ])
+            real_value_history.append(sensor_history.row(-2, Y_COLUMNS).tolist())
 
             if len(prediction_history) > 10:
                 prediction_history.pop(0)
@@ -335,10 +337,7 @@ def predict_air_quality(shared_prediction):
 
                         if r2 < 0.7:
                             print("⚠️ 결정계수가 0.7 이하입니다. 모델을 재학습합니다...")
-                            train_regression_model()
-                            reg_model = load_model(AIR_QUALITY_MODEL_FILE)
-                            X_scaler, y_scaler = joblib.load(AIR_QUALITY_SCALER_FILE)
-                            print("✅ 모델 재학습 완료 및 적용")
+                            start_training(force=True)
                     else:
                         print("⏳ 예측 결과가 아직 부족하여 R² 계산을 건너뜁니다.")
                 except Exception as e:
@@ -349,9 +348,39 @@ def predict_air_quality(shared_prediction):
             shared_prediction["aiRecommendation"] = analyze_trend(real_value_history, prediction_history, shared_prediction)
 
 
+# 버퍼에 남은 센서 기록을 파일에 쓴 뒤 백그라운드 학습 시작
+def start_training(force=False):
+    telemetry_store.flush()
+    return training_worker.start(force=force)
+
+
+# 백그라운드 학습이 끝났으면 새 모델로 교체
+def apply_trained_model():
+    if training_worker.poll() and model_holder.load():
+        print("✅ 모델 재학습 완료 및 적용")
+
+
+# 링 버퍼 행 수 total 이 target 에 닿았는지 판단, (예측 여부, 다음 target) 반환
+def prediction_due(target, total):
+    if total < target:
+        # 시간 초과 또는 clear (clear 되면 처음부터 다시 셈)
+        return False, min(target, total + PREDICTION_EVERY)
+    # 예측이 늦어 여러 행이 쌓였으면 최신 윈도우로 한 번만 예측
+    return True, total + PREDICTION_EVERY
+
+
+def prediction_step(shared_prediction):
+    apply_trained_model()
+    predict_air_quality(shared_prediction)
+
+
 def run_prediction_pipeline(shared_prediction):
     global stop_prediction
-    train_regression_model()
+    start_training(force=True)
+    # 🔹 고정 sleep 대신 링 버퍼에 새 센서 행이 들어오면 예측 (센서 주기와 맞물려 항상 최신 윈도우 사용)
+    target = sensor_history.total + 1
     while not stop_prediction:
-        predict_air_quality(shared_prediction)
-        time.sleep(3)
+        total = sensor_history.wait_for(target, timeout=PREDICTION_WAIT_TIMEOUT)
+        due, target = prediction_due(target, total)
+        if due:
+            prediction_step(shared_prediction)
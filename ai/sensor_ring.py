@@ -0,0 +1,80 @@
+import threading
+
+import numpy as np
+
+from windowing import X_COLUMNS
+
+# LSTM 입력 컬럼을 앞쪽에 연속으로 배치해 window(..., X_COLUMNS) 가 복사 없는 뷰가 되도록 함
+SENSOR_COLUMNS = X_COLUMNS + ["temperature", "humidity"]
+
+
+class SensorRingBuffer:
+    def __init__(self, capacity=1800, columns=SENSOR_COLUMNS, dtype=np.float64):
+        """고정 크기 센서 이력 버퍼 (기본 1800행 = 2초 간격 1시간)
+        - 같은 행을 [pos] 와 [pos + capacity] 두 곳에 기록해 최근 N 행이 항상 연속 메모리로 존재
+        - append 는 O(1), window(n) 는 복사 없는 뷰 반환
+        - 반환된 뷰는 이후 capacity - n 번의 append 동안 내용이 바뀌지 않음
+        """
+        self.capacity = capacity
+        self.columns = list(columns)
+        self._column_index = {name: idx for idx, name in enumerate(self.columns)}
+        self._data = np.zeros((2 * capacity, len(self.columns)), dtype=dtype)
+        self._count = 0  # 지금까지 추가된 전체 행 수
+        self._lock = threading.Lock()
+        self._appended = threading.Condition(self._lock)
+        self._generation = 0  # clear 할 때마다 증가
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self):
+        return self._count
+
+    def append(self, record):
+        row = [record.get(name, 0) or 0 for name in self.columns]
+        with self._lock:
+            pos = self._count % self.capacity
+            self._data[pos] = row
+            self._data[pos + self.capacity] = row
+            self._count += 1
+            self._appended.notify_all()
+
+    def clear(self):
+        with self._lock:
+            self._count = 0
+            self._generation += 1
+            self._appended.notify_all()
+
+    def wait_for(self, total, timeout=None):
+        """전체 추가 행 수가 total 이상이 될 때까지 대기 (clear 되면 바로 반환), 현재 전체 행 수 반환"""
+        with self._lock:
+            generation = self._generation
+            self._appended.wait_for(lambda: self._count >= total or self._generation != generation, timeout)
+            return self._count
+
+    def _columns_key(self, columns):
+        if columns is None:
+            return slice(None)
+        indices = [self._column_index[name] for name in columns]
+        # 🔹 연속된 컬럼이면 슬라이스(뷰), 아니면 인덱스 배열(복사)
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return slice(indices[0], indices[0] + len(indices))
+        return indices
+
+    def window(self, n, columns=None):
+        """최근 n 행 (가장 오래된 행이 먼저), 데이터가 부족하면 None"""
+        with self._lock:
+            count = self._count
+        if n > min(count, self.capacity):
+            return None
+
+        end = (count - 1) % self.capacity + self.capacity + 1
+        return self._data[end - n:end, self._columns_key(columns)]
+
+    def row(self, offset=-1, columns=None):
+        """offset 번째 최근 행 복사본 (-1 = 최신), 데이터가 부족하면 None"""
+        rows = self.window(-offset, columns)
+        if rows is None:
+            return None
+        return rows[0].copy()
@@ -0,0 +1,80 @@
+import os
+import threading
+
+import joblib
+import numpy as np
+
+SMELL_FEATURES = ["tvoc", "eco2", "pm2.5", "mq4", "mq7", "mq135"]
+SMELL_LABELS = ["✅ 약함", "⚠️ 보통", "🚨 강함"]
+
+
+class SmellClassifier:
+    def __init__(self, model_file):
+        """냄새 분류 모델 상주 서비스
+        - 모델은 최초 1회만 로드하고 메모리에 유지
+        - 모델 파일이 디스크에서 바뀐 경우(mtime/크기 변경)에만 다시 로드
+        """
+        self.model_file = model_file
+        self._state = None  # (model, mean, scale) 를 한 번에 교체
+        self._signature = ()  # 아직 확인 전
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.model_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        """파일이 바뀌었으면 모델을 다시 로드, 없어졌으면 모델 해제"""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+
+        with self._lock:
+            if signature == self._signature:
+                return
+            if signature is None:
+                self._state = None
+                self._signature = None
+                print("⚠️ 냄새 분류 모델이 없어 냄새 예측을 건너뜁니다")
+                return
+
+            try:
+                model, scaler = joblib.load(self.model_file)
+            except Exception as e:
+                # 🔹 파일이 쓰이는 중일 수 있으므로 기존 모델을 유지하고 다음 호출에서 재시도
+                print(f"⚠️ 냄새 분류 모델 로드 실패: {e}")
+                return
+            # 🔹 StandardScaler를 직접 적용하기 위해 평균/표준편차만 보관 (DataFrame 생성 생략)
+            mean = np.asarray(scaler.mean_, dtype=np.float64)
+            scale = np.asarray(scaler.scale_, dtype=np.float64)
+            # 🔹 단일 샘플 예측에서는 병렬 작업 분배 비용이 더 크므로 단일 스레드로 고정
+            if hasattr(model, "n_jobs"):
+                model.n_jobs = None
+
+            self._state = (model, mean, scale)
+            self._signature = signature
+            print("✅ 냄새 분류 모델 로드 완료")
+
+    @property
+    def available(self):
+        self._refresh()
+        return self._state is not None
+
+    def classify(self, record):
+        """record(dict)의 냄새 수준(0~2)을 반환, 모델이 없으면 None"""
+        self._refresh()
+        state = self._state
+        if state is None:
+            return None
+        model, mean, scale = state
+
+        features = np.array([[record.get(name, 0) or 0 for name in SMELL_FEATURES]], dtype=np.float64)
+        scaled_input = (features - mean) / scale
+        return int(model.predict(scaled_input)[0])
+
+    @staticmethod
+    def label(smell_level):
+        return SMELL_LABELS[smell_level]
@@ -0,0 +1,272 @@
+import argparse
+import atexit
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+# 컬럼별 저장 타입 (timestamp 는 epoch 초)
+TELEMETRY_SCHEMA = {
+    "timestamp": "<f8",
+    "temperature": "<f4",
+    "humidity": "<f4",
+    "tvoc": "<f4",
+    "eco2": "<f4",
+    "pm2.5": "<f4",
+    "mq4": "<f4",
+    "mq7": "<f4",
+    "mq135": "<f4",
+    "air_quality": "<i2",
+    "smell_level": "<i2",
+}
+
+
+class TelemetryStore:
+    def __init__(self, root, schema=TELEMETRY_SCHEMA, segment_rows=1800, flush_rows=30, flush_interval=60.0, retention_hours=None):
+        """시간 구간 조회가 가능한 컬럼형 센서 이력 저장소
+        - root/seg_<시작시각 ms>/<컬럼>.bin 에 컬럼별 고정 타입 raw 배열을 이어 붙여 저장
+        - 세그먼트는 segment_rows 행(기본 1800행 = 2초 간격 1시간)마다 새로 생성
+        - 읽기는 np.memmap 으로 필요한 세그먼트만 매핑 (파일 전체를 읽지 않음)
+        - 쓰기는 flush_rows 행 또는 flush_interval 초마다 일괄 기록, 비정상 종료 시 최대 한 묶음 손실
+        - 정상 종료 시(atexit, Ctrl+C 포함) 남은 행을 기록 (첫 append 때 등록)
+        - root 디렉터리와 schema.json 은 첫 기록 때 생성 (조회만 하는 프로세스는 파일을 만들지 않음)
+        - 같은 ms 에 시작한 세그먼트는 seg_<ms>_<n> 으로 구분
+        - retention_hours 가 지정되면 오래된 세그먼트는 새 세그먼트 생성 시 삭제
+        """
+        self.root = root
+        self.schema = {name: np.dtype(dtype) for name, dtype in schema.items()}
+        self.segment_rows = segment_rows
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.retention_hours = retention_hours
+
+        self._pending = {name: [] for name in self.schema}
+        self._pending_count = 0
+        self._segment = None  # 현재 쓰는 세그먼트 경로
+        self._segment_count = 0
+        self._resumed = False  # 첫 쓰기 때 마지막 세그먼트 이어쓰기 (읽기 전용 사용 시 파일을 건드리지 않음)
+        self._opened = False  # root 디렉터리/schema.json 생성 여부
+        self._flush_at_exit = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    # ---------- 세그먼트 관리 ----------
+
+    def _write_meta(self):
+        meta_path = os.path.join(self.root, "schema.json")
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w") as f:
+                json.dump({name: dtype.str for name, dtype in self.schema.items()}, f)
+
+    def segments(self):
+        """(시작 시각, 경로) 목록, 오래된 순"""
+        if not os.path.isdir(self.root):
+            return []
+        result = []
+        for name in os.listdir(self.root):
+            if name.startswith("seg_"):
+                start_ms, _, suffix = name[4:].partition("_")
+                result.append((int(start_ms) / 1000, int(suffix or 0), os.path.join(self.root, name)))
+        return [(start, path) for start, _, path in sorted(result)]
+
+    def _segment_length(self, path):
+        """모든 컬럼에 온전히 기록된 행 수 (기록 도중 종료된 경우 가장 짧은 컬럼 기준)"""
+        lengths = []
+        for name, dtype in self.schema.items():
+            col_path = os.path.join(path, f"{name}.bin")
+            lengths.append(os.path.getsize(col_path) // dtype.itemsize if os.path.exists(col_path) else 0)
+        return min(lengths)
+
+    def _resume_last_segment(self):
+        segments = self.segments()
+        if segments:
+            path = segments[-1][1]
+            count = self._segment_length(path)
+            # 🔹 기록 도중 종료되어 컬럼 길이가 어긋났으면 가장 짧은 길이로 맞춤
+            for name, dtype in self.schema.items():
+                col_path = os.path.join(path, f"{name}.bin")
+                if os.path.exists(col_path) and os.path.getsize(col_path) != count * dtype.itemsize:
+                    os.truncate(col_path, count * dtype.itemsize)
+            if count < self.segment_rows:
+                self._segment, self._segment_count = path, count
+
+    def _new_segment(self, start_time):
+        base = os.path.join(self.root, f"seg_{int(start_time * 1000)}")
+        path, suffix = base, 0
+        while True:
+            try:
+                os.mkdir(path)
+                break
+            except FileExistsError:
+                # 🔹 같은 ms 에 시작한 세그먼트가 이미 있으면 이어 쓰지 않고 번호를 붙여 새로 생성
+                suffix += 1
+                path = f"{base}_{suffix}"
+        self._segment, self._segment_count = path, 0
+        self._apply_retention(start_time)
+
+    def _apply_retention(self, now):
+        if self.retention_hours is None:
+            return
+        cutoff = now - self.retention_hours * 3600
+        segments = self.segments()
+        # 🔹 다음 세그먼트 시작 시각이 cutoff 이전이면 통째로 오래된 세그먼트
+        for (start, path), (next_start, _) in zip(segments, segments[1:]):
+            if next_start <= cutoff and path != self._segment:
+                shutil.rmtree(path, ignore_errors=True)
+
+    # ---------- 쓰기 ----------
+
+    def append(self, record, timestamp=None):
+        with self._lock:
+            if not self._flush_at_exit:
+                atexit.register(self.flush)
+                self._flush_at_exit = True
+            self._pending["timestamp"].append(time.time() if timestamp is None else timestamp)
+            for name in self.schema:
+                if name != "timestamp":
+                    self._pending[name].append(record.get(name, 0) or 0)
+            self._pending_count += 1
+            if self._pending_count >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def append_columns(self, columns):
+        """컬럼별 배열을 한 번에 추가 (CSV 가져오기 등)"""
+        with self._lock:
+            self._flush_locked()
+            arrays = {name: np.asarray(columns.get(name, 0), dtype=dtype) for name, dtype in self.schema.items()}
+            n_rows = len(arrays["timestamp"])
+            arrays = {name: np.broadcast_to(values, (n_rows,)) for name, values in arrays.items()}
+            self._write_arrays_locked(arrays, n_rows)
+
+    def _write_arrays_locked(self, arrays, n_rows):
+        if not self._opened:
+            os.makedirs(self.root, exist_ok=True)
+            self._write_meta()
+            self._opened = True
+        if not self._resumed:
+            self._resume_last_segment()
+            self._resumed = True
+        offset = 0
+        while offset < n_rows:
+            if self._segment is None or self._segment_count >= self.segment_rows:
+                self._new_segment(float(arrays["timestamp"][offset]))
+            n = min(n_rows - offset, self.segment_rows - self._segment_count)
+            for name, dtype in self.schema.items():
+                with open(os.path.join(self._segment, f"{name}.bin"), "ab") as f:
+                    f.write(np.ascontiguousarray(arrays[name][offset:offset + n], dtype=dtype).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._segment_count += n
+            offset += n
+
+    def _flush_locked(self):
+        if self._pending_count:
+            arrays = {name: np.asarray(values, dtype=self.schema[name]) for name, values in self._pending.items()}
+            self._write_arrays_locked(arrays, self._pending_count)
+            self._pending = {name: [] for name in self.schema}
+            self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def clear(self):
+        with self._lock:
+            self._pending = {name: [] for name in self.schema}
+            self._pending_count = 0
+            self._segment, self._segment_count = None, 0
+            self._resumed = True
+            for _, path in self.segments():
+                shutil.rmtree(path, ignore_errors=True)
+
+    # ---------- 읽기 ----------
+
+    def _map_column(self, path, name, length):
+        if length == 0:
+            return np.empty(0, dtype=self.schema[name])
+        return np.memmap(os.path.join(path, f"{name}.bin"), dtype=self.schema[name], mode="r", shape=(length,))
+
+    def query(self, hours=None, since=None, until=None, columns=None):
+        """since ~ until 구간(또는 최근 hours 시간)의 컬럼별 배열 반환 (기록 순서)
+        - 구간에 걸친 세그먼트만 memmap 으로 읽음
+        - 아직 파일에 쓰지 않은 행도 포함
+        """
+        if hours is not None:
+            since = time.time() - hours * 3600
+        columns = list(columns) if columns else list(self.schema)
+        if "timestamp" not in columns:
+            columns = ["timestamp"] + columns
+
+        with self._lock:
+            segments = self.segments()
+            parts = []
+            for idx, (start, path) in enumerate(segments):
+                next_start = segments[idx + 1][0] if idx + 1 < len(segments) else float("inf")
+                if since is not None and next_start <= since:
+                    continue
+                if until is not None and start > until:
+                    break
+                length = self._segment_length(path)
+                timestamps = self._map_column(path, "timestamp", length)
+                lo = int(np.searchsorted(timestamps, since, side="left")) if since is not None else 0
+                hi = int(np.searchsorted(timestamps, until, side="right")) if until is not None else length
+                if hi > lo:
+                    parts.append({name: np.array(self._map_column(path, name, length)[lo:hi]) for name in columns})
+
+            if self._pending_count:
+                pending = {name: np.asarray(self._pending[name], dtype=self.schema[name]) for name in columns}
+                mask = np.ones(self._pending_count, dtype=bool)
+                if since is not None:
+                    mask &= pending["timestamp"] >= since
+                if until is not None:
+                    mask &= pending["timestamp"] <= until
+                parts.append({name: values[mask] for name, values in pending.items()})
+
+        if not parts:
+            return {name: np.empty(0, dtype=self.schema[name]) for name in columns}
+        return {name: np.concatenate([part[name] for part in parts]) for name in columns}
+
+    def __len__(self):
+        with self._lock:
+            return sum(self._segment_length(path) for _, path in self.segments()) + self._pending_count
+
+    # ---------- 기존 CSV 가져오기 ----------
+
+    def import_csv(self, csv_path, interval=2.0, end_time=None):
+        """timestamp 없는 air_quality_data.csv 를 가져옴
+        - 각 행은 interval 초 간격으로 기록되었다고 보고, 마지막 행을 end_time(기본: 파일 수정 시각)으로 둠
+        """
+        import pandas as pd
+
+        df = pd.read_csv(csv_path).dropna()
+        if end_time is None:
+            end_time = os.path.getmtime(csv_path)
+        columns = {name: df[name].to_numpy() for name in self.schema if name in df.columns}
+        if "timestamp" not in columns:
+            columns["timestamp"] = end_time - interval * np.arange(len(df) - 1, -1, -1, dtype=np.float64)
+        self.append_columns(columns)
+        return len(df)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="센서 이력 저장소 도구")
+    parser.add_argument("root", help="저장소 디렉터리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_parser = sub.add_parser("import", help="기존 CSV 가져오기")
+    import_parser.add_argument("csv")
+    import_parser.add_argument("--interval", type=float, default=2.0, help="CSV 행 간격(초)")
+    sub.add_parser("info", help="세그먼트 정보 출력")
+    args = parser.parse_args()
+
+    store = TelemetryStore(args.root)
+    if args.command == "import":
+        n_rows = store.import_csv(args.csv, interval=args.interval)
+        print(f"✅ {n_rows}행 가져오기 완료 → {args.root}")
+    else:
+        for start, path in store.segments():
+            print(f"{os.path.basename(path)}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start))}  {store._segment_length(path)}행")
+        print(f"총 {len(store)}행")
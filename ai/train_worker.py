@@ -0,0 +1,94 @@
+import atexit
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 학습 프로세스 CPU 우선순위 (값이 클수록 양보) 와 TensorFlow 스레드 수
+TRAIN_NICE = int(os.getenv("TRAIN_NICE", "15"))
+TRAIN_THREADS = os.getenv("TRAIN_THREADS", "2")
+
+
+class TrainingWorker:
+    def __init__(self, retry_interval=60):
+        """LSTM 재학습을 별도 프로세스에서 실행
+        - 제어 루프/예측 스레드와 GIL 을 공유하지 않도록 subprocess 로 분리
+        - 학습 프로세스는 nice 값을 높여 팬 제어 루프보다 낮은 우선순위로 동작
+        - 완료 여부는 poll() 로 확인하고, 그동안 예측은 기존 모델로 계속 수행
+        """
+        self.retry_interval = retry_interval
+        self.process = None
+        self.last_start_time = 0
+        atexit.register(self.stop)
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, force=False):
+        """학습 시작, 이미 실행 중이거나 재시도 간격 이내면 무시"""
+        if self.running:
+            return False
+        if not force and time.time() - self.last_start_time < self.retry_interval:
+            return False
+
+        self.process = subprocess.Popen([sys.executable, os.path.abspath(__file__)], cwd=BASE_DIR)
+        self.last_start_time = time.time()
+        print(f"🧠 백그라운드 모델 학습 시작 (pid={self.process.pid})")
+        return True
+
+    def poll(self):
+        """학습 완료 시 True(성공)/False(실패)를 한 번 반환, 진행 중이거나 대기 중이면 None"""
+        if self.process is None or self.process.poll() is None:
+            return None
+
+        returncode = self.process.returncode
+        self.process = None
+        if returncode != 0:
+            print(f"⚠️ 백그라운드 모델 학습 실패 (exit={returncode})")
+            return False
+        return True
+
+    def stop(self):
+        if self.running:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+class NullTrainingWorker:
+    """학습을 실행하지 않는 TrainingWorker 대역 (벤치마크/기록 재생용)
+    - 학습 프로세스는 predict_func 를 새로 import 해 실제 센서 이력으로 학습하고 모델 파일을 덮어쓰므로 대신 사용
+    """
+    running = False
+
+    def __init__(self):
+        self.requests = 0  # 학습 요청 횟수
+
+    def start(self, force=False):
+        self.requests += 1
+        return False
+
+    def poll(self):
+        return None
+
+    def stop(self):
+        pass
+
+
+# 학습 프로세스 진입점
+if __name__ == "__main__":
+    os.nice(TRAIN_NICE)
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", TRAIN_THREADS)
+    os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+
+    sys.path.append(BASE_DIR)
+    import predict_func
+
+    trained = predict_func.train_regression_model()
+    sys.exit(0 if trained is not None else 1)
@@ -0,0 +1,42 @@
+import numpy as np
+
+# LSTM 입력 구성 (15 스텝 윈도우 → 2 스텝 뒤 예측)
+WINDOW_SIZE = 15
+PREDICTION_HORIZON = 2
+X_COLUMNS = ["tvoc", "eco2", "pm2.5", "mq4", "mq7", "mq135", "air_quality", "smell_level"]
+Y_COLUMNS = ["eco2", "pm2.5", "air_quality"]
+
+
+def sliding_windows(values, window=WINDOW_SIZE):
+    """(행, 특성) 배열을 복사 없이 (윈도우 수, window, 특성) 뷰로 변환"""
+    values = np.ascontiguousarray(values)
+    n_rows, n_features = values.shape
+    n_windows = n_rows - window + 1
+    if n_windows <= 0:
+        return np.empty((0, window, n_features), dtype=values.dtype)
+
+    row_stride, col_stride = values.strides
+    return np.lib.stride_tricks.as_strided(
+        values,
+        shape=(n_windows, window, n_features),
+        strides=(row_stride, row_stride, col_stride),
+        writeable=False,
+    )
+
+
+def build_dataset(df, x_columns=X_COLUMNS, y_columns=Y_COLUMNS, window=WINDOW_SIZE, horizon=PREDICTION_HORIZON):
+    """학습용 윈도우 데이터셋 생성
+    - X: (샘플, window, 특성), 가장 오래된 스텝이 먼저 오는 순서
+    - y: 각 윈도우 마지막 행 기준 horizon 스텝 뒤의 y_columns 값
+    기존 df.iloc 이중 루프와 같은 샘플을 만든다 (샘플 수 = 행 수 - window + 1 - horizon)
+    """
+    x_values = df[x_columns].to_numpy(dtype=np.float64)
+    y_values = df[y_columns].to_numpy(dtype=np.float64)
+
+    n_samples = len(df) - window + 1 - horizon
+    if n_samples <= 0:
+        return np.empty((0, window, len(x_columns))), np.empty((0, len(y_columns)))
+
+    X = sliding_windows(x_values, window)[:n_samples]
+    y = y_values[window - 1 + horizon:]
+    return X, y
@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "ai")))
+from lstm_backend import BACKENDS, make_runner
+from windowing import WINDOW_SIZE, X_COLUMNS, Y_COLUMNS
+
+
+def load_or_build_model(model_file=None):
+    """학습된 모델이 있으면 사용, 없으면 같은 구조의 초기화 모델 (지연 시간은 가중치와 무관)"""
+    if model_file and os.path.exists(model_file):
+        from tensorflow.keras.models import load_model
+        return load_model(model_file)
+
+    from predict_func import build_regression_model
+    return build_regression_model((WINDOW_SIZE, len(X_COLUMNS)), len(Y_COLUMNS))
+
+
+def time_runner(runner, x, iterations, warmup=5):
+    for _ in range(warmup):
+        runner(x)
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        runner(x)
+        samples[i] = time.perf_counter() - start
+    return samples * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LSTM 단일 윈도우 추론 지연 시간 벤치마크")
+    parser.add_argument("--model", default=None, help="측정할 .keras 모델 (없으면 같은 구조의 초기화 모델)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    model = load_or_build_model(args.model)
+    x = np.random.default_rng(0).normal(size=(1, WINDOW_SIZE, len(X_COLUMNS))).astype(np.float32)
+    reference = model.predict(x, verbose=0)[0]
+
+    for backend in args.backends:
+        start = time.perf_counter()
+        runner = make_runner(model, backend)
+        setup_ms = (time.perf_counter() - start) * 1000
+
+        max_err = float(np.max(np.abs(runner(x) - reference)))
+        ms = time_runner(runner, x, args.iterations)
+        print(f"{backend:>8}: setup={setup_ms:8.1f} ms  mean={ms.mean():7.3f} ms  "
+              f"p50={np.percentile(ms, 50):7.3f} ms  p95={np.percentile(ms, 95):7.3f} ms  max_err={max_err:.2e}")
@@ -0,0 +1,127 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "hardware")))
+from actuators.motion_detect import MotionSensor
+
+RESOLUTION = (640, 480)
+
+
+class ReplayCamera:
+    """녹화된 BGR 프레임을 Picamera2 처럼 돌려주는 카메라 (main: BGR, lores: YUV420)"""
+
+    def __init__(self, frames, lores_size):
+        self.frames = frames
+        self.lores = [cv2.cvtColor(cv2.resize(f, lores_size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2YUV_I420) for f in frames]
+        self.index = 0
+
+    def capture_array(self, name="main"):
+        frames = self.lores if name == "lores" else self.frames
+        frame = frames[self.index % len(frames)]
+        self.index += 1
+        return frame
+
+    def capture_arrays(self, names):
+        arrays = [(self.lores if name == "lores" else self.frames)[self.index % len(self.frames)] for name in names]
+        self.index += 1
+        return arrays, {}
+
+
+def synthetic_frames(count, seed=0):
+    """잡음 배경 위로 사각형이 주기적으로 지나가는 프레임 (움직임 구간 약 1/4)"""
+    rng = np.random.default_rng(seed)
+    width, height = RESOLUTION
+    base = rng.integers(60, 120, size=(height, width, 3), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        cv2.add(frame, rng.integers(0, 6, size=frame.shape, dtype=np.uint8), dst=frame)
+        phase = i % 40
+        if phase < 10:
+            x = 40 + phase * 50
+            cv2.rectangle(frame, (x, 160), (x + 80, 320), (230, 230, 230), -1)
+        frames.append(frame)
+    return frames
+
+
+def record_frames(path, count, interval):
+    from picamera2 import Picamera2
+
+    picam2 = Picamera2()
+    picam2.configure(picam2.create_preview_configuration(main={"size": RESOLUTION, "format": "RGB888"}))
+    picam2.start()
+    time.sleep(2)
+    frames = []
+    for _ in range(count):
+        frames.append(picam2.capture_array())
+        time.sleep(interval)
+    np.savez_compressed(path, frames=np.stack(frames))
+    print(f"✅ {count}프레임 저장 → {path}")
+
+
+def legacy_detect(state, image, sensitivity, decay_rate):
+    """변경 전 MotionSensor.detect_motion 의 처리 과정 (전체 해상도, 매 프레임 할당)"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (21, 21), 0)
+    if state.get("first_frame") is None:
+        state["first_frame"] = gray
+        return False
+    frame_delta = cv2.absdiff(state["first_frame"], gray)
+    thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
+    thresh = cv2.dilate(thresh, None, iterations=2)
+    contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in contours:
+        if cv2.contourArea(contour) >= sensitivity:
+            state["first_frame"] = gray
+            return True
+    state["first_frame"] = cv2.addWeighted(state["first_frame"], 1 - decay_rate, gray, decay_rate, 0)
+    return False
+
+
+def time_frames(detect, count):
+    samples = np.empty(count)
+    detections = 0
+    for i in range(count):
+        start = time.perf_counter()
+        detections += bool(detect())
+        samples[i] = time.perf_counter() - start
+    return samples * 1000, detections
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모션 감지 프레임당 처리 시간 벤치마크 (녹화 프레임 재생)")
+    parser.add_argument("--frames", default=None, help="녹화 프레임 .npz (frames: N×H×W×3 BGR), 없으면 합성 프레임")
+    parser.add_argument("--count", type=int, default=400, help="측정 프레임 수")
+    parser.add_argument("--record", default=None, help="라즈베리파이 카메라로 프레임을 녹화해 저장할 경로")
+    parser.add_argument("--interval", type=float, default=0.5, help="녹화 간격(초)")
+    parser.add_argument("--sensitivity", type=int, default=800)
+    args = parser.parse_args()
+
+    if args.record:
+        record_frames(args.record, args.count, args.interval)
+        sys.exit(0)
+
+    frames = list(np.load(args.frames)["frames"]) if args.frames else synthetic_frames(args.count)
+    count = min(args.count, len(frames)) if args.frames else args.count
+
+    state = {}
+    it = iter(range(count))
+    ms, detections = time_frames(lambda: legacy_detect(state, frames[next(it) % len(frames)], args.sensitivity, 0.05), count)
+    print(f"{'legacy 640x480':>22}: mean={ms.mean():7.3f} ms  p50={np.percentile(ms, 50):7.3f} ms  p95={np.percentile(ms, 95):7.3f} ms  detections={detections}")
+
+    modes = [
+        ("full 640x480", {"lores_size": None}),
+        ("lores 320x240", {"lores_size": (320, 240)}),
+        ("lores 160x120", {"lores_size": (160, 120)}),
+        ("lores 160x120 + roi", {"lores_size": (160, 120), "roi": [(0.0, 0.25, 1.0, 0.75)]}),
+    ]
+    for label, options in modes:
+        camera = ReplayCamera(frames, options["lores_size"] or RESOLUTION)
+        sensor = MotionSensor(resolution=RESOLUTION, sensitivity=args.sensitivity, cooldown_time=0, camera=camera, **options)
+        ms, detections = time_frames(sensor.detect_motion, count)
+        print(f"{label:>22}: mean={ms.mean():7.3f} ms  p50={np.percentile(ms, 50):7.3f} ms  p95={np.percentile(ms, 95):7.3f} ms  detections={detections}")
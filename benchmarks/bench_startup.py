@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+AI_DIR = os.path.join(ROOT, "ai")
+sys.path.append(ROOT)
+sys.path.append(AI_DIR)
+
+# 자식 프로세스: predict_func import → 모델 로드 → 1회 예측까지의 시간과 최대 RSS 측정
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {ai_dir!r})
+import numpy as np
+import predict_func
+from model_holder import AirQualityModelHolder
+holder = AirQualityModelHolder({model!r}, {scaler!r}, {npz!r})
+import_s = time.perf_counter() - start
+holder.predict(np.zeros((1, 120)))
+ready_s = time.perf_counter() - start
+
+def peak_rss_mb():
+    # ru_maxrss 는 exec 이전(부모) 값을 물려받으므로 /proc 의 VmHWM 사용
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+print(json.dumps({{
+    "import_s": import_s,
+    "first_prediction_s": ready_s,
+    "peak_rss_mb": peak_rss_mb(),
+    "tensorflow_imported": "tensorflow" in sys.modules,
+}}))
+"""
+
+
+def export_models(out_dir, history=None):
+    """같은 구조의 모델을 .keras / .pkl / .npz 로 저장
+    - history(센서 이력 DataFrame)를 주면 스케일러를 실제 값 범위에 맞춤 (원시 센서값 입력 시 포화 방지)
+    """
+    import joblib
+    from sklearn.preprocessing import StandardScaler
+    # run.py / main 과 같은 경로로 import (predict_func 가 두 번 로드되어 싱글턴이 중복 생성되지 않도록)
+    from ai.predict_func import build_regression_model
+    from lstm_numpy import export_npz
+    from windowing import build_dataset
+
+    rng = np.random.default_rng(0)
+    model = build_regression_model((15, 8), 3)
+    if history is not None:
+        X, y = build_dataset(history)
+        X_scaler = StandardScaler().fit(X.reshape(X.shape[0], -1))
+        y_scaler = StandardScaler().fit(y)
+    else:
+        X_scaler = StandardScaler().fit(rng.normal(size=(32, 120)))
+        y_scaler = StandardScaler().fit(rng.normal(size=(32, 3)))
+
+    paths = {
+        "model": os.path.join(out_dir, "air_quality_model.keras"),
+        "scaler": os.path.join(out_dir, "air_quality_scaler.pkl"),
+        "npz": os.path.join(out_dir, "air_quality_model.npz"),
+    }
+    model.save(paths["model"])
+    joblib.dump((X_scaler, y_scaler), paths["scaler"])
+    export_npz(model, X_scaler, y_scaler, paths["npz"])
+    return paths
+
+
+def measure(backend, paths):
+    env = dict(os.environ, LSTM_BACKEND=backend, TF_CPP_MIN_LOG_LEVEL="3")
+    code = CHILD.format(ai_dir=AI_DIR, **paths)
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="추론 방식별 시작 시간 / 최대 RSS 비교")
+    parser.add_argument("--backends", nargs="+", default=["call", "numpy"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        paths = export_models(out_dir)
+        for backend in args.backends:
+            runs = [measure(backend, paths) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r["first_prediction_s"])
+            print(f"{backend:>6}: import={best['import_s']:.2f} s  first_prediction={best['first_prediction_s']:.2f} s  "
+                  f"peak_rss={best['peak_rss_mb']:.0f} MB  tensorflow_imported={best['tensorflow_imported']}")
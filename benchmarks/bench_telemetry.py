@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "hardware")))
+from telemetry_codec import BinaryTelemetryEncoder, decode_record, encode_record, unwrap_binary
+from telemetry_delta import FullTelemetryEncoder, TelemetryDeltaDecoder, TelemetryDeltaEncoder
+
+CSV_FILE = os.path.join(os.path.dirname(__file__), "..", "ai", "air_quality_data.csv")
+TICK_SECONDS = 2
+
+
+def make_payloads(count, seed=0):
+    """air_quality_data.csv 를 반복 재생해 collect_sensor_data() 와 같은 형태의 페이로드 생성"""
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(CSV_FILE).dropna()
+    payloads = []
+    motion_time = 1_700_000_000
+    for i in range(count):
+        row = df.iloc[i % len(df)]
+        pm25 = float(row["pm2.5"]) + rng.normal(0, 0.3)
+        if rng.random() < 0.05:
+            motion_time = 1_700_000_000 + i * TICK_SECONDS
+        payloads.append({
+            "device_key": "RPI-001",
+            "air_quality_score": 72,
+            "air_quality": int(row["air_quality"]),
+            "tvoc": int(row["tvoc"]),
+            "eco2": int(row["eco2"]),
+            "temp": float(row["temperature"]) + rng.normal(0, 0.02),
+            "humidity": float(row["humidity"]) + rng.normal(0, 0.02),
+            "adc_raw": int(pm25 / 0.84) + 12,
+            "pm25_raw": round(pm25, 2),
+            "pm25_filtered": round(pm25 * 0.98, 2),
+            "pm10_estimate": round(pm25 * 1.5, 2),
+            "mq135_raw": int(row["mq135"]),
+            "mq135_co2_ppm": round(400 + float(row["mq135"]) / 100 + rng.normal(0, 0.5), 2),
+            "mq7_raw": int(row["mq7"]),
+            "mq7_co_ppm": round(float(row["mq7"]) / 10000 + rng.normal(0, 0.01), 2),
+            "mq4_raw": int(row["mq4"]),
+            "mq4_methane_ppm": round(float(row["mq4"]) / 1000 + rng.normal(0, 0.01), 2),
+            "motionDetectedTime": motion_time,
+            "aiRecommendation": "공기질이 좋습니다. 현재 상태를 유지하세요.",
+            "isPurifierOn": True,
+            "purifierSpeed": 2,
+            "purifierAutoOn": 0,
+            "purifierAutoOff": 1439,
+            "purifierMode": 1,
+            "isDiffuserOn": False,
+            "diffuserSpeed": 1,
+            "diffuserPeriod": 300,
+            "diffuserType": 1,
+            "diffuserMode": 0,
+            "predicted_air_quality": 1.8 + rng.normal(0, 0.05),
+            "current_smell": int(row["smell_level"]),
+            "smell_status": "보통",
+            "aiRecommendation_code": 0,
+        })
+    return payloads
+
+
+def wire_bytes(payload):
+    """Socket.IO 가 보내는 크기
+    - JSON 텍스트 (python-socketio 는 구분자 공백 없이 직렬화)
+    - bytes 값은 바이너리 첨부로 분리되므로 JSON 에는 자리표시자만 남음
+    """
+    attachments = {key: value for key, value in payload.items() if isinstance(value, bytes)}
+    text = {key: ({"_placeholder": True, "num": 0} if key in attachments else value) for key, value in payload.items()}
+    return len(json.dumps(text, separators=(",", ":"), ensure_ascii=False).encode("utf-8")) + sum(map(len, attachments.values()))
+
+
+def check_roundtrip(encoder, payloads):
+    """델타 → 복원 결과가 (반올림된) 원본과 같은지 확인"""
+    decoder = TelemetryDeltaDecoder()
+    for payload in payloads:
+        decoded = decoder.decode(encoder.encode(payload))
+        expected = {key: encoder.quantize(key, value) for key, value in payload.items()}
+        assert decoded == expected, "델타 복원 결과 불일치"
+
+
+def check_binary_roundtrip(payloads):
+    """바이너리 인코딩 → 디코딩 결과가 원본과 같은지 확인 (float 는 float32 오차 허용)"""
+    for payload in payloads:
+        decoded = unwrap_binary(BinaryTelemetryEncoder().encode(payload))
+        assert decoded.keys() == payload.keys(), "바이너리 복원 필드 불일치"
+        for key, value in payload.items():
+            if isinstance(value, float):
+                assert abs(decoded[key] - value) <= 1e-6 * max(1.0, abs(value)), key
+            else:
+                assert decoded[key] == value, key
+
+
+def time_serialization(payloads, repeat=5):
+    """레코드당 직렬화/역직렬화 시간 (µs)"""
+    results = {}
+    for label, dumps, loads in [
+        ("json", lambda p: json.dumps(p, separators=(",", ":"), ensure_ascii=False), json.loads),
+        ("binary", encode_record, decode_record),
+    ]:
+        encoded = [dumps(p) for p in payloads]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for p in payloads:
+                dumps(p)
+        encode_us = (time.perf_counter() - start) / (repeat * len(payloads)) * 1e6
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for e in encoded:
+                loads(e)
+        decode_us = (time.perf_counter() - start) / (repeat * len(payloads)) * 1e6
+        results[label] = (encode_us, decode_us)
+    return results
+
+
+def report(label, sizes, baseline):
+    sizes = np.asarray(sizes)
+    per_day = sizes.mean() * 86400 / TICK_SECONDS / 1e6
+    print(f"{label:>26}: mean={sizes.mean():7.1f} B  max={sizes.max():5d} B  "
+          f"{per_day:6.2f} MB/day  ratio={sizes.mean() / baseline:5.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sensor_data 전송 크기/직렬화 시간 벤치마크 (전체 상태, 델타, 바이너리)")
+    parser.add_argument("--ticks", type=int, default=1800, help="틱 수 (2초 간격)")
+    parser.add_argument("--keyframe-interval", type=int, default=15)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.ticks)
+    encoders = [
+        ("full (current)", FullTelemetryEncoder()),
+        ("delta", TelemetryDeltaEncoder(args.keyframe_interval, precision={})),
+        ("delta + quantize", TelemetryDeltaEncoder(args.keyframe_interval)),
+        ("binary", BinaryTelemetryEncoder()),
+        ("delta + quantize + binary", BinaryTelemetryEncoder(TelemetryDeltaEncoder(args.keyframe_interval))),
+    ]
+
+    baseline = None
+    for label, encoder in encoders:
+        sizes = [wire_bytes(encoder.encode(payload)) for payload in payloads]
+        baseline = baseline or np.mean(sizes)
+        report(label, sizes, baseline)
+
+    for label, (encode_us, decode_us) in time_serialization(payloads).items():
+        print(f"{label:>26}: encode={encode_us:6.2f} µs  decode={decode_us:6.2f} µs")
+
+    check_roundtrip(TelemetryDeltaEncoder(args.keyframe_interval), payloads)
+    check_binary_roundtrip(payloads)
+    print("✅ 델타/바이너리 복원 확인 완료")
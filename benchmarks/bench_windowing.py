@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "ai")))
+from windowing import build_dataset, X_COLUMNS, Y_COLUMNS
+
+# 기존 train_regression_model 의 df.iloc 이중 루프 (비교 기준)
+def legacy_build_dataset(df):
+    future_df = df.shift(-2)
+    X_list = []
+    for i in range(14, len(df)-2):
+        merged = []
+        for j in range(14, -1, -1):
+            merged += df.iloc[i-j][X_COLUMNS].tolist()
+        X_list.append(merged)
+    y = future_df[Y_COLUMNS].iloc[14:-2].values
+    return np.array(X_list), y
+
+
+def make_history(rows, seed=0):
+    """air_quality_data.csv 와 같은 컬럼의 합성 센서 이력"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "temperature": rng.normal(25, 1, rows).round(1),
+        "humidity": rng.normal(50, 3, rows).round(1),
+        "tvoc": rng.integers(0, 300, rows),
+        "eco2": rng.integers(400, 900, rows),
+        "pm2.5": rng.normal(40, 10, rows).round(2),
+        "mq4": rng.integers(4000, 6000, rows),
+        "mq7": rng.integers(30000, 45000, rows),
+        "mq135": rng.integers(2000, 4000, rows),
+        "air_quality": rng.integers(1, 5, rows),
+        "smell_level": rng.integers(0, 3, rows),
+    })
+
+
+def bench(rows, legacy=True):
+    df = make_history(rows)
+
+    start = time.perf_counter()
+    X, y = build_dataset(df)
+    X = X.reshape(X.shape[0], -1)
+    vectorized_s = time.perf_counter() - start
+
+    result = {"rows": rows, "samples": len(X), "vectorized_s": vectorized_s}
+    if legacy:
+        start = time.perf_counter()
+        X_legacy, y_legacy = legacy_build_dataset(df)
+        result["legacy_s"] = time.perf_counter() - start
+        result["speedup"] = result["legacy_s"] / vectorized_s
+        # 🔹 기존 방식과 동일한 샘플인지 확인
+        assert np.array_equal(X, X_legacy) and np.array_equal(y, y_legacy), "윈도우 결과가 기존 방식과 다릅니다"
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학습용 슬라이딩 윈도우 생성 벤치마크")
+    # 43200 행 = 2초 간격 하루치 로그
+    parser.add_argument("--rows", type=int, nargs="+", default=[500, 2000, 43200])
+    parser.add_argument("--legacy-max-rows", type=int, default=2000, help="이 행 수까지만 기존 루프 측정 (긴 이력에서는 수 분 소요)")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        r = bench(rows, legacy=rows <= args.legacy_max_rows)
+        line = f"rows={r['rows']:>7} samples={r['samples']:>7} vectorized={r['vectorized_s'] * 1000:8.2f} ms"
+        if "legacy_s" in r:
+            line += f" legacy={r['legacy_s'] * 1000:10.1f} ms speedup=x{r['speedup']:.0f}"
+        print(line)
@@ -0,0 +1,353 @@
+"""디바이스 핫패스 벤치마크 모음
+
+각 항목을 같은 방식(워밍업 → 반복 측정 → tracemalloc 으로 1회 최대 메모리)으로 측정해 JSON 으로 저장하고,
+이전 결과와 비교해 임계값 이상 느려지거나 메모리가 늘면 종료 코드 1
+
+사용 예)
+  python benchmarks/run.py                                  # benchmarks/results/<커밋>.json 저장
+  python benchmarks/run.py --only score smell motion        # 일부 항목만
+  python benchmarks/run.py --compare benchmarks/results/abc1234.json --threshold 0.2
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+TMP_DIR = tempfile.mkdtemp(prefix="bench_run_")
+
+# 🔹 main/predict_func import 전에 설정: 하드웨어는 시뮬레이터, 보관 파일/센서 이력은 임시 경로
+# (predict_func 는 main 과 같은 `from ai import predict_func` 로만 import → 모듈/싱글턴이 하나)
+os.environ["HARDWARE_BACKEND"] = "sim"
+os.environ["OUTBOX_FILE"] = os.path.join(TMP_DIR, "outbox.db")
+os.environ["TELEMETRY_DIR"] = os.path.join(TMP_DIR, "telemetry")
+os.environ["TRACE_FILE"] = ""
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "hardware"))
+sys.path.append(os.path.join(ROOT, "ai"))
+
+CASES = {}
+
+
+def case(name, slow=False):
+    """벤치마크 항목 등록: 함수는 준비 후 (이름, 측정할 함수, 반복 수) 를 yield"""
+    def register(fn):
+        CASES[name] = {"setup": fn, "slow": slow}
+        return fn
+    return register
+
+
+@contextlib.contextmanager
+def patched(module, **attrs):
+    """module 속성을 잠시 바꾸고 끝나면 원래 값으로 복원"""
+    saved = {name: getattr(module, name) for name in attrs}
+    try:
+        for name, value in attrs.items():
+            setattr(module, name, value)
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def sample_record():
+    return {"temperature": 25.1, "humidity": 48.0, "tvoc": 120, "eco2": 650, "pm2.5": 38.5,
+            "mq4": 4804, "mq7": 37668, "mq135": 2818, "air_quality": 2, "smell_level": 1}
+
+
+# ---------- 항목 ----------
+
+@case("score")
+def bench_score(args):
+    from ai import predict_func
+
+    record = sample_record()
+    yield "calculate_air_quality_score", lambda: predict_func.calculate_air_quality_score(record), 5000
+
+
+@case("smell")
+def bench_smell(args):
+    from ai import predict_func
+
+    classifier = predict_func.smell_classifier
+    if not classifier.available:
+        print("⚠️ 냄새 분류 모델 없음: smell 건너뜀")
+        return
+    record = sample_record()
+    yield "smell_classify", lambda: classifier.classify(record), 300
+
+
+@case("lstm")
+def bench_lstm(args):
+    from bench_startup import export_models
+    from bench_windowing import make_history
+    from lstm_backend import selected_backend
+    from model_holder import AirQualityModelHolder
+    from sensor_ring import SensorRingBuffer
+    from windowing import WINDOW_SIZE, X_COLUMNS
+
+    # predict_air_quality 와 같은 경로: 링 버퍼 윈도우 뷰 → 평탄화 → 스케일링/추론/역스케일링
+    df = make_history(200)
+    history = SensorRingBuffer()
+    for record in df.to_dict("records"):
+        history.append(record)
+    paths = export_models(TMP_DIR, df)
+    holder = AirQualityModelHolder(paths["model"], paths["scaler"], paths["npz"])
+    holder.get()
+
+    yield "lstm_window_build", lambda: history.window(WINDOW_SIZE, X_COLUMNS).reshape(1, -1), 5000
+    yield f"lstm_window_predict[{selected_backend()}]", lambda: holder.predict(history.window(WINDOW_SIZE, X_COLUMNS).reshape(1, -1)), 200
+
+
+@case("train", slow=True)
+def bench_train(args):
+    from ai import predict_func
+    from bench_windowing import make_history
+    from telemetry_store import TelemetryStore  # predict_func 와 같은 모듈
+    import tensorflow  # 첫 항목에 TensorFlow import 시간/메모리가 섞이지 않도록 미리 로드
+
+    # 학습 결과/체크포인트가 실제 모델 파일을 덮어쓰지 않도록 측정하는 동안만 경로를 임시 폴더로 교체
+    model_paths = {name: os.path.join(TMP_DIR, os.path.basename(getattr(predict_func, name)))
+                   for name in ["AIR_QUALITY_MODEL_FILE", "AIR_QUALITY_SCALER_FILE", "AIR_QUALITY_NPZ_FILE",
+                                "AIR_QUALITY_MODEL_TMP_FILE", "AIR_QUALITY_CHECKPOINT_FILE"]}
+
+    for rows in args.train_rows:
+        store = TelemetryStore(os.path.join(TMP_DIR, f"telemetry_{rows}"))
+        columns = make_history(rows).to_dict("list")
+        columns["timestamp"] = time.time() - 2.0 * np.arange(rows)[::-1]
+        store.append_columns(columns)
+
+        def train(store=store):
+            with patched(predict_func, telemetry_store=store, **model_paths):
+                predict_func.train_regression_model()
+
+        yield f"train_regression_model[rows={rows}]", train, 1
+
+
+@case("motion")
+def bench_motion_detect(args):
+    from actuators.motion_detect import MotionSensor
+    from bench_motion import RESOLUTION, ReplayCamera, synthetic_frames
+
+    frames = list(np.load(args.frames)["frames"]) if args.frames else synthetic_frames(80)
+    camera = ReplayCamera(frames, (160, 120))
+    sensor = MotionSensor(resolution=RESOLUTION, sensitivity=800, cooldown_time=0, lores_size=(160, 120), camera=camera)
+    yield "motion_detect[lores 160x120]", sensor.detect_motion, 400
+
+
+@case("gp2y")
+def bench_gp2y(args):
+    from collections import deque
+
+    from sensors.dust_filter import adc_to_pm25, decimate, PM25_PER_ADC, timing_jitter
+
+    # GP2YSensor.get_data 의 버스트 후처리 (32샘플 이상치 제거/평균 → 변환 → 이동 평균)
+    rng = np.random.default_rng(0)
+    samples = rng.normal(120, 3, 32).round()
+    samples[[5, 17]] = [400, 0]
+    timestamps = np.arange(32) * 0.01 + rng.normal(0, 0.0002, 32)
+    dust_values = deque(maxlen=10)
+
+    def process():
+        adc_value, adc_stderr, used = decimate(samples)
+        jitter_std, jitter_max = timing_jitter(timestamps, 0.01)
+        pm25 = float(adc_to_pm25(adc_value))
+        dust_values.append(pm25)
+        return {
+            "adc_raw": int(round(adc_value)),
+            "voltage": round(adc_value * (5.0 / 1024.0), 3),
+            "pm25_raw": round(pm25, 2),
+            "pm25_filtered": round(sum(dust_values) / len(dust_values), 2),
+            "pm10_estimate": round(pm25 * 1.5, 2),
+            "pm25_stderr": round(adc_stderr * PM25_PER_ADC, 2),
+            "samples_used": used,
+            "jitter_ms": round(jitter_std, 3),
+            "jitter_max_ms": round(jitter_max, 3),
+        }
+
+    yield "gp2y_filter[burst=32]", process, 5000
+
+
+@case("payload")
+def bench_payload(args):
+    import main
+    from telemetry_codec import encode_record
+
+    # 시뮬레이터 드라이버 값으로 최신값 테이블을 채운 뒤 payload 생성/직렬화
+    for name, driver in [("ens", main.ens), ("dht22", main.dht22), ("gp2y", main.gp2y),
+                         ("mq135", main.mq135), ("mq7", main.mq7), ("mq4", main.mq4)]:
+        main.sensor_poller.latest[name] = driver.get_data()
+    data = main.collect_sensor_data()
+
+    yield "collect_sensor_data", main.collect_sensor_data, 5000
+    yield "payload_json", lambda: json.dumps(main.telemetry_encoder.encode(data), separators=(",", ":"), ensure_ascii=False), 5000
+    yield "payload_binary", lambda: encode_record(data), 5000
+
+
+# ---------- 측정 ----------
+
+def measure(fn, iterations, warmup):
+    if iterations == 1:
+        # 🔹 모델 학습처럼 한 번만 도는 항목은 tracemalloc 부하(수 배)가 커서 같은 실행의 최대 RSS 증가량 사용
+        reset_peak_rss()
+        base = proc_status_kib("VmRSS")
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        peak = proc_status_kib("VmHWM")
+        return {"iterations": 1, "mean_ms": elapsed, "p50_ms": elapsed, "p95_ms": elapsed, "min_ms": elapsed,
+                "std_ms": 0.0, "peak_kib": max(0, peak - base) if peak and base else 0.0, "memory": "rss"}
+
+    for _ in range(warmup):
+        fn()
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - start
+    samples *= 1000
+    result = {
+        "iterations": iterations,
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "min_ms": float(samples.min()),
+        "std_ms": float(samples.std()),
+    }
+    # 🔹 1회 호출 동안의 Python/NumPy 할당 최대치 (TensorFlow 내부 할당은 잡히지 않음)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["peak_kib"] = (peak - base) / 1024
+    result["memory"] = "tracemalloc"
+    return result
+
+
+def proc_status_kib(key):
+    """/proc/self/status 의 메모리 항목 (KiB), 없으면 None"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """VmHWM(최대 RSS)을 현재 RSS 로 초기화 (리눅스 4.0+)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names, args):
+    results = {}
+    for name in names:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext():
+            benchmarks = list(CASES[name]["setup"](args))
+        for label, fn, iterations in benchmarks:
+            iterations = max(1, int(iterations * args.scale)) if iterations > 1 else 1
+            warmup = min(20, iterations) if iterations > 1 else 0
+            with contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext():
+                result = measure(fn, iterations, warmup)
+            results[label] = result
+            print(f"{label:>36}: p50={result['p50_ms']:10.4f} ms  p95={result['p95_ms']:10.4f} ms  "
+                  f"mean={result['mean_ms']:10.4f} ms  peak={result['peak_kib']:9.1f} KiB  n={iterations}")
+        print(f"{'':>36}  ({name}: {time.perf_counter() - started:.1f}s)")
+    return results
+
+
+def compare(baseline, current, threshold, min_kib=64.0):
+    """p50 시간과 최대 메모리를 비교, 회귀 항목 목록 반환"""
+    regressions = []
+    print(f"\n🔹 비교 기준: {baseline['meta'].get('commit')} ({baseline['meta'].get('date')}), 임계값 +{threshold:.0%}")
+    for label, result in current.items():
+        before = baseline["results"].get(label)
+        if before is None:
+            print(f"{label:>36}: 새 항목")
+            continue
+        time_ratio = result["p50_ms"] / before["p50_ms"] if before["p50_ms"] else 1.0
+        mem_diff = result["peak_kib"] - before["peak_kib"]
+        mem_ratio = result["peak_kib"] / before["peak_kib"] if before["peak_kib"] else 1.0
+        slow = time_ratio > 1 + threshold
+        # 작은 할당량 차이는 잡음으로 보고 무시
+        bloat = mem_ratio > 1 + threshold and mem_diff > min_kib
+        mark = "❌" if slow or bloat else "✅"
+        print(f"{label:>36}: {mark} time x{time_ratio:5.2f}  memory x{mem_ratio:5.2f} ({mem_diff:+.1f} KiB)")
+        if slow or bloat:
+            regressions.append(label)
+    for label in baseline["results"]:
+        if label not in current:
+            print(f"{label:>36}: 측정 안 됨")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="디바이스 핫패스 벤치마크 (JSON 저장, 이전 결과와 비교)")
+    parser.add_argument("--only", nargs="+", choices=list(CASES), help="측정할 항목")
+    parser.add_argument("--quick", action="store_true", help="느린 항목(모델 학습) 제외")
+    parser.add_argument("--train-rows", type=int, nargs="+", default=[500, 2000, 8000], help="학습 벤치마크 이력 행 수")
+    parser.add_argument("--frames", default=None, help="bench_motion.py --record 로 저장한 프레임 .npz")
+    parser.add_argument("--scale", type=float, default=1.0, help="반복 횟수 배율")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본: benchmarks/results/<커밋>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판정 비율 (0.2 = 20%% 이상 느려지면 실패)")
+    parser.add_argument("--verbose", action="store_true", help="측정 중 print 출력 표시")
+    args = parser.parse_args()
+
+    names = args.only or [name for name, spec in CASES.items() if not (args.quick and spec["slow"])]
+    results = run(names, args)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "cases": names,
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"✅ 결과 저장: {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"❌ 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ 회귀 없음")
@@ -0,0 +1,112 @@
+// 디바이스 바이너리 텔레메트리 디코더 (hardware/telemetry_codec.py 와 같은 형식)
+// 헤더: 버전(uint8) + 필드 존재 비트마스크(uint64), 이어서 존재하는 숫자 필드를 순서대로(little-endian, 패딩 없음),
+// 마지막에 문자열 필드(길이 uint16 + UTF-8 바이트)
+
+export const TELEMETRY_CODEC_VERSION = 2;
+
+// 필드 순서 고정 (hardware/telemetry_codec.py 의 TELEMETRY_FIELDS 와 같아야 함)
+// B/H/I: 부호 없는 정수, b: 부호 있는 정수, f: float32, ?: bool, s: 문자열
+export const TELEMETRY_FIELDS: [string, string][] = [
+  ["air_quality_score", "f"],
+  ["air_quality", "H"],
+  ["tvoc", "H"],
+  ["eco2", "H"],
+  ["temp", "f"],
+  ["humidity", "f"],
+  ["adc_raw", "H"],
+  ["pm25_raw", "f"],
+  ["pm25_filtered", "f"],
+  ["pm10_estimate", "f"],
+  ["mq135_raw", "I"],
+  ["mq135_co2_ppm", "f"],
+  ["mq7_raw", "I"],
+  ["mq7_co_ppm", "f"],
+  ["mq4_raw", "I"],
+  ["mq4_methane_ppm", "f"],
+  ["motionDetectedTime", "I"],
+  ["isPurifierOn", "?"],
+  ["purifierSpeed", "B"],
+  ["purifierAutoOn", "H"],
+  ["purifierAutoOff", "H"],
+  ["purifierMode", "B"],
+  ["isDiffuserOn", "?"],
+  ["diffuserSpeed", "B"],
+  ["diffuserPeriod", "I"],
+  ["diffuserType", "B"],
+  ["diffuserMode", "B"],
+  ["predicted_air_quality", "f"],
+  ["current_smell", "b"],
+  ["aiRecommendation_code", "B"],
+  ["seq", "I"],
+  ["keyframe", "?"],
+  ["aiRecommendation", "s"],
+  ["smell_status", "s"],
+  ["pm25_stderr", "f"],
+  ["samples_used", "H"],
+  ["jitter_ms", "f"],
+  ["jitter_max_ms", "f"],
+];
+
+const HEADER_SIZE = 9;
+const utf8 = new TextDecoder("utf-8");
+
+function hasField(maskLow: number, maskHigh: number, idx: number): boolean {
+  // 비트마스크는 uint64 지만 BigInt 없이 하위/상위 32비트로 나눠 확인
+  return idx < 32 ? ((maskLow >>> idx) & 1) === 1 : ((maskHigh >>> (idx - 32)) & 1) === 1;
+}
+
+function readNumber(view: DataView, offset: number, fmt: string): [number | boolean, number] {
+  switch (fmt) {
+    case "f":
+      return [view.getFloat32(offset, true), offset + 4];
+    case "I":
+      return [view.getUint32(offset, true), offset + 4];
+    case "H":
+      return [view.getUint16(offset, true), offset + 2];
+    case "B":
+      return [view.getUint8(offset), offset + 1];
+    case "b":
+      return [view.getInt8(offset), offset + 1];
+    case "?":
+      return [view.getUint8(offset) !== 0, offset + 1];
+    default:
+      throw new Error(`알 수 없는 텔레메트리 형식: ${fmt}`);
+  }
+}
+
+// bytes → 센서 레코드 (인코딩된 필드만 포함)
+export function decodeTelemetry(payload: ArrayBuffer | Uint8Array): Record<string, number | boolean | string> {
+  const bytes = payload instanceof Uint8Array ? payload : new Uint8Array(payload);
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  const version = view.getUint8(0);
+  if (version < 1 || version > TELEMETRY_CODEC_VERSION) {
+    throw new Error(`지원하지 않는 텔레메트리 버전: ${version}`);
+  }
+  const maskLow = view.getUint32(1, true);
+  const maskHigh = view.getUint32(5, true);
+
+  const record: Record<string, number | boolean | string> = {};
+  let offset = HEADER_SIZE;
+  TELEMETRY_FIELDS.forEach(([name, fmt], idx) => {
+    if (fmt !== "s" && hasField(maskLow, maskHigh, idx)) {
+      [record[name], offset] = readNumber(view, offset, fmt);
+    }
+  });
+  TELEMETRY_FIELDS.forEach(([name, fmt], idx) => {
+    if (fmt === "s" && hasField(maskLow, maskHigh, idx)) {
+      const length = view.getUint16(offset, true);
+      offset += 2;
+      record[name] = utf8.decode(bytes.subarray(offset, offset + length));
+      offset += length;
+    }
+  });
+  return record;
+}
+
+// sensorData 메시지 → 레코드 (binary 모드의 {device_key, bin} 과 JSON 모드 모두 처리)
+export function unwrapTelemetry(message: any): Record<string, any> {
+  if (message && message.bin !== undefined) {
+    return { ...decodeTelemetry(message.bin), device_key: message.device_key };
+  }
+  return message;
+}
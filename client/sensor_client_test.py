@@ -1,8 +1,16 @@
 import socketio
 import time
 import random
+import os
+import sys
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "hardware")))
+from telemetry_codec import wrap_binary
+
+# binary 로 설정하면 디바이스의 TELEMETRY_MODE=binary 와 같은 {device_key, bin} 형태로 전송
+TELEMETRY_MODE = os.getenv("TELEMETRY_MODE", "full")
+
 def minutes_to_hhmm(minutes: int) -> str:
     hours = minutes // 60
     mins = minutes % 60
@@ -120,7 +128,12 @@ def send_sensor_loop():
     while True:
         data = generate_dummy_data()
         print("📤 Sending sensor data...")
-        sio.emit("sensor_data", data)
+        if TELEMETRY_MODE == "binary":
+            message = wrap_binary(data)
+            print(f"   binary {len(message['bin'])} bytes")
+            sio.emit("sensor_data", message)
+        else:
+            sio.emit("sensor_data", data)
         time.sleep(2)
 
 if __name__ == "__main__":
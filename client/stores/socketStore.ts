@@ -1,5 +1,6 @@
 import { create } from "zustand";
 import io from "socket.io-client";
+import { unwrapTelemetry } from "@/lib/telemetryCodec";
 
 // 서버 주소 (라즈베리파이)
 const SOCKET_SERVER_URL = process.env.NEXT_PUBLIC_SOCKET_SERVER_URL!;
@@ -166,7 +167,12 @@ export const useSocketStore = create<SocketState>((set) => ({
 
 function setupSocketListeners() {
   socket.on("sensorData", (data) => {
-    useSocketStore.getState().updateData(data);
+    // TELEMETRY_MODE=binary / delta-binary 이면 {device_key, bin} 으로 오므로 디코딩 후 반영
+    try {
+      useSocketStore.getState().updateData(unwrapTelemetry(data));
+    } catch (error) {
+      console.error("센서 데이터 디코딩 실패:", error);
+    }
   });
 
   socket.on("aiRecommendation", (message) => {
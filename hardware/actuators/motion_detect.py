@@ -1,69 +1,206 @@
 #!/usr/bin/python3
 import cv2
 import numpy as np
+import queue
+import threading
 import time
-from picamera2 import Picamera2
 
 class MotionSensor:
-    def __init__(self, resolution=(640, 480), sensitivity=800, decay_rate=0.05, cooldown_time=3):
+    SAMPLE_PERIOD = 0.1  # 초, 캡처 스레드 프레임 간격 (저해상도 감지라 10fps 도 부담이 적음)
+
+    def __init__(self, resolution=(640, 480), sensitivity=800, decay_rate=0.05, cooldown_time=3, lores_size=(160, 120), roi=None, camera=None, frame_broker=None, clock=time):
         """카메라 기반 모션 감지 센서
-        - sensitivity: 감지 임계값 (값이 클수록 둔감)
+        - sensitivity: 감지 임계값 (값이 클수록 둔감, resolution 기준 윤곽선 넓이)
         - decay_rate: 배경 업데이트 속도 (값이 클수록 빠르게 초기화)
         - cooldown_time: 모션 감지 후 다시 감지할 때까지 대기 시간 (초)
+        - lores_size: 감지에 쓰는 저해상도 스트림 크기 (None 이면 main 스트림 전체 해상도로 감지)
+          저해상도에서는 sensitivity 와 블러 커널을 해상도 비율만큼 줄여 같은 크기의 움직임에 반응
+        - roi: 감지 영역 목록 [(x0, y0, x1, y1), ...] (0~1 비율 좌표), None 이면 전체 화면
+        - camera: 이미 설정된 카메라 객체 (테스트/재생용), None 이면 Picamera2 생성
+        - frame_broker: 지정하면 웹캠 요청이 있을 때 같은 캡처의 main 프레임을 함께 올림 (카메라 중복 캡처 방지)
+        - clock: 감지 시각과 캡처 주기에 쓰는 시계 (time(), monotonic(), sleep(), 기본 time 모듈, 시뮬레이션은 HAL 시계)
         """
-        self.picam2 = Picamera2()
-        config = self.picam2.create_preview_configuration(main={"size": resolution})
-        self.picam2.configure(config)
-        self.picam2.start()
+        self.clock = clock
+        self.lores_size = lores_size
+        self.frame_broker = frame_broker
+        if camera is None:
+            from picamera2 import Picamera2
+
+            self.picam2 = Picamera2()
+            streams = {"main": {"size": resolution}}
+            if lores_size is not None:
+                streams["lores"] = {"size": lores_size, "format": "YUV420"}
+            config = self.picam2.create_preview_configuration(**streams)
+            self.picam2.configure(config)
+            self.picam2.start()
+
+            # 🔹 카메라 워밍업 시간
+            time.sleep(2)
+        else:
+            self.picam2 = camera
 
-        # 🔹 카메라 워밍업 시간
-        time.sleep(2)
         self.first_frame = None
         self.sensitivity = sensitivity  # 윤곽선 크기 임계값
         self.decay_rate = decay_rate  # 배경 업데이트 속도
         self.cooldown_time = cooldown_time  # 감지 후 쿨다운 시간
         self.last_motion_time = 0  # 마지막 모션 감지 시간
 
-    def detect_motion(self):
-        """모션 감지 함수: 움직임이 감지되면 True 반환, 없으면 False"""
-        current_time = time.time()
+        # 🔹 감지 해상도 기준 파라미터
+        width, height = lores_size or resolution
+        scale = width / resolution[0]
+        self.detect_size = (width, height)
+        self.min_area = sensitivity * scale * scale
+        blur = max(3, int(round(21 * scale)) | 1)  # 홀수 커널
+        self.blur_kernel = (blur, blur)
 
-        # 🔹 최근 감지 후 cooldown_time 동안 감지 방지
-        if current_time - self.last_motion_time < self.cooldown_time:
-            return False
+        # 🔹 프레임마다 새로 할당하지 않도록 버퍼를 미리 생성
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self.blurred = np.empty((height, width), dtype=np.uint8)
+        self.delta = np.empty((height, width), dtype=np.uint8)
+        self.thresh = np.empty((height, width), dtype=np.uint8)
+        self.dilated = np.empty((height, width), dtype=np.uint8)
+        self.roi_mask = self._build_roi_mask(roi, width, height)
 
-        image = self.picam2.capture_array()
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        # 🔹 캡처 스레드 (start() 후 동작)
+        self.events = queue.Queue(maxsize=100)  # 모션 감지 시각 (오래된 것부터 버림)
+        self.frame_interval = self.SAMPLE_PERIOD
+        self.frame_count = 0
+        self._thread = None
+        self._running = False
+
+    @staticmethod
+    def _build_roi_mask(roi, width, height):
+        if not roi:
+            return None
+        mask = np.zeros((height, width), dtype=np.uint8)
+        for x0, y0, x1, y1 in roi:
+            mask[int(y0 * height):int(y1 * height), int(x0 * width):int(x1 * width)] = 255
+        return mask
+
+    def capture_gray(self):
+        """감지용 그레이스케일 프레임 (self.gray 버퍼에 기록)"""
+        width, height = self.detect_size
+        publish = self.frame_broker is not None and self.frame_broker.wants_frame()
+        if self.lores_size is not None:
+            # 🔹 YUV420 의 Y 평면이 곧 그레이스케일 (색 변환 불필요)
+            if publish:
+                # 웹캠 요청이 있으면 같은 요청에서 main 프레임도 함께 가져옴
+                (image, frame), _ = self.picam2.capture_arrays(["main", "lores"])
+                self.frame_broker.publish(image)
+            else:
+                frame = self.picam2.capture_array("lores")
+            np.copyto(self.gray, frame[:height, :width])
+        else:
+            frame = self.picam2.capture_array()
+            if publish:
+                self.frame_broker.publish(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        return self.gray
+
+    def process_frame(self, gray, current_time=None):
+        """그레이스케일 프레임 한 장으로 모션 판정 (배경 갱신 포함)"""
+        if current_time is None:
+            current_time = self.clock.time()
+
+        cv2.GaussianBlur(gray, self.blur_kernel, 0, dst=self.blurred)
 
         # 🔹 초기 프레임 설정 (첫 실행 시)
         if self.first_frame is None:
-            self.first_frame = gray
+            self.first_frame = self.blurred.copy()
             return False  # 첫 번째 실행은 항상 False
 
-        # 🔹 프레임 차이 계산
-        frame_delta = cv2.absdiff(self.first_frame, gray)
-        thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
-        thresh = cv2.dilate(thresh, None, iterations=2)
-
-        # 🔹 윤곽선 찾기
-        contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # 🔹 프레임 차이 계산 (ROI 밖은 0)
+        cv2.absdiff(self.first_frame, self.blurred, dst=self.delta)
+        if self.roi_mask is not None:
+            cv2.bitwise_and(self.delta, self.roi_mask, dst=self.delta)
+        cv2.threshold(self.delta, 25, 255, cv2.THRESH_BINARY, dst=self.thresh)
 
         motion_detected = False
 
-        for contour in contours:
-            if cv2.contourArea(contour) < self.sensitivity:  # 작은 움직임 무시
-                continue
-            motion_detected = True
-            self.last_motion_time = current_time  # 마지막 감지 시간 업데이트
-            break  # 하나라도 감지되면 True 반환
+        # 🔹 변화 픽셀이 없으면 팽창/윤곽선 생략
+        if cv2.countNonZero(self.thresh) > 0:
+            cv2.dilate(self.thresh, None, dst=self.dilated, iterations=2)
+
+            # 🔹 윤곽선 넓이는 변화 영역 외접 사각형 넓이를 넘지 못하므로, 사각형이 임계값보다 작으면 윤곽선 생략
+            _, _, w, h = cv2.boundingRect(self.dilated)
+            if w * h >= self.min_area:
+                contours, _ = cv2.findContours(self.dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+                for contour in contours:
+                    if cv2.contourArea(contour) < self.min_area:  # 작은 움직임 무시
+                        continue
+                    motion_detected = True
+                    self.last_motion_time = current_time  # 마지막 감지 시간 업데이트
+                    break  # 하나라도 감지되면 True 반환
 
         # 🔹 감지된 경우, 기준 프레임을 즉시 업데이트하여 연속 감지 방지
         if motion_detected:
-            self.first_frame = gray  # 배경을 즉시 업데이트
+            np.copyto(self.first_frame, self.blurred)  # 배경을 즉시 업데이트
             return True  # 🔥 모션 감지됨
 
         # 🔹 감지가 없을 경우, 천천히 배경을 업데이트하여 잘못된 감지 방지
-        self.first_frame = cv2.addWeighted(self.first_frame, 1 - self.decay_rate, gray, self.decay_rate, 0)
+        cv2.addWeighted(self.first_frame, 1 - self.decay_rate, self.blurred, self.decay_rate, 0, dst=self.first_frame)
+
+        return False  # 🔹 모션 없음
+
+    def detect_motion(self):
+        """모션 감지 함수: 움직임이 감지되면 True 반환, 없으면 False"""
+        current_time = self.clock.time()
+
+        # 🔹 최근 감지 후 cooldown_time 동안 감지 방지
+        if current_time - self.last_motion_time < self.cooldown_time:
+            if self.frame_broker is not None and self.frame_broker.wants_frame():
+                self.frame_broker.publish(self.picam2.capture_array())
+            return False
+
+        return self.process_frame(self.capture_gray(), current_time)
+
+    # ---------- 캡처 스레드 ----------
+
+    def _publish_event(self, timestamp):
+        try:
+            self.events.put_nowait(timestamp)
+        except queue.Full:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                pass
+            self.events.put_nowait(timestamp)
+
+    def _run(self):
+        next_time = self.clock.monotonic()
+        while self._running:
+            try:
+                if self.detect_motion():
+                    self._publish_event(self.last_motion_time)
+                self.frame_count += 1
+            except Exception as e:
+                print(f"⚠️ 모션 감지 오류: {e}")
+
+            # 🔹 처리 시간과 관계없이 일정한 프레임 간격 유지 (밀리면 다음 프레임부터 다시 맞춤)
+            next_time = max(next_time + self.frame_interval, self.clock.monotonic())
+            self.clock.sleep(max(0, next_time - self.clock.monotonic()))
+
+    def start(self, frame_interval=None):
+        """백그라운드 캡처 스레드 시작, 이후 get_events() 로 감지 시각을 가져감"""
+        if frame_interval is not None:
+            self.frame_interval = frame_interval
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="motion-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2)
 
-        return False  # 🔹 모션 없음
\ No newline at end of file
+    def get_events(self):
+        """쌓인 모션 감지 시각 목록 (가져가면 비워짐)"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
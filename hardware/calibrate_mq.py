@@ -1,20 +1,19 @@
 import time
-import board
-import busio
-import digitalio
-from adafruit_mcp3xxx.mcp3008 import MCP3008
-from adafruit_mcp3xxx.analog_in import AnalogIn
 import adafruit_mcp3xxx.mcp3008 as MCP
 
-# SPI 세팅
-spi = busio.SPI(clock=board.SCK, MISO=board.MISO, MOSI=board.MOSI)
-cs = digitalio.DigitalInOut(board.D5) 
-mcp = MCP3008(spi, cs)
+from sensors.mcp3008_adc import get_shared_adc
+
+# SPI 세팅 (MQ 센서 드라이버와 같은 공용 MCP3008 관리자 사용)
+adc = get_shared_adc()
 
 # 채널 세팅
-chan_mq135 = AnalogIn(mcp, MCP.P1)
-chan_mq7 = AnalogIn(mcp, MCP.P2)
-chan_mq4 = AnalogIn(mcp, MCP.P3)
+CHANNELS = {
+    "MQ135": MCP.P1,
+    "MQ7": MCP.P2,
+    "MQ4": MCP.P3,
+}
+for channel in CHANNELS.values():
+    adc.add_channel(channel)
 
 # 설정 값
 VREF = 3.3       # MCP3008 기준 전압
@@ -26,7 +25,7 @@ CLEAN_AIR_FACTORS = {
 }
 
 def calibrate(channel, sensor_name):
-    sensor_voltage = channel.voltage  # 전압 읽기
+    sensor_voltage = adc.voltage(channel)  # 전압 읽기 (틱마다 전체 채널 한 번에 읽은 값)
     if sensor_voltage == 0:
         return None  # 0V면 오류 방지
     
@@ -41,9 +40,8 @@ def main():
     time.sleep(2)
 
     while True:
-        calibrate(chan_mq135, "MQ135")
-        calibrate(chan_mq7, "MQ7")
-        calibrate(chan_mq4, "MQ4")
+        for sensor_name, channel in CHANNELS.items():
+            calibrate(channel, sensor_name)
 
         print("-" * 50)
         time.sleep(1)  # 1초 간격
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+from dotenv import load_dotenv
+
+try:
+    import simplejpeg  # libjpeg-turbo 직접 호출, cv2.imencode 보다 빠름
+except ImportError:
+    simplejpeg = None
+
+load_dotenv()
+
+WEBCAM_JPEG_QUALITY = int(os.getenv("WEBCAM_JPEG_QUALITY", "70"))
+WEBCAM_MAX_WIDTH = int(os.getenv("WEBCAM_MAX_WIDTH", "640"))
+
+
+class FrameBroker:
+    def __init__(self, quality=WEBCAM_JPEG_QUALITY, max_width=WEBCAM_MAX_WIDTH, max_age=1.0, demand_time=5.0):
+        """카메라 최신 프레임과 JPEG 인코딩 캐시
+        - 모션 캡처 스레드가 publish() 로 프레임을 올리면 순번(seq) 증가
+        - JPEG 은 seq 당 한 번만 인코딩, 여러 대시보드 요청이 같은 결과를 재사용
+        - 최근 demand_time 초 안에 요청이 있을 때만 프레임이 필요하다고 알림 (요청이 없으면 캡처 복사 생략)
+        - max_width 보다 큰 프레임은 비율 유지 축소 후 인코딩
+        - simplejpeg 가 있으면 사용, 없으면 cv2.imencode (채널 해석은 둘 다 BGR/BGRX)
+        """
+        self.quality = quality
+        self.max_width = max_width
+        self.max_age = max_age
+        self.demand_time = demand_time
+
+        self._frame = None
+        self._frame_time = 0  # monotonic
+        self._seq = 0
+        self._jpeg = None
+        self._jpeg_seq = -1
+        self._last_request = 0
+        self._cond = threading.Condition()
+        self._encode_lock = threading.Lock()
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def wants_frame(self):
+        """새 프레임을 올려야 하는지 (최근 요청이 있었거나 아직 프레임이 없을 때)"""
+        now = time.monotonic()
+        return now - self._last_request < self.demand_time or self._frame is None
+
+    def publish(self, frame):
+        with self._cond:
+            self._frame = frame
+            self._frame_time = time.monotonic()
+            self._seq += 1
+            self._cond.notify_all()
+            return self._seq
+
+    def latest(self, wait=0.5):
+        """(seq, 프레임) 반환, 프레임이 max_age 보다 오래되었으면 새 프레임을 최대 wait 초 기다림"""
+        with self._cond:
+            self._last_request = time.monotonic()
+            if self._frame is None or time.monotonic() - self._frame_time > self.max_age:
+                seq = self._seq
+                self._cond.wait_for(lambda: self._seq != seq, timeout=wait)
+            return self._seq, self._frame
+
+    def _encode(self, frame):
+        height, width = frame.shape[:2]
+        if width > self.max_width:
+            size = (self.max_width, int(height * self.max_width / width))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if simplejpeg is not None:
+            if frame.ndim == 2:
+                frame = frame[:, :, np.newaxis]
+            channels = frame.shape[2]
+            colorspace = {1: "GRAY", 3: "BGR", 4: "BGRX"}[channels]
+            return simplejpeg.encode_jpeg(np.ascontiguousarray(frame), quality=self.quality, colorspace=colorspace,
+                                          colorsubsampling="Gray" if channels == 1 else "420")
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        return buffer.tobytes() if ok else None
+
+    def get_jpeg(self, wait=0.5):
+        """(seq, JPEG 바이트) 반환, 프레임이 없으면 (seq, None)"""
+        seq, frame = self.latest(wait)
+        if frame is None:
+            return seq, None
+        # 🔹 같은 seq 를 동시에 요청해도 인코딩은 한 번만 (이미 더 새 프레임이 인코딩되었으면 그대로 사용)
+        with self._encode_lock:
+            if self._jpeg_seq < seq:
+                self._jpeg = self._encode(frame)
+                self._jpeg_seq = seq
+            return self._jpeg_seq, self._jpeg
@@ -0,0 +1,190 @@
+import os
+import time
+from abc import ABC, abstractmethod
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# real: 라즈베리파이 실제 센서/액추에이터, sim: 기록 재생 + 합성 카메라 (일반 리눅스에서 실행/벤치마크용)
+HARDWARE_BACKEND = os.getenv("HARDWARE_BACKEND", "real")
+HARDWARE_SIM_SPEED = float(os.getenv("HARDWARE_SIM_SPEED", "1"))  # 배속
+HARDWARE_SIM_TRACE = os.getenv("HARDWARE_SIM_TRACE", "")  # 재생할 CSV (기본: hardware/fixtures/sim_trace.csv)
+HARDWARE_SIM_INTERVAL = float(os.getenv("HARDWARE_SIM_INTERVAL", "2.0"))  # CSV 행 간격(초)
+
+
+class RealClock:
+    """실제 시계 (time 모듈 그대로)"""
+    speed = 1.0
+
+    @staticmethod
+    def time():
+        return time.time()
+
+    @staticmethod
+    def monotonic():
+        return time.monotonic()
+
+    @staticmethod
+    def sleep(seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    @staticmethod
+    def wait(event, timeout):
+        return event.wait(max(0.0, timeout))
+
+
+class HardwareBackend(ABC):
+    """센서/액추에이터 생성 인터페이스 (메서드를 하나라도 빠뜨린 백엔드는 생성 시점에 TypeError)
+    - 각 메서드는 기존 드라이버와 같은 메서드(get_data, set_speed, turn_on/off, detect_motion ...)를 가진 객체 반환
+    - clock: 메인 루프 주기와 디퓨저 타이머에 쓰는 시계 (sim 은 가상 시계)
+    """
+    name = None
+    clock = RealClock()
+
+    @abstractmethod
+    def ens(self):
+        pass
+
+    @abstractmethod
+    def dht22(self):
+        pass
+
+    @abstractmethod
+    def gp2y(self):
+        pass
+
+    @abstractmethod
+    def mq135(self):
+        pass
+
+    @abstractmethod
+    def mq7(self):
+        pass
+
+    @abstractmethod
+    def mq4(self):
+        pass
+
+    @abstractmethod
+    def motion(self, **kwargs):
+        pass
+
+    @abstractmethod
+    def fan(self, pin):
+        pass
+
+    @abstractmethod
+    def ultrasonic(self, pin):
+        pass
+
+
+class RealHardwareBackend(HardwareBackend):
+    """실제 드라이버 (하드웨어 라이브러리는 생성할 때 import)"""
+    name = "real"
+
+    def ens(self):
+        from sensors.ens import ENSSensor
+        return ENSSensor()
+
+    def dht22(self):
+        from sensors.dht22 import DHT22Sensor
+        return DHT22Sensor()
+
+    def gp2y(self):
+        from sensors.gp2y import GP2YSensor
+        return GP2YSensor()
+
+    def mq135(self):
+        from sensors.mq135 import MQ135Sensor
+        return MQ135Sensor()
+
+    def mq7(self):
+        from sensors.mq7 import MQ7Sensor
+        return MQ7Sensor()
+
+    def mq4(self):
+        from sensors.mq4 import MQ4Sensor
+        return MQ4Sensor()
+
+    def motion(self, **kwargs):
+        from actuators.motion_detect import MotionSensor
+        return MotionSensor(**kwargs)
+
+    def fan(self, pin):
+        from actuators.fan import FanController
+        return FanController(pin=pin)
+
+    def ultrasonic(self, pin):
+        from actuators.ultrasonic import UltrasonocController
+        return UltrasonocController(pin=pin)
+
+
+class SimHardwareBackend(HardwareBackend):
+    def __init__(self, speed=HARDWARE_SIM_SPEED, trace_file=HARDWARE_SIM_TRACE, interval=HARDWARE_SIM_INTERVAL, seed=0):
+        """시뮬레이션 백엔드
+        - 센서값은 CSV 기록을 interval 초 간격으로 재생 (끝나면 반복)
+        - 카메라는 주기적으로 물체가 지나가는 합성 프레임
+        - 센서값/프레임/액추에이터 기록 시각과 센서 스케줄러/모션 캡처 주기는 모두 가상 시계(SimClock) 기준
+          → 같은 설정이면 실행 속도와 무관하게 항상 같은 값
+        - speed 는 가상 시각이 흐를 때의 실제 대기 비율만 바꿈 (inf 면 대기 없이 실행)
+        """
+        from sim_hardware import DEFAULT_TRACE_FILE, SimClock, SimTrace
+
+        self.name = "sim"
+        self.clock = SimClock(speed)
+        self.trace = SimTrace(trace_file or DEFAULT_TRACE_FILE, self.clock, interval, seed)
+        self.seed = seed
+
+    def ens(self):
+        from sim_hardware import SimENSSensor
+        return SimENSSensor(self.trace)
+
+    def dht22(self):
+        from sim_hardware import SimDHT22Sensor
+        return SimDHT22Sensor(self.trace)
+
+    def gp2y(self):
+        from sim_hardware import SimGP2YSensor
+        return SimGP2YSensor(self.trace)
+
+    def mq135(self):
+        from sim_hardware import SimMQSensor
+        return SimMQSensor(self.trace, "mq135", "mq135_co2_ppm", 0.15)
+
+    def mq7(self):
+        from sim_hardware import SimMQSensor
+        return SimMQSensor(self.trace, "mq7", "mq7_co_ppm", 0.0005)
+
+    def mq4(self):
+        from sim_hardware import SimMQSensor
+        return SimMQSensor(self.trace, "mq4", "mq4_methane_ppm", 0.002)
+
+    def motion(self, **kwargs):
+        from actuators.motion_detect import MotionSensor
+        from sim_hardware import SimCamera
+
+        resolution = kwargs.get("resolution", (640, 480))
+        lores_size = kwargs.get("lores_size", (160, 120))
+        camera = SimCamera(self.clock, resolution, lores_size or resolution, seed=self.seed)
+        return MotionSensor(camera=camera, clock=self.clock, **kwargs)
+
+    def fan(self, pin):
+        from sim_hardware import SimFanController
+        return SimFanController(self.clock, pin=pin)
+
+    def ultrasonic(self, pin):
+        from sim_hardware import SimUltrasonicController
+        return SimUltrasonicController(self.clock, pin=pin)
+
+
+def create_backend(name=None):
+    """HARDWARE_BACKEND 환경변수(real/sim)에 맞는 백엔드 생성"""
+    name = name or HARDWARE_BACKEND
+    if name == "sim":
+        print(f"🧪 시뮬레이션 하드웨어 사용 (x{HARDWARE_SIM_SPEED:g})")
+        return SimHardwareBackend()
+    if name != "real":
+        print(f"⚠️ 알 수 없는 HARDWARE_BACKEND: {name}, real 사용")
+    return RealHardwareBackend()
@@ -1,13 +1,12 @@
-from sensors.ens import ENSSensor
-from sensors.gp2y import GP2YSensor
-from sensors.mq135 import MQ135Sensor
-from sensors.mq7 import MQ7Sensor
-from sensors.mq4 import MQ4Sensor
-from sensors.dht22 import DHT22Sensor
-
-from actuators.motion_detect import MotionSensor
-from actuators.fan import FanController
-from actuators.ultrasonic import UltrasonocController
+from hal import create_backend
+from sensor_poller import SensorPoller
+from frame_broker import FrameBroker
+from webcam_stream import WebcamStreamer
+from telemetry_delta import make_telemetry_encoder
+from outbox import TelemetryOutbox
+from sensor_trace import TRACE_FILE, TraceRecorder
+from metrics import LoopMetrics, start_metrics_server
+from ticker import FixedRateTicker
 
 import time
 import socketio
@@ -25,7 +24,17 @@ from ai import predict_func
 load_dotenv()
 
 DEVICE_KEY = os.getenv('DEVICE_KEY')
+SOCKET_SERVER_URL = os.getenv('SOCKET_SERVER_URL', "http://ec2-13-125-170-246.ap-northeast-2.compute.amazonaws.com:3001")
+LOOP_INTERVAL = 2  # 초, 메인 루프 주기 (작업 시간 포함)
+LOOP_OVERRUN = os.getenv('LOOP_OVERRUN', 'coalesce')  # 주기를 넘긴 틱 처리: coalesce(바로 1회 실행) / skip(다음 주기까지 대기)
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))  # 설정하면 http://<pi>:<port>/metrics 로 Prometheus 텍스트 제공
+METRICS_INTERVAL = float(os.getenv('METRICS_INTERVAL', '60'))  # 초, device_metrics 이벤트 주기 (0 이면 끔)
+# 단계별 허용 시간(초), 넘으면 missed 로 집계
+STAGE_BUDGETS = {"sensors": 0.05, "collect_data": 0.2, "control": 0.05, "emit": 0.1, "tick": 0.5, "lateness": 0.05}
 sio = socketio.Client()
+telemetry_encoder = make_telemetry_encoder()  # TELEMETRY_MODE=delta 이면 키프레임 + 변경 필드만 전송
+outbox = TelemetryOutbox()  # 연결이 끊긴 동안의 센서 데이터 보관 (재연결 후 배치 재전송)
+loop_metrics = LoopMetrics(STAGE_BUDGETS)  # 메인 루프 단계별 지연 히스토그램
 last_motion_time = 0
 purifier_mode = 0
 purifier_speed = 2
@@ -66,7 +75,7 @@ def drive_by_ai(predicted_air_quality, current_smell):
         ultrasonic2.turn_off()
         return
 
-    now = time.time()
+    now = clock.time()
     best_speed = (predicted_air_quality - 1) / 3 * 4
     best_speed = max(0, min(4, int(round(best_speed))))
 
@@ -82,6 +91,36 @@ def drive_by_ai(predicted_air_quality, current_smell):
 def connect():
     print("✅ Connected to server")
     sio.emit("register_device", {"device_key": DEVICE_KEY})
+    telemetry_encoder.reset()  # 재연결 직후에는 전체 상태부터 전송
+    outbox.start_replay(send_outbox_batch, lambda: sio.connected)
+
+def send_outbox_batch(records):
+    """보관 데이터 배치 전송, 서버 ack 를 받아야 성공 (서버 측 전용, 대시보드 실시간 화면에는 표시되지 않음)"""
+    ack = sio.call("sensor_data_batch", {"device_key": DEVICE_KEY, "records": records}, timeout=10)
+    return bool(ack)
+
+def send_sensor_data(data):
+    """센서 데이터 전송, 연결이 없거나 전송에 실패하면 outbox 에 보관"""
+    if sio.connected:
+        try:
+            payload = telemetry_encoder.encode(data)
+        except Exception as e:
+            # 대시보드에서 받은 잘못된 제어값 등으로 인코딩이 실패해도 루프는 계속 (이번 틱은 원본 JSON)
+            print("⚠️ 센서 데이터 인코딩 실패, 원본 전송:", e)
+            telemetry_encoder.reset()
+            payload = data
+        try:
+            sio.emit("sensor_data", payload)
+            return
+        except socketio.exceptions.SocketIOError as e:
+            print("❌ 센서 데이터 전송 실패:", e)
+            telemetry_encoder.reset()
+    outbox.put(data)
+
+def send_device_metrics():
+    """메인 루프 단계별 지연(p50/p95/p99)과 기한 초과 횟수 전송"""
+    if sio.connected:
+        sio.emit("device_metrics", {"device_key": DEVICE_KEY, **loop_metrics.snapshot()})
 
 @sio.event
 def disconnect():
@@ -90,9 +129,11 @@ def disconnect():
 @sio.on("fetch_webcam_image")
 def send_webcam_image():
     try:
-        image = motion.picam2.capture_array()
-        _, buffer = cv2.imencode('.jpg', image)
-        image_bytes = buffer.tobytes()
+        # 🔹 모션 캡처 스레드가 올린 최신 프레임 사용 (같은 프레임의 JPEG 은 한 번만 인코딩)
+        _, image_bytes = frame_broker.get_jpeg()
+        if image_bytes is None:
+            frame_broker.publish(motion.picam2.capture_array())
+            _, image_bytes = frame_broker.get_jpeg()
         sio.emit("webcamImage", {"device_key": DEVICE_KEY, "image_data": image_bytes})
     except Exception as e:
         print("❌ 이미지 전송 실패:", e)
@@ -100,6 +141,8 @@ def send_webcam_image():
 @sio.on("control")
 def on_control(data):
     print("🛠️ Control signal received:", data)
+    if trace_recorder:
+        trace_recorder.record("control", None, data)
     device = data.get("device")
     state = data.get("state")
     if device == "isPurifierOn":
@@ -126,6 +169,10 @@ def on_control(data):
         else:
             print("공기질 예측 모드 종료")
             predict_func.stop_prediction = True
+    elif device == "webcamStream":
+        # 🔹 state: 요청 fps (true 는 기본 fps, 0/false 는 정지), 실제 fps 는 상태로 회신
+        webcam_streamer.start(state)
+        sio.emit("device_status", get_current_status())
     elif device == "getStatus":
         sio.emit("device_status", get_current_status())
     elif device == "isDiffuserOn":
@@ -165,20 +212,27 @@ def get_current_status():
         "diffuserSpeed": diffuser_speed,
         "diffuserPeriod": diffuser_period,
         "diffuserType": diffuser_type,
-        "diffuserMode": diffuser_mode
+        "diffuserMode": diffuser_mode,
+        "webcamStream": webcam_streamer.fps
     }
 
 def collect_sensor_data():
     global last_motion_time
-    ens_data = ens.get_data() or {}
-    dht22_data  = dht22.get_data() or {}
-    gp2y_data = gp2y.get_data() or {}
-    mq135_data = mq135.get_data() or {}
-    mq7_data = mq7.get_data() or {}
-    mq4_data = mq4.get_data() or {}
-
-    if motion.detect_motion() or last_motion_time==0:
-        last_motion_time = int(time.time())
+    # 센서별 주기로 갱신되는 최신값 테이블 (지연/실패 센서는 마지막 정상값)
+    readings = sensor_poller.snapshot()
+    ens_data = readings.get("ens") or {}
+    dht22_data  = readings.get("dht22") or {}
+    gp2y_data = readings.get("gp2y") or {}
+    mq135_data = readings.get("mq135") or {}
+    mq7_data = readings.get("mq7") or {}
+    mq4_data = readings.get("mq4") or {}
+
+    # 🔹 모션은 캡처 스레드가 쌓은 감지 이벤트를 가져와 가장 최근 시각 사용 (가져가면 비워짐)
+    events = motion.get_events()
+    if events:
+        last_motion_time = int(events[-1])
+    elif last_motion_time == 0:
+        last_motion_time = int(clock.time())
 
     return {
         "device_key": DEVICE_KEY,
@@ -193,6 +247,10 @@ def collect_sensor_data():
         "pm25_raw": gp2y_data.get("pm25_raw", 0.0),
         "pm25_filtered": gp2y_data.get("pm25_filtered", 0.0),
         "pm10_estimate": gp2y_data.get("pm10_estimate", 0.0),
+        "pm25_stderr": gp2y_data.get("pm25_stderr", 0.0),
+        "samples_used": gp2y_data.get("samples_used", 0),
+        "jitter_ms": gp2y_data.get("jitter_ms", 0.0),
+        "jitter_max_ms": gp2y_data.get("jitter_max_ms", 0.0),
 
         "mq135_raw": mq135_data.get("mq135_raw", 0),
         "mq135_co2_ppm": mq135_data.get("mq135_co2_ppm", 0.0),
@@ -224,81 +282,145 @@ def collect_sensor_data():
         "aiRecommendation_code": latest_prediction.get("aiRecommendation_code")
     }
 
-# 🔹 센서 및 액추에이터 초기화
-mq135 = MQ135Sensor()
-mq7 = MQ7Sensor()
-mq4 = MQ4Sensor()
-ens = ENSSensor()
-dht22 = DHT22Sensor()
-gp2y = GP2YSensor()
-motion = MotionSensor(sensitivity=800, decay_rate=0.05, cooldown_time=0)
-fan1 = FanController(pin=19)
-fan2 = FanController(pin=13)
-ultrasonic1 = UltrasonocController(pin=6)
-ultrasonic2 = UltrasonocController(pin=12)
+# 🔹 센서 및 액추에이터 초기화 (HARDWARE_BACKEND=sim 이면 기록 재생 시뮬레이터)
+hardware = create_backend()
+clock = hardware.clock
+mq135 = hardware.mq135()
+mq7 = hardware.mq7()
+mq4 = hardware.mq4()
+ens = hardware.ens()
+dht22 = hardware.dht22()
+gp2y = hardware.gp2y()
+frame_broker = FrameBroker()
+motion = hardware.motion(sensitivity=800, decay_rate=0.05, cooldown_time=0, frame_broker=frame_broker)
+fan1 = hardware.fan(pin=19)
+fan2 = hardware.fan(pin=13)
+ultrasonic1 = hardware.ultrasonic(pin=6)
+ultrasonic2 = hardware.ultrasonic(pin=12)
+
+# 🔹 TRACE_FILE 을 지정하면 센서 드라이버 출력/제어 이벤트 기록 (trace_replay.py 로 재생)
+trace_recorder = TraceRecorder(TRACE_FILE, clock=clock) if TRACE_FILE else None
+if trace_recorder:
+    print(f"📼 센서/제어 기록: {TRACE_FILE}")
+    ens, dht22, gp2y, mq135, mq7, mq4 = (trace_recorder.wrap(name, driver) for name, driver in [
+        ("ens", ens), ("dht22", dht22), ("gp2y", gp2y), ("mq135", mq135), ("mq7", mq7), ("mq4", mq4)])
+
+# 🔹 센서 주기 스케줄러 (주기는 각 드라이버의 SAMPLE_PERIOD, GP2Y/MCP3008 은 같은 SPI 버스라 순차 실행)
+# GP2Y 버스트(약 0.32초) 동안 MQ 읽기가 기다릴 수 있어 SPI 센서 timeout 은 1초
+sensor_poller = SensorPoller(clock=clock)
+sensor_poller.add("ens", ens.get_data, bus="i2c", timeout=0.5)
+sensor_poller.add("dht22", dht22.get_data, bus="dht22", timeout=1.0)
+sensor_poller.add("gp2y", gp2y.get_data, bus="spi", timeout=1.0)
+sensor_poller.add("mq135", mq135.get_data, bus="spi", timeout=1.0)
+sensor_poller.add("mq7", mq7.get_data, bus="spi", timeout=1.0)
+sensor_poller.add("mq4", mq4.get_data, bus="spi", timeout=1.0)
+
+def send_stream_frame(seq, image_bytes):
+    sio.emit("webcamImage", {"device_key": DEVICE_KEY, "image_data": image_bytes, "seq": seq, "stream": True})
+
+def socket_pending():
+    """소켓 송신 대기 패킷 수 (네트워크가 느리면 증가)"""
+    send_queue = getattr(sio.eio, "queue", None)
+    return send_queue.qsize() if send_queue is not None else 0
+
+# 🔹 웹캠 스트리밍 (control 의 webcamStream 으로 시작/정지)
+webcam_streamer = WebcamStreamer(frame_broker, send_stream_frame, pending=socket_pending)
 
 import threading
 
-def send_sensor_loop():
+def start_background():
+    predict_func.clear_model()
+    sensor_poller.start()
+    motion.start()
+    sensor_poller.wait_ready()
+    if trace_recorder:
+        trace_recorder.record("status", None, get_current_status())
+
+def sensor_tick():
+    """메인 루프 1회: 센서 수집 → AI/수동 제어 → 디퓨저 → 전송"""
     global diffuser_active, diffuser_last_time, diffuser_is_on, diffuser_period, diffuser_type, diffuser_speed
     global prediction_thread
-    predict_func.clear_model()
-
-    while True:
-        global purifier_is_on
-        global purifier_mode
-        current_time = time.time()
-        now = time.localtime()
-        now_str = f"{now.tm_hour:02d}:{now.tm_min:02d}"
-        current_minutes = hhmm_to_minutes(now_str)
-
-        data = collect_sensor_data()
-        # 냄새, 종합공기질 점수 계산
-        predict_func.collect_data(data, latest_prediction)
-
-        if purifier_mode == 1:
-            # AI 모드
-            if prediction_thread is None or not prediction_thread.is_alive():
-                # 예측 중단 플래그 초기화
-                predict_func.stop_prediction = False
-                prediction_thread = threading.Thread(target=predict_func.run_prediction_pipeline, args=(latest_prediction,), daemon=True)
-                prediction_thread.start()
-            # 최신 예측값을 기반으로 팬 및 펌프 설정
-            drive_by_ai(
-                latest_prediction.get("predicted_air_quality"),
-                latest_prediction.get("current_smell")
-            )
-        elif purifier_is_on:
-            # 수동 제어 켜짐 상태일 때만 시간 자동 동작
-            if purifier_auto_on <= current_minutes < purifier_auto_off:
-                fan1.set_speed(purifier_speed)
-            else:
-                fan1.set_speed(0)
+    global purifier_is_on
+    global purifier_mode
+    current_time = clock.time()
+    now = time.localtime(current_time)
+    now_str = f"{now.tm_hour:02d}:{now.tm_min:02d}"
+    current_minutes = hhmm_to_minutes(now_str)
+    timer = loop_metrics.start_tick()
+
+    data = collect_sensor_data()
+    if trace_recorder:
+        trace_recorder.record("tick", None, {"motion": last_motion_time})
+    timer.lap("sensors")
+    # 냄새, 종합공기질 점수 계산
+    predict_func.collect_data(data, latest_prediction)
+    timer.lap("collect_data")
+
+    if purifier_mode == 1:
+        # AI 모드
+        if prediction_thread is None or not prediction_thread.is_alive():
+            # 예측 중단 플래그 초기화
+            predict_func.stop_prediction = False
+            prediction_thread = threading.Thread(target=predict_func.run_prediction_pipeline, args=(latest_prediction,), daemon=True)
+            prediction_thread.start()
+        # 최신 예측값을 기반으로 팬 및 펌프 설정
+        drive_by_ai(
+            latest_prediction.get("predicted_air_quality"),
+            latest_prediction.get("current_smell")
+        )
+    elif purifier_is_on:
+        # 수동 제어 켜짐 상태일 때만 시간 자동 동작
+        if purifier_auto_on <= current_minutes < purifier_auto_off:
+            fan1.set_speed(purifier_speed)
         else:
-            # 수동 제어 꺼짐 상태일 때는 팬 끔
             fan1.set_speed(0)
+    else:
+        # 수동 제어 꺼짐 상태일 때는 팬 끔
+        fan1.set_speed(0)
 
-        if diffuser_is_on:
-            if not diffuser_active and (current_time - diffuser_last_time >= diffuser_period):
-                diffuser_active = True
-                diffuser_last_time = current_time
-                fan2.set_speed(diffuser_speed)
-                if diffuser_type == 1:
-                    ultrasonic1.turn_on()
-                else:
-                    ultrasonic2.turn_on()
-            elif diffuser_active and (current_time - diffuser_last_time >= 5): # 디퓨저는 5초동안 발화
-                diffuser_active = False
-                fan2.set_speed(0)
-                ultrasonic1.turn_off()
-                ultrasonic2.turn_off()
-
-        sio.emit("sensor_data", data)
-        time.sleep(2)
+    if diffuser_is_on:
+        if not diffuser_active and (current_time - diffuser_last_time >= diffuser_period):
+            diffuser_active = True
+            diffuser_last_time = current_time
+            fan2.set_speed(diffuser_speed)
+            if diffuser_type == 1:
+                ultrasonic1.turn_on()
+            else:
+                ultrasonic2.turn_on()
+        elif diffuser_active and (current_time - diffuser_last_time >= 5): # 디퓨저는 5초동안 발화
+            diffuser_active = False
+            fan2.set_speed(0)
+            ultrasonic1.turn_off()
+            ultrasonic2.turn_off()
+    timer.lap("control")
+
+    send_sensor_data(data)
+    timer.lap("emit")
+    timer.finish()
+    return data
+
+def send_sensor_loop():
+    start_background()
+    if METRICS_PORT:
+        start_metrics_server(loop_metrics, METRICS_PORT, labels={"device_key": DEVICE_KEY})
+        print(f"📈 메트릭: http://0.0.0.0:{METRICS_PORT}/metrics")
+    # 🔹 고정 주기: 틱 시각을 단조 시계 격자에 고정 (작업 시간만큼 대기를 줄여 표본 간격 2초 유지)
+    ticker = FixedRateTicker(LOOP_INTERVAL, clock=clock, overrun=LOOP_OVERRUN)
+    while True:
+        sensor_tick()
+        if METRICS_INTERVAL and loop_metrics.due(METRICS_INTERVAL):
+            send_device_metrics()
+        sleep_start = clock.monotonic()
+        missed = ticker.wait()
+        loop_metrics.record("sleep", clock.monotonic() - sleep_start)
+        # 예정 시각보다 늦게 시작한 시간, 주기를 넘겨 합쳐지거나 건너뛴 틱은 기한 초과로 집계
+        loop_metrics.record("lateness", ticker.lateness)
+        if missed:
+            loop_metrics.miss("tick", missed)
 
 if __name__ == "__main__":
     try:
-        sio.connect("http://ec2-13-125-170-246.ap-northeast-2.compute.amazonaws.com:3001")
+        sio.connect(SOCKET_SERVER_URL)
         # 연결 후 루프 시작
         if sio.connected:
             send_sensor_loop()
@@ -308,3 +430,5 @@ if __name__ == "__main__":
         print("❌ 서버에 연결할 수 없습니다.")
     except KeyboardInterrupt:
         print("🛑 종료")
+        if trace_recorder:
+            trace_recorder.close()
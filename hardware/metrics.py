@@ -0,0 +1,209 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 버킷 상한(초): 10µs 부터 √2 배씩, 약 84초까지
+DEFAULT_BOUNDS = tuple(1e-5 * 2 ** (i / 2) for i in range(47))
+
+
+class LatencyHistogram:
+    def __init__(self, bounds=DEFAULT_BOUNDS):
+        """고정 버킷 지연 시간 히스토그램
+        - 값을 저장하지 않아 오래 실행해도 메모리 일정
+        - 백분위수는 버킷 안에서 선형 보간한 근사값 (버킷 폭 √2 배 이내 오차)
+        """
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # 마지막은 최대 상한 초과
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+            self.max = max(self.max, seconds)
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - start)
+
+    def percentile(self, q):
+        """q(0~100) 백분위수 (초)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q / 100 * self.count
+            seen = 0
+            for idx, count in enumerate(self.counts):
+                if count and seen + count >= rank:
+                    lower = self.bounds[idx - 1] if idx > 0 else 0.0
+                    upper = self.bounds[idx] if idx < len(self.bounds) else self.max
+                    value = lower + (upper - lower) * max(0.0, rank - seen) / count
+                    return min(value, self.max)
+                seen += count
+            return self.max
+
+    def summary(self):
+        """count, 평균/p50/p95/p99/최대 (ms)"""
+        count = self.count
+        return {
+            "count": count,
+            "mean_ms": self.sum / count * 1000 if count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+def timed(fn, histogram):
+    """fn 을 호출할 때마다 걸린 시간을 histogram 에 기록하는 래퍼"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            histogram.record(time.perf_counter() - start)
+    return wrapper
+
+
+def format_summary(name, histogram):
+    s = histogram.summary()
+    return (f"{name:>20}: n={s['count']:6d}  mean={s['mean_ms']:8.3f} ms  p50={s['p50_ms']:8.3f} ms  "
+            f"p95={s['p95_ms']:8.3f} ms  p99={s['p99_ms']:8.3f} ms  max={s['max_ms']:8.3f} ms")
+
+
+class TickTimer:
+    """메인 루프 1회의 구간 측정 (lap 호출 사이 시간을 단계별로 기록)"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.metrics.record(stage, now - self.last)
+        self.last = now
+
+    def finish(self, stage="tick"):
+        self.metrics.record(stage, time.perf_counter() - self.start)
+
+
+def _label_value(value):
+    """Prometheus 라벨 값 이스케이프 (\\, ", 줄바꿈)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LoopMetrics:
+    def __init__(self, budgets=None):
+        """단계별 지연 히스토그램 + 기한 초과 횟수
+        - budgets: 단계 → 허용 시간(초), 넘으면 missed 증가 (없는 단계는 기록만)
+        - 기록은 perf_counter 2회 + 버킷 증가뿐이라 2초 루프 기준 부하는 무시할 수준
+        """
+        self.budgets = dict(budgets or {})
+        self.histograms = {}
+        self.missed = {}
+        self.started = time.time()
+        self._last_report = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+                self.missed.setdefault(stage, 0)
+        return histogram
+
+    def record(self, stage, seconds, deadline=None):
+        self._histogram(stage).record(seconds)
+        deadline = self.budgets.get(stage) if deadline is None else deadline
+        if deadline is not None and seconds > deadline:
+            self.missed[stage] += 1
+
+    def miss(self, stage, count=1):
+        """측정값 없이 기한 초과만 집계 (건너뛴 틱 등)"""
+        self._histogram(stage)
+        self.missed[stage] += count
+
+    def start_tick(self):
+        return TickTimer(self)
+
+    def due(self, interval):
+        """interval 초가 지났으면 True (주기 보고용)"""
+        now = time.monotonic()
+        if now - self._last_report < interval:
+            return False
+        self._last_report = now
+        return True
+
+    def snapshot(self):
+        """단계별 count/mean/p50/p95/p99/max(ms) + missed"""
+        stages = {}
+        for stage, histogram in list(self.histograms.items()):
+            stages[stage] = dict(histogram.summary(), missed=self.missed[stage], budget_ms=(
+                self.budgets[stage] * 1000 if stage in self.budgets else None))
+        return {"uptime_s": round(time.time() - self.started, 1), "stages": stages}
+
+    def prometheus_text(self, prefix="device_loop", labels=None):
+        """Prometheus 텍스트 형식 (히스토그램 + 기한 초과 카운터)"""
+        base = "".join(f'{key}="{_label_value(value)}",' for key, value in (labels or {}).items())
+        lines = [
+            f"# HELP {prefix}_stage_seconds Main loop stage duration",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, histogram in list(self.histograms.items()):
+            stage = _label_value(stage)
+            with histogram._lock:
+                counts = list(histogram.counts)
+                total, count = histogram.sum, histogram.count
+            cumulative = 0
+            for bound, bucket in zip(histogram.bounds, counts):
+                cumulative += bucket
+                lines.append(f'{prefix}_stage_seconds_bucket{{{base}stage="{stage}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{{base}stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{{base}stage="{stage}"}} {total:.9g}')
+            lines.append(f'{prefix}_stage_seconds_count{{{base}stage="{stage}"}} {count}')
+        lines.append(f"# HELP {prefix}_missed_deadlines_total Stage runs longer than their budget")
+        lines.append(f"# TYPE {prefix}_missed_deadlines_total counter")
+        for stage, missed in list(self.missed.items()):
+            lines.append(f'{prefix}_missed_deadlines_total{{{base}stage="{_label_value(stage)}"}} {missed}')
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(metrics, port, labels=None, host="0.0.0.0"):
+    """GET /metrics (Prometheus 텍스트), GET /metrics.json 을 제공하는 백그라운드 HTTP 서버"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = metrics.prometheus_text(labels=labels).encode()
+                content_type = "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body = json.dumps(metrics.snapshot()).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,126 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+OUTBOX_FILE = os.getenv("OUTBOX_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "outbox.db"))
+OUTBOX_MAX_ROWS = int(os.getenv("OUTBOX_MAX_ROWS", "43200"))  # 2초 간격 24시간
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "60"))
+OUTBOX_BATCH_INTERVAL = float(os.getenv("OUTBOX_BATCH_INTERVAL", "1.0"))  # 초, 배치 사이 최소 간격
+
+
+class TelemetryOutbox:
+    def __init__(self, path=OUTBOX_FILE, max_rows=OUTBOX_MAX_ROWS, batch_size=OUTBOX_BATCH_SIZE,
+                 batch_interval=OUTBOX_BATCH_INTERVAL, overflow="downsample"):
+        """연결이 끊긴 동안의 센서 데이터를 디스크(sqlite)에 보관했다가 재연결 후 재전송
+        - 각 행은 원래 측정 시각(timestamp)과 함께 저장
+        - max_rows 를 넘으면 overflow 정책 적용
+          downsample: 오래된 절반에서 한 행 건너 하나씩 삭제 (오래된 구간일수록 성기게 남음)
+          drop: 가장 오래된 행부터 삭제
+        - 재전송은 batch_size 행씩, 배치 사이 batch_interval 초 이상 간격 (회선 포화 방지)
+        - 전송 확인(ack)을 받은 배치만 삭제, 실패하면 다음 재연결 때 다시 시도
+        """
+        self.path = path
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.overflow = overflow
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL, payload TEXT NOT NULL)")
+        self._db.commit()
+        self._count = self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+        self._replay_thread = None
+        self.dropped = 0
+
+    def __len__(self):
+        return self._count
+
+    def put(self, data, timestamp=None):
+        """전송하지 못한 레코드 저장"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._db.execute("INSERT INTO outbox (timestamp, payload) VALUES (?, ?)", (timestamp, json.dumps(data, ensure_ascii=False)))
+            self._count += 1
+            if self._count > self.max_rows:
+                self._shrink_locked()
+            self._db.commit()
+
+    def _shrink_locked(self):
+        if self.overflow == "downsample":
+            # 🔹 오래된 절반의 짝수 번째 행 삭제 (id 는 연속이 아닐 수 있어 순번 기준)
+            half = self._count // 2
+            cursor = self._db.execute(
+                "DELETE FROM outbox WHERE id IN ("
+                "SELECT id FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY id) AS n FROM outbox ORDER BY id LIMIT ?) WHERE n % 2 = 0)",
+                (half,),
+            )
+        else:
+            cursor = self._db.execute(
+                "DELETE FROM outbox WHERE id IN (SELECT id FROM outbox ORDER BY id LIMIT ?)",
+                (self._count - self.max_rows,),
+            )
+        self._count -= cursor.rowcount
+        self.dropped += cursor.rowcount
+
+    def peek_batch(self):
+        """가장 오래된 batch_size 행 [(id, timestamp, payload dict), ...]"""
+        with self._lock:
+            rows = self._db.execute("SELECT id, timestamp, payload FROM outbox ORDER BY id LIMIT ?", (self.batch_size,)).fetchall()
+        return [(row_id, timestamp, json.loads(payload)) for row_id, timestamp, payload in rows]
+
+    def ack(self, last_id):
+        """last_id 까지 전송 완료 처리"""
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM outbox WHERE id <= ?", (last_id,))
+            self._count -= cursor.rowcount
+            self._db.commit()
+
+    def replay(self, send, connected):
+        """보관된 레코드를 배치로 재전송 (끝나거나 연결이 끊기거나 전송 실패하면 종료)
+        - send(records) 는 서버 ack 를 받으면 True
+        - records 의 각 항목에는 원래 측정 시각 timestamp 포함
+        """
+        sent = 0
+        while connected():
+            batch = self.peek_batch()
+            if not batch:
+                break
+            started = time.monotonic()
+            records = [dict(payload, timestamp=timestamp) for _, timestamp, payload in batch]
+            try:
+                ok = send(records)
+            except Exception as e:
+                print("❌ 보관 데이터 전송 실패:", e)
+                ok = False
+            if not ok:
+                break
+            self.ack(batch[-1][0])
+            sent += len(records)
+            # 🔹 배치 사이 최소 간격 유지
+            time.sleep(max(0, self.batch_interval - (time.monotonic() - started)))
+        if sent:
+            print(f"📦 보관 데이터 {sent}건 재전송 (남은 {self._count}건)")
+        return sent
+
+    def start_replay(self, send, connected):
+        """백그라운드 재전송 시작 (이미 진행 중이면 무시)"""
+        if self._replay_thread is not None and self._replay_thread.is_alive():
+            return
+        if not self._count:
+            return
+        self._replay_thread = threading.Thread(target=self.replay, args=(send, connected), name="outbox-replay", daemon=True)
+        self._replay_thread.start()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,162 @@
+"""outbox 보관/재전송 테스트 (하드웨어 불필요, python -m pytest hardware/outbox_test.py)"""
+import json
+import socketserver
+import threading
+import time
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import pytest
+
+from outbox import TelemetryOutbox
+
+DEVICE_KEY = "RPI-TEST"
+
+
+def make_outbox(tmp_path, **kwargs):
+    options = dict(max_rows=200, batch_size=25, batch_interval=0.0)
+    options.update(kwargs)
+    return TelemetryOutbox(str(tmp_path / "outbox.db"), **options)
+
+
+def fill(outbox, count, start=1_700_000_000.0):
+    for i in range(count):
+        outbox.put({"device_key": DEVICE_KEY, "tick": i}, timestamp=start + i * 2)
+
+
+def stored_ticks(outbox):
+    rows = outbox._db.execute("SELECT payload FROM outbox ORDER BY id").fetchall()
+    return [json.loads(payload)["tick"] for (payload,) in rows]
+
+
+def test_downsample_overflow_thins_oldest_half(tmp_path):
+    outbox = make_outbox(tmp_path, max_rows=100)
+    fill(outbox, 101)
+
+    ticks = stored_ticks(outbox)
+    assert len(outbox) == len(ticks) <= 100
+    assert outbox.dropped == 101 - len(ticks)
+    # 오래된 절반만 한 행 건너 하나씩 삭제, 최신 구간은 그대로
+    assert ticks[-50:] == list(range(51, 101))
+    assert 1 not in ticks and 0 in ticks and 2 in ticks
+
+
+def test_drop_overflow_removes_oldest(tmp_path):
+    outbox = make_outbox(tmp_path, max_rows=50, overflow="drop")
+    fill(outbox, 80)
+
+    assert len(outbox) == 50
+    assert outbox.dropped == 30
+    assert stored_ticks(outbox) == list(range(30, 80))
+
+
+def test_replay_acks_then_deletes_in_original_order(tmp_path):
+    outbox = make_outbox(tmp_path)
+    fill(outbox, 60)
+    batches = []
+
+    def send(records):
+        # 전송 시점에는 아직 삭제되지 않음 (ack 후 삭제)
+        assert len(outbox) == 60 - sum(len(batch) for batch in batches)
+        batches.append(records)
+        return True
+
+    sent = outbox.replay(send, lambda: True)
+
+    records = [record for batch in batches for record in batch]
+    assert sent == 60
+    assert [len(batch) for batch in batches] == [25, 25, 10]
+    assert [record["tick"] for record in records] == list(range(60))
+    assert [record["timestamp"] for record in records] == sorted(record["timestamp"] for record in records)
+    assert len(outbox) == 0
+
+
+@pytest.mark.parametrize("result", [False, RuntimeError("timeout")])
+def test_unacked_batch_is_kept(tmp_path, result):
+    outbox = make_outbox(tmp_path)
+    fill(outbox, 30)
+
+    def send(records):
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert outbox.replay(send, lambda: True) == 0
+    assert len(outbox) == 30
+    assert stored_ticks(outbox) == list(range(30))
+
+
+def test_replay_stops_when_disconnected(tmp_path):
+    outbox = make_outbox(tmp_path)
+    fill(outbox, 60)
+    connected = iter([True, False])
+
+    assert outbox.replay(lambda records: True, lambda: next(connected)) == 25
+    assert len(outbox) == 35
+
+
+def test_batch_rate_limit(tmp_path):
+    outbox = make_outbox(tmp_path, batch_size=10, batch_interval=0.1)
+    fill(outbox, 40)
+    send_times = []
+
+    def send(records):
+        send_times.append(time.monotonic())
+        return True
+
+    assert outbox.replay(send, lambda: True) == 40
+    gaps = [b - a for a, b in zip(send_times, send_times[1:])]
+    assert len(gaps) == 3
+    assert min(gaps) >= 0.095
+
+
+def test_rows_survive_reopen(tmp_path):
+    outbox = make_outbox(tmp_path)
+    fill(outbox, 5)
+    outbox.close()
+
+    reopened = make_outbox(tmp_path)
+    assert len(reopened) == 5
+    assert stored_ticks(reopened) == list(range(5))
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def test_replay_through_socketio(tmp_path):
+    """server.js 의 sensor_data_batch 처리(ack)를 흉내 내는 로컬 서버로 재전송"""
+    socketio = pytest.importorskip("socketio")
+    received = []
+    sio_server = socketio.Server(async_mode="threading")
+
+    @sio_server.on("sensor_data_batch")
+    def on_sensor_data_batch(sid, data):
+        received.append(data["records"])
+        return True
+
+    httpd = make_server("127.0.0.1", 0, socketio.WSGIApp(sio_server), server_class=ThreadingWSGIServer, handler_class=QuietHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    outbox = make_outbox(tmp_path, batch_interval=0.05)
+    fill(outbox, 300)
+    expected = len(outbox)
+    sio = socketio.Client()
+    try:
+        sio.connect(f"http://127.0.0.1:{httpd.server_port}", transports=["polling"])
+
+        def send(records):
+            return bool(sio.call("sensor_data_batch", {"device_key": DEVICE_KEY, "records": records}, timeout=5))
+
+        sent = outbox.replay(send, lambda: sio.connected)
+    finally:
+        sio.disconnect()
+        httpd.shutdown()
+
+    records = [record for batch in received for record in batch]
+    assert sent == expected == len(records)
+    assert records[-1]["tick"] == 299
+    assert len(outbox) == 0
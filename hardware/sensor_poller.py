@@ -0,0 +1,161 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_SAMPLE_PERIOD = 2.0  # 초, SAMPLE_PERIOD 를 선언하지 않은 센서
+
+
+class SensorPoller:
+    def __init__(self, clock=time):
+        """센서별 주기 스케줄러
+        - 각 센서는 자기 주기(드라이버의 SAMPLE_PERIOD)마다 버스별 작업 스레드에서 읽음
+        - 버스(I2C, SPI, DHT22, 카메라)마다 스레드 1개 → 다른 버스는 동시에, 같은 버스는 순서대로 실행
+          (한 버스의 느린 센서가 다른 버스 센서의 읽기를 막지 않음)
+        - 읽은 값은 공용 최신값 테이블에 기록, 소비자는 snapshot() 으로 기다림 없이 가져감
+        - 실패(None/예외)하거나 timeout 을 넘긴 센서는 테이블에 마지막 정상값 유지
+          timeout 은 실제로 읽기를 시작한 시각부터 (같은 버스 차례를 기다린 시간은 제외)
+        - 이전 읽기가 아직 진행 중인 센서는 새로 요청하지 않음 (느린 센서 작업이 쌓이지 않도록)
+        - clock: 주기/timeout/대기에 쓰는 시계 (기본 time 모듈, 시뮬레이션은 HAL 시계)
+          가상 시계(clock.virtual)면 버스 스레드 없이 스케줄러 스레드에서 등록 순서대로 읽음 → 결과 재현 가능
+        """
+        self.clock = clock
+        self.virtual = getattr(clock, "virtual", False)
+        self.sensors = {}
+        self.bus_executors = {}
+        self.latest = {}  # 센서 이름 → 최신 정상값
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._running = False
+
+    def add(self, name, read_fn, bus=None, period=None, timeout=0.5, event=False):
+        """센서 등록
+        - bus: 같은 값을 가진 센서끼리 한 스레드에서 순차 실행 (None 이면 단독)
+        - period: 읽기 주기(초), 생략하면 드라이버의 SAMPLE_PERIOD
+        - event: 모션처럼 이벤트성 값이면 True, 다음 snapshot 까지 True 를 유지하고 가져가면 초기화
+        """
+        if period is None:
+            period = getattr(getattr(read_fn, "__self__", None), "SAMPLE_PERIOD", DEFAULT_SAMPLE_PERIOD)
+        bus = bus or name
+        if bus not in self.bus_executors:
+            self.bus_executors[bus] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"sensor-{bus}")
+        self.sensors[name] = {
+            "read": read_fn,
+            "executor": self.bus_executors[bus],
+            "period": period,
+            "timeout": timeout,
+            "event": event,
+            "future": None,
+            "started": None,  # 읽기 시작 시각 (버스 차례 대기 중이면 None)
+            "next_due": 0,
+            "late": False,
+            "last_ok_time": 0,
+            "failures": 0,
+        }
+        self.latest[name] = None
+
+    # ---------- 읽기 ----------
+
+    def _read(self, sensor):
+        sensor["started"] = self.clock.monotonic()
+        return sensor["read"]()
+
+    def _on_done(self, name, sensor, future):
+        if future.cancelled():
+            # 종료(stop) 시 버스 차례를 기다리던 읽기
+            return
+        try:
+            value = future.result()
+        except Exception as e:
+            print(f"⚠️ {name} 센서 읽기 오류: {e}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                sensor["failures"] += 1
+            elif sensor["event"]:
+                # 🔹 이벤트는 가져가기 전까지 True 유지 (False 로 덮어쓰지 않음)
+                self.latest[name] = self.latest[name] or value
+                sensor["last_ok_time"] = self.clock.time()
+            else:
+                self.latest[name] = value
+                sensor["last_ok_time"] = self.clock.time()
+
+    def _submit(self, name, sensor):
+        sensor["started"] = None
+        sensor["late"] = False
+        if self.virtual:
+            future = Future()
+            try:
+                future.set_result(self._read(sensor))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = sensor["executor"].submit(self._read, sensor)
+        sensor["future"] = future
+        future.add_done_callback(lambda f: self._on_done(name, sensor, f))
+
+    def _run(self):
+        while self._running:
+            now = self.clock.monotonic()
+            wait = 1.0
+            for name, sensor in self.sensors.items():
+                future = sensor["future"]
+                if future is not None and not future.done():
+                    # 🔹 진행 중인 읽기가 timeout 을 넘기면 한 번만 경고하고 마지막 값 유지
+                    started = sensor["started"]
+                    if not sensor["late"] and started is not None and now - started > sensor["timeout"]:
+                        print(f"⚠️ {name} 센서 응답 지연, 이전 값 사용")
+                        sensor["late"] = True
+                        with self._lock:
+                            sensor["failures"] += 1
+                    wait = min(wait, 0.05)
+                    continue
+
+                if now >= sensor["next_due"]:
+                    self._submit(name, sensor)
+                    # 🔹 밀린 주기는 따라잡지 않고 다음 주기부터 다시 맞춤
+                    sensor["next_due"] = max(sensor["next_due"] + sensor["period"], now)
+                wait = min(wait, sensor["next_due"] - now)
+
+            if self.virtual:
+                self.clock.wait(self._wakeup, max(0.0, wait))
+            else:
+                self._wakeup.wait(max(0.0, wait))
+            self._wakeup.clear()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="sensor-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        for executor in self.bus_executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- 최신값 테이블 ----------
+
+    def snapshot(self):
+        """최신값 테이블 복사본 {이름: 값}, 이벤트성 센서는 가져가면서 초기화"""
+        with self._lock:
+            readings = dict(self.latest)
+            for name, sensor in self.sensors.items():
+                if sensor["event"]:
+                    self.latest[name] = None
+        return readings
+
+    def wait_ready(self, timeout=5.0):
+        """이벤트성이 아닌 모든 센서가 한 번 이상 읽힐 때까지 대기 (시작 직후 빈 값 전송 방지)"""
+        deadline = self.clock.monotonic() + timeout
+        while self.clock.monotonic() < deadline:
+            with self._lock:
+                if all(self.latest[name] is not None for name, sensor in self.sensors.items() if not sensor["event"]):
+                    return True
+            self.clock.sleep(0.05)
+        return False
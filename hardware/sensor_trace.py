@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TRACE_FILE = os.getenv("TRACE_FILE", "")  # 설정하면 센서/제어 기록 (예: trace.jsonl.gz)
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "10"))  # 초, 전원이 끊겨도 이 간격까지는 읽을 수 있음
+TRACE_VERSION = 1
+
+
+class TraceRecorder:
+    def __init__(self, path, clock=time, flush_interval=TRACE_FLUSH_INTERVAL):
+        """센서 드라이버 출력과 제어 이벤트를 gzip JSON Lines 로 기록
+        - 한 줄 = {"t": 시각, "k": 종류, "n": 이름, "d": 데이터}
+          meta: 기록 시작 정보, status: 시작 시 제어 상태, sensor: 드라이버 get_data() 결과,
+          control: 서버 control 이벤트, tick: 메인 루프 1회 (모션 감지 시각 포함)
+        - 여러 스레드(센서 폴러, 소켓, 메인 루프)에서 호출 가능
+        - flush_interval 마다 압축 스트림을 flush (중간에 끊긴 파일도 그 지점까지 재생 가능)
+        """
+        self.path = path
+        self.clock = clock
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._last_flush = time.monotonic()
+        self.record("meta", "trace", {"version": TRACE_VERSION, "started": time.time()})
+
+    def record(self, kind, name=None, data=None):
+        line = json.dumps({"t": self.clock.time(), "k": kind, "n": name, "d": data}, ensure_ascii=False, separators=(",", ":"), default=float)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self.count += 1
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def wrap(self, name, driver):
+        """driver.get_data() 결과를 기록하는 드라이버 (SAMPLE_PERIOD 등 나머지 속성은 그대로)"""
+        return TracedDriver(self, name, driver)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class TracedDriver:
+    def __init__(self, recorder, name, driver):
+        self.recorder = recorder
+        self.name = name
+        self.driver = driver
+
+    def __getattr__(self, attr):
+        return getattr(self.driver, attr)
+
+    def get_data(self):
+        data = self.driver.get_data()
+        self.recorder.record("sensor", self.name, data)
+        return data
+
+
+def read_trace(path):
+    """기록 파일의 레코드를 순서대로 반환 (끝이 잘린 파일은 읽을 수 있는 곳까지)"""
+    records = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                records.append(json.loads(line))
+    except (EOFError, gzip.BadGzipFile) as e:
+        print(f"⚠️ 기록 파일 끝이 잘림 ({len(records)}건까지 사용): {e}")
+    return records
@@ -3,6 +3,8 @@ import adafruit_dht
 import board
 
 class DHT22Sensor:
+    SAMPLE_PERIOD = 2.5  # 초, DHT22 는 2초보다 자주 읽으면 체크섬 오류가 잦음
+
     def __init__(self, pin=board.D18):
         self.sensor = adafruit_dht.DHT22(pin)
 
@@ -0,0 +1,43 @@
+import numpy as np
+
+# GP2Y1010AU0F 변환 상수 (ADC 10비트, 5V 기준)
+ADC_MAX = 1024.0
+ADC_VREF = 5.0
+DUST_SLOPE = 0.172  # mg/m³ per V
+DUST_OFFSET = 0.01
+PM25_PER_ADC = ADC_VREF / ADC_MAX * DUST_SLOPE * 1000  # ADC 1단계당 µg/m³
+
+
+def adc_to_pm25(adc_value):
+    """ADC 값 → PM2.5 (µg/m³), 음수는 0"""
+    voltage = adc_value * (ADC_VREF / ADC_MAX)
+    return np.maximum(0, (DUST_SLOPE * voltage - DUST_OFFSET) * 1000)
+
+
+def reject_outliers(samples, k=3.5, mad_floor=1.0):
+    """중앙값/MAD 기준 이상치 제거 (LED 펄스가 어긋난 샘플, 스파이크 등)
+    - |x - median| / (1.4826 * MAD) > k 인 샘플을 버림
+    - MAD 는 최소 mad_floor (ADC 1단계): 대부분 같은 값이어도 ±1~2 LSB 양자화 잡음은 남기고 스파이크만 버림
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    median = np.median(samples)
+    deviation = np.abs(samples - median)
+    mad = max(float(np.median(deviation)), mad_floor)
+    return samples[deviation / (1.4826 * mad) <= k]
+
+
+def decimate(samples, k=3.5, mad_floor=1.0):
+    """버스트 샘플 → (평균, 표준오차, 사용한 샘플 수)"""
+    kept = reject_outliers(samples, k, mad_floor)
+    n = len(kept)
+    mean = float(kept.mean())
+    stderr = float(kept.std(ddof=1) / np.sqrt(n)) if n > 1 else 0.0
+    return mean, stderr, n
+
+
+def timing_jitter(timestamps, period):
+    """샘플 시각(초) → (주기 오차 표준편차 ms, 최대 절대 오차 ms)"""
+    if len(timestamps) < 2:
+        return 0.0, 0.0
+    error = (np.diff(timestamps) - period) * 1000
+    return float(error.std()), float(np.abs(error).max())
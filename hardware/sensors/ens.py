@@ -40,6 +40,8 @@ import adafruit_ahtx0
 from time import sleep
 
 class ENSSensor:
+    SAMPLE_PERIOD = 1.0  # 초, ENS160 내부 측정 주기 1초
+
     def __init__(self):
         try:
             # 🔹 I2C 버스 초기화
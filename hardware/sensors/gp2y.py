@@ -64,9 +64,22 @@
 import RPi.GPIO as GPIO
 import spidev
 import time
+from collections import deque
+
+import numpy as np
+
+from sensors.dust_filter import PM25_PER_ADC, adc_to_pm25, decimate, timing_jitter
 
 class GP2YSensor:
-    def __init__(self, spi_channel=0, adc_channel=0, led_pin=26, num_samples=5):
+    SAMPLE_PERIOD = 1.0  # 초, 버스트 1회(기본 32펄스 ≈ 0.32초) 후 이동 평균
+    PULSE_PERIOD = 0.01  # 데이터시트 LED 펄스 주기 10ms
+
+    def __init__(self, spi_channel=0, adc_channel=0, led_pin=26, num_samples=5, burst_size=32):
+        """GP2Y1010AU0F 미세먼지 센서
+        - burst_size > 1 이면 10ms 주기로 burst_size 번 펄스 측정 후 이상치 제거 + 평균 (오버샘플링)
+        - burst_size = 1 이면 기존처럼 펄스 1회 측정
+        - 측정값은 num_samples 개 고정 크기 deque 로 이동 평균
+        """
         # 🔹 SPI 설정
         self.spi = spidev.SpiDev()
         self.spi.open(0, spi_channel)
@@ -81,52 +94,83 @@ class GP2YSensor:
         self.adc_channel = adc_channel
 
         # 🔹 이동 평균 필터 설정
-        self.dust_values = []
+        self.dust_values = deque(maxlen=num_samples)
         self.num_samples = num_samples
 
+        # 🔹 버스트 버퍼 (매번 새로 만들지 않도록 미리 할당)
+        self.burst_size = burst_size
+        self.burst_adc = np.empty(burst_size, dtype=np.float64)
+        self.burst_time = np.empty(burst_size, dtype=np.float64)
+
     def read_adc(self):
         """SPI를 사용하여 ADC 값 읽기"""
         buff = self.spi.xfer2([1, (8 + self.adc_channel) << 4, 0])
         adc_value = ((buff[1] & 3) << 8) + buff[2]
         return adc_value
 
+    def pulse_read(self):
+        """LED 펄스 1회 측정 (LED ON 0.28ms 후 샘플링)"""
+        GPIO.output(self.led_pin, GPIO.LOW)
+        time.sleep(0.00028)
+        adc_value = self.read_adc()
+        time.sleep(0.00004)
+        GPIO.output(self.led_pin, GPIO.HIGH)
+        return adc_value
+
+    def read_burst(self):
+        """PULSE_PERIOD 주기로 burst_size 번 측정, (ADC 배열, 측정 시각 배열) 반환
+        - 시작 시각 기준 절대 목표 시각에 맞춰 대기하므로 오차가 누적되지 않음
+        - 목표 1ms 전까지는 sleep, 이후는 perf_counter 로 대기
+        """
+        start = time.perf_counter()
+        for i in range(self.burst_size):
+            target = start + i * self.PULSE_PERIOD
+            remaining = target - time.perf_counter()
+            if remaining > 0.001:
+                time.sleep(remaining - 0.001)
+            while time.perf_counter() < target:
+                pass
+            self.burst_time[i] = time.perf_counter()
+            self.burst_adc[i] = self.pulse_read()
+        return self.burst_adc, self.burst_time
+
     def get_data(self):
         """미세먼지 농도 측정 및 다양한 데이터 반환"""
         try:
-            # 🔹 LED ON (샘플링)
-            GPIO.output(self.led_pin, GPIO.LOW)
-            time.sleep(0.00028)
-
-            # 🔹 ADC 데이터 읽기
-            adc_value = self.read_adc()
-
-            # 🔹 LED OFF (대기)
-            time.sleep(0.00004)
-            GPIO.output(self.led_pin, GPIO.HIGH)
-            time.sleep(0.00968)
+            if self.burst_size > 1:
+                # 🔹 오버샘플링: 이상치 제거 후 평균 (10비트 양자화 잡음 감소)
+                samples, timestamps = self.read_burst()
+                adc_value, adc_stderr, used = decimate(samples)
+                jitter_std, jitter_max = timing_jitter(timestamps, self.PULSE_PERIOD)
+            else:
+                adc_value = self.pulse_read()
+                time.sleep(0.00968)  # LED OFF
+                adc_stderr, used, jitter_std, jitter_max = 0.0, 1, 0.0, 0.0
 
             # 🔹 전압 변환 (ADC 값 → 전압)
             voltage = adc_value * (5.0 / 1024.0)
 
-            # 🔹 PM2.5 미세먼지 농도 변환 (µg/m³)
-            pm25 = max(0, (0.172 * voltage - 0.01) * 1000)
+            # 🔹 PM2.5 미세먼지 농도 변환 (µg/m³), 표준오차도 같은 기울기로 변환
+            pm25 = float(adc_to_pm25(adc_value))
+            pm25_stderr = adc_stderr * PM25_PER_ADC if pm25 > 0 else 0.0
 
             # 🔹 PM10 농도 예측 (단순 비례 모델 적용, 정확한 모델 필요)
             pm10 = pm25 * 1.5  # 일반적인 PM2.5/PM10 비율 적용
 
             # 🔹 이동 평균 필터 적용
             self.dust_values.append(pm25)
-            if len(self.dust_values) > self.num_samples:
-                self.dust_values.pop(0)
-
             filtered_pm25 = sum(self.dust_values) / len(self.dust_values)
 
             return {
-                "adc_raw": adc_value,  # ADC 원본 데이터
+                "adc_raw": int(round(adc_value)),  # ADC 데이터 (버스트 모드는 평균)
                 "voltage": round(voltage, 3),  # 변환된 전압 (V)
                 "pm25_raw": round(pm25, 2),  # 원본 PM2.5 데이터
                 "pm25_filtered": round(filtered_pm25, 2),  # 이동 평균 필터 적용 PM2.5 데이터
                 "pm10_estimate": round(pm10, 2),  # PM10 추정값
+                "pm25_stderr": round(pm25_stderr, 2),  # PM2.5 표준오차 (버스트 모드)
+                "samples_used": used,  # 이상치 제거 후 사용한 샘플 수
+                "jitter_ms": round(jitter_std, 3),  # 펄스 주기 오차 표준편차
+                "jitter_max_ms": round(jitter_max, 3),  # 펄스 주기 최대 오차
             }
 
         except Exception as e:
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import board
+import busio
+import digitalio
+import adafruit_mcp3xxx.mcp3008 as MCP
+
+
+class MCP3008ADC:
+    def __init__(self, cs_pin=board.D5, ref_voltage=3.3, max_age=0.2):
+        """MQ 센서들이 함께 쓰는 MCP3008 관리자
+        - SPI 버스와 MCP3008 인스턴스를 하나만 생성 (같은 CS 핀을 여러 객체가 잡지 않도록)
+        - 등록된 채널 전체를 락 하나 안에서 연속으로 읽음 (채널마다 CS 토글 필요, 변환 1회 = 3바이트 전송)
+        - 읽은 값은 max_age 초 동안 캐시, 같은 틱의 다른 MQ 센서는 SPI 전송 없이 캐시값 사용
+        - 값은 AnalogIn.value 와 같은 16비트 스케일 (10비트 값 << 6, 0~65472)
+        """
+        self.spi = busio.SPI(board.SCK, MOSI=board.MOSI, MISO=board.MISO)
+        self.cs = digitalio.DigitalInOut(cs_pin)
+        self.mcp = MCP.MCP3008(self.spi, self.cs, ref_voltage=ref_voltage)
+        self.ref_voltage = ref_voltage
+        self.max_age = max_age
+
+        self.channels = []
+        self._values = {}
+        self._read_time = 0
+        self._lock = threading.Lock()
+
+    def add_channel(self, channel):
+        with self._lock:
+            if channel not in self.channels:
+                self.channels.append(channel)
+                self._read_time = 0  # 새 채널이 다음 읽기에 포함되도록 캐시 무효화
+
+    def _read_all_locked(self):
+        values = {}
+        for channel in self.channels:
+            raw = self.mcp.read(channel)  # 10비트 (0~1023)
+            values[channel] = raw << 6  # AnalogIn.value 와 동일 (하위 6비트는 0)
+        self._values = values
+        self._read_time = time.monotonic()
+
+    def read_all(self):
+        """등록된 모든 채널 {채널: 16비트 값}, 캐시가 오래되었으면 한 번에 다시 읽음"""
+        with self._lock:
+            if time.monotonic() - self._read_time > self.max_age:
+                self._read_all_locked()
+            return dict(self._values)
+
+    def value(self, channel):
+        values = self.read_all()
+        if channel not in values:
+            self.add_channel(channel)
+            values = self.read_all()
+        return values[channel]
+
+    def voltage(self, channel):
+        return self.value(channel) * self.ref_voltage / 65535
+
+
+_shared_adc = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_adc():
+    """프로세스 전체에서 하나만 쓰는 MCP3008 관리자"""
+    global _shared_adc
+    with _shared_lock:
+        if _shared_adc is None:
+            _shared_adc = MCP3008ADC()
+        return _shared_adc
@@ -1,25 +1,23 @@
-import board
-import busio
-import digitalio
 import adafruit_mcp3xxx.mcp3008 as MCP
-from adafruit_mcp3xxx.analog_in import AnalogIn
 from dotenv import load_dotenv
 import os
 
+from sensors.mcp3008_adc import get_shared_adc
+
 load_dotenv()
 
 class MQ7Sensor:
+    SAMPLE_PERIOD = 1.0  # 초, 히터 응답이 느려 더 자주 읽어도 값이 거의 같음
     RL = 10  # 부하 저항 (10KΩ)
     VCC = 3.3  # 수정! 센서 공급 전압 (MCP3008 기준 3.3V)
     R0 = float(os.getenv('MQ7_R0'))
+    CHANNEL = MCP.P2  # MCP3008 채널
 
-    def __init__(self):
+    def __init__(self, adc=None):
         try:
-            self.spi = busio.SPI(board.SCK, MOSI=board.MOSI, MISO=board.MISO)
-            self.cs = digitalio.DigitalInOut(board.D5)
-            self.mcp = MCP.MCP3008(self.spi, self.cs)
-
-            self.mq7 = AnalogIn(self.mcp, MCP.P2)
+            # 🔹 MCP3008 은 MQ 센서들이 공유 (adc 를 주지 않으면 프로세스 공용 인스턴스)
+            self.adc = adc or get_shared_adc()
+            self.adc.add_channel(self.CHANNEL)
 
             print("✅ MQ7 센서 초기화 완료!")
         except Exception as e:
@@ -27,8 +25,9 @@ class MQ7Sensor:
 
     def get_data(self):
         try:
-            raw_value = self.mq7.value
-            voltage = self.mq7.voltage
+            # 🔹 한 번 읽은 값으로 raw/전압 모두 계산 (value, voltage 를 따로 읽으면 SPI 전송 2회)
+            raw_value = self.adc.value(self.CHANNEL)
+            voltage = raw_value * self.adc.ref_voltage / 65535
 
             # Rs 계산 (0V 예외처리 추가)
             if voltage == 0:
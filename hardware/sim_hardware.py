@@ -0,0 +1,275 @@
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+import pandas as pd
+
+SIM_START_TIME = 1_700_000_000.0  # 가상 시계 시작 epoch 초 (고정값이라 실행마다 같은 시각)
+TRACE_COLUMNS = ["temperature", "humidity", "tvoc", "eco2", "pm2.5", "mq4", "mq7", "mq135", "air_quality"]
+
+
+class SimClock:
+    virtual = True
+
+    def __init__(self, speed=1.0, start_time=SIM_START_TIME):
+        """시뮬레이션 가상 시계 (이산 사건 방식)
+        - 참여 스레드: 시계를 만든 스레드(메인 루프) + sleep()/wait() 을 한 번이라도 호출한 스레드 (센서 스케줄러, 모션 캡처)
+        - 참여 스레드는 한 번에 하나만 실행 (시계를 만든 스레드가 처음 실행권을 가짐)
+          실행 중인 스레드가 sleep()/wait() 하면 (기상 시각, 참여 순서)가 가장 이른 스레드에 실행권을 넘기고
+          그 스레드의 기상 시각이 미래면 가상 시각을 그만큼 이동
+          → 스레드 실행 속도와 무관하게 항상 같은 순서로 실행되어 같은 시각/센서값 (결정적)
+        - 실행 중인 참여 스레드가 시계 밖에서 블록되면(소켓 등) 그동안 가상 시각도 멈춤
+        - speed: 가상 시각이 흐를 때의 실제 대기 비율 (speed=10 이면 2초가 실제로는 0.2초, inf 면 대기 없음)
+        - time() 은 start_time 부터 시작하는 가상 epoch 초
+        """
+        self.speed = speed
+        self._start = start_time
+        self._elapsed = 0.0
+        self._cond = threading.Condition()
+        self._turn = threading.current_thread()  # 실행권을 가진 참여 스레드
+        self._order = {self._turn: 0}  # 참여 스레드 → 참여 순서
+        self._sleepers = {}  # 스레드 → (기상 가상 시각, 대기 중 event)
+
+    def elapsed(self):
+        return self._elapsed
+
+    def time(self):
+        return self._start + self._elapsed
+
+    def monotonic(self):
+        return self._elapsed
+
+    def _schedule_locked(self):
+        """실행권이 비었으면 다음 스레드에 넘김 (필요하면 가상 시각 이동)"""
+        if self._turn is not None and self._turn.is_alive():
+            return
+        self._turn = None
+        if not self._sleepers:
+            return
+        # event 가 설정된 스레드(정지 요청 등)가 먼저, 그다음 기상 시각/참여 순서
+        woken = [thread for thread, (_, event) in self._sleepers.items() if event is not None and event.is_set()]
+        if woken:
+            thread = min(woken, key=self._order.get)
+        else:
+            thread = min(self._sleepers, key=lambda t: (self._sleepers[t][0], self._order[t]))
+            deadline = self._sleepers[thread][0]
+            if deadline > self._elapsed:
+                # 다른 참여 스레드는 모두 대기 중이므로 잠금을 쥔 채 실제 대기해도 막히는 작업 없음
+                time.sleep((deadline - self._elapsed) / self.speed)
+                self._elapsed = deadline
+        self._turn = thread
+        self._cond.notify_all()
+
+    def wait(self, event, timeout):
+        """event 가 설정되거나 가상 시각으로 timeout 초가 지날 때까지 대기, event 설정 여부 반환"""
+        me = threading.current_thread()
+        with self._cond:
+            self._order.setdefault(me, len(self._order))
+            self._sleepers[me] = (self._elapsed + max(0.0, timeout), event)
+            if self._turn is me:
+                self._turn = None
+            try:
+                while True:
+                    self._schedule_locked()
+                    if self._turn is me:
+                        break
+                    # event.set() 이나 실행 중인 스레드 종료는 알림이 없으므로 짧게 재확인
+                    self._cond.wait(0.05)
+            finally:
+                del self._sleepers[me]
+        return event is not None and event.is_set()
+
+    def sleep(self, seconds):
+        self.wait(None, seconds)
+
+
+class SimTrace:
+    def __init__(self, csv_path, clock, interval=2.0, seed=0):
+        """air_quality_data.csv 형식 기록을 시계에 맞춰 재생
+        - interval 초마다 다음 행, 끝나면 처음부터 반복
+        - 같은 시각에는 항상 같은 값 (행 번호로 고정한 잡음만 추가) → 배속과 무관하게 재현 가능
+        """
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"시뮬레이션 센서 기록 파일이 없습니다: {csv_path} (HARDWARE_SIM_TRACE 로 지정 가능)")
+        df = pd.read_csv(csv_path).dropna()
+        self.values = df[TRACE_COLUMNS].to_numpy(dtype=np.float64)
+        self.columns = {name: idx for idx, name in enumerate(TRACE_COLUMNS)}
+        self.clock = clock
+        self.interval = interval
+        self.seed = seed
+
+    def index(self):
+        return int(self.clock.elapsed() // self.interval)
+
+    def row(self):
+        idx = self.index()
+        values = self.values[idx % len(self.values)]
+        return {name: float(values[col]) for name, col in self.columns.items()}, idx
+
+    def noise(self, idx, scale, salt=0):
+        """행 번호로 고정된 잡음"""
+        return float(np.random.default_rng((self.seed, idx, salt)).normal(0, scale))
+
+
+# ---------- 센서 ----------
+
+class SimENSSensor:
+    SAMPLE_PERIOD = 1.0
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def get_data(self):
+        row, idx = self.trace.row()
+        return {
+            "air_quality": int(row["air_quality"]),
+            "tvoc": int(row["tvoc"]),
+            "eco2": int(row["eco2"]),
+            "temp": round(row["temperature"] + self.trace.noise(idx, 0.05, 1), 2),
+            "humidity": round(row["humidity"] + self.trace.noise(idx, 0.1, 2), 2),
+        }
+
+
+class SimDHT22Sensor:
+    SAMPLE_PERIOD = 2.5
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def get_data(self):
+        row, _ = self.trace.row()
+        return {"temp": round(row["temperature"], 1), "humidity": round(row["humidity"], 1)}
+
+
+class SimGP2YSensor:
+    SAMPLE_PERIOD = 1.0
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def get_data(self):
+        row, idx = self.trace.row()
+        pm25 = max(0.0, row["pm2.5"])
+        raw = max(0.0, pm25 + self.trace.noise(idx, 1.0, 3))
+        voltage = (raw / 1000 + 0.01) / 0.172
+        return {
+            "adc_raw": int(voltage * 1024 / 5.0),
+            "voltage": round(voltage, 3),
+            "pm25_raw": round(raw, 2),
+            "pm25_filtered": round(pm25, 2),
+            "pm10_estimate": round(raw * 1.5, 2),
+            "pm25_stderr": 0.0,
+            "samples_used": 1,
+            "jitter_ms": 0.0,
+            "jitter_max_ms": 0.0,
+        }
+
+
+class SimMQSensor:
+    SAMPLE_PERIOD = 1.0
+
+    def __init__(self, trace, name, ppm_key, ppm_scale):
+        """MQ 센서 (raw 는 기록값 그대로, ppm 은 raw 비례 근사)"""
+        self.trace = trace
+        self.name = name
+        self.ppm_key = ppm_key
+        self.ppm_scale = ppm_scale
+
+    def get_data(self):
+        row, _ = self.trace.row()
+        raw = int(row[self.name])
+        return {
+            f"{self.name}_raw": raw,
+            f"{self.name}_voltage": round(raw * 3.3 / 65535, 3),
+            self.ppm_key: round(raw * self.ppm_scale, 2),
+        }
+
+
+# ---------- 카메라 ----------
+
+class SimCamera:
+    def __init__(self, clock, resolution=(640, 480), lores_size=(160, 120), period=20.0, seed=0):
+        """합성 카메라 프레임 (잡음 배경, period 초 중 앞 1/4 동안 사각형이 지나감)
+        - Picamera2 의 capture_array / capture_arrays 와 같은 형태 (main: BGRX, lores: YUV420)
+        """
+        self.clock = clock
+        self.resolution = resolution
+        self.lores_size = lores_size
+        self.period = period
+        rng = np.random.default_rng(seed)
+        width, height = resolution
+        self.background = rng.integers(60, 120, size=(height, width, 3), dtype=np.uint8)
+        self._lock = threading.Lock()
+
+    def _frame(self):
+        phase = (self.clock.elapsed() % self.period) / self.period
+        frame = self.background.copy()
+        if phase < 0.25:
+            width, height = self.resolution
+            x = int(phase * 4 * (width - 120))
+            cv2.rectangle(frame, (x, height // 3), (x + 120, height * 2 // 3), (230, 230, 230), -1)
+        return frame
+
+    def _stream(self, frame, name):
+        if name == "lores":
+            small = cv2.resize(frame, self.lores_size, interpolation=cv2.INTER_AREA)
+            return cv2.cvtColor(small, cv2.COLOR_BGR2YUV_I420)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+
+    def capture_array(self, name="main"):
+        with self._lock:
+            return self._stream(self._frame(), name)
+
+    def capture_arrays(self, names):
+        with self._lock:
+            frame = self._frame()
+            return [self._stream(frame, name) for name in names], {}
+
+
+# ---------- 액추에이터 ----------
+
+class SimFanController:
+    def __init__(self, clock, pin=19, pwm_freq=50):
+        self.clock = clock
+        self.pin = pin
+        self.speed_levels = [0, 25, 50, 75, 100]
+        self.current_speed = 0
+        self.history = []  # (시각, 레벨)
+
+    def set_speed(self, level):
+        if 0 <= level < len(self.speed_levels):
+            if level != self.current_speed:
+                self.history.append((self.clock.time(), level))
+            self.current_speed = level
+        else:
+            print("⚠️ 잘못된 입력: 0~4 사이의 값을 입력하세요.")
+
+    def cleanup(self):
+        pass
+
+
+class SimUltrasonicController:
+    def __init__(self, clock, pin=6):
+        self.clock = clock
+        self.pin = pin
+        self.is_on = False
+        self.history = []  # (시각, 켜짐 여부)
+
+    def turn_on(self):
+        if not self.is_on:
+            self.history.append((self.clock.time(), True))
+        self.is_on = True
+
+    def turn_off(self):
+        if self.is_on:
+            self.history.append((self.clock.time(), False))
+        self.is_on = False
+
+    def cleanup(self):
+        pass
+
+
+# 고정 기록 (ai/air_quality_data.csv 와 같은 형식, main.py 의 clear_model() 이 지우지 않는 위치)
+DEFAULT_TRACE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sim_trace.csv")
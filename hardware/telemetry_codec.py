@@ -0,0 +1,167 @@
+import math
+import struct
+
+TELEMETRY_CODEC_VERSION = 2
+
+# 필드 순서 고정, 새 필드는 끝에 추가하고 버전을 올림 (이전 버전 페이로드는 그대로 디코딩 가능)
+# 버전 2: GP2Y 버스트 측정 품질 (pm25_stderr ~ jitter_max_ms)
+# B/H/I: 부호 없는 정수, b: 부호 있는 정수, f: float32, ?: bool, s: UTF-8 문자열 (길이 uint16 + 바이트)
+TELEMETRY_FIELDS = [
+    ("air_quality_score", "f"),
+    ("air_quality", "H"),
+    ("tvoc", "H"),
+    ("eco2", "H"),
+    ("temp", "f"),
+    ("humidity", "f"),
+    ("adc_raw", "H"),
+    ("pm25_raw", "f"),
+    ("pm25_filtered", "f"),
+    ("pm10_estimate", "f"),
+    ("mq135_raw", "I"),
+    ("mq135_co2_ppm", "f"),
+    ("mq7_raw", "I"),
+    ("mq7_co_ppm", "f"),
+    ("mq4_raw", "I"),
+    ("mq4_methane_ppm", "f"),
+    ("motionDetectedTime", "I"),
+    ("isPurifierOn", "?"),
+    ("purifierSpeed", "B"),
+    ("purifierAutoOn", "H"),
+    ("purifierAutoOff", "H"),
+    ("purifierMode", "B"),
+    ("isDiffuserOn", "?"),
+    ("diffuserSpeed", "B"),
+    ("diffuserPeriod", "I"),
+    ("diffuserType", "B"),
+    ("diffuserMode", "B"),
+    ("predicted_air_quality", "f"),
+    ("current_smell", "b"),
+    ("aiRecommendation_code", "B"),
+    ("seq", "I"),
+    ("keyframe", "?"),
+    # 문자열은 숫자 필드 뒤에 모아 둠 (숫자 부분을 struct 한 번으로 처리)
+    ("aiRecommendation", "s"),
+    ("smell_status", "s"),
+    ("pm25_stderr", "f"),
+    ("samples_used", "H"),
+    ("jitter_ms", "f"),
+    ("jitter_max_ms", "f"),
+]
+
+HEADER = struct.Struct("<BQ")  # 버전, 필드 존재 비트마스크
+STRING_LENGTH = struct.Struct("<H")
+
+FLOAT32_MAX = 3.4028234663852886e38
+# 정수 형식별 표현 범위 (범위 밖 값은 경계값으로 고정)
+_INT_RANGES = {}
+for _fmt in "bBhHiI":
+    _bits = struct.calcsize("<" + _fmt) * 8
+    _INT_RANGES[_fmt] = (-(1 << (_bits - 1)), (1 << (_bits - 1)) - 1) if _fmt.islower() else (0, (1 << _bits) - 1)
+_numeric_fields = [(idx, name, fmt) for idx, (name, fmt) in enumerate(TELEMETRY_FIELDS) if fmt != "s"]
+_string_fields = [(idx, name) for idx, (name, fmt) in enumerate(TELEMETRY_FIELDS) if fmt == "s"]
+_struct_cache = {}
+
+
+def _numeric_struct(mask):
+    """존재하는 숫자 필드만으로 만든 struct (마스크별 캐시)"""
+    packer = _struct_cache.get(mask)
+    if packer is None:
+        fmt = "".join(fmt for idx, _, fmt in _numeric_fields if mask >> idx & 1)
+        packer = _struct_cache[mask] = struct.Struct("<" + fmt)
+    return packer
+
+
+def _coerce(name, fmt, value):
+    """숫자 필드 값을 형식에 맞게 변환
+    - 대시보드 제어값처럼 외부에서 온 값도 있으므로 숫자 문자열은 허용, 범위 밖 값은 경계값으로 고정
+    - 숫자로 바꿀 수 없으면 ValueError
+    """
+    if fmt == "?":
+        return bool(value)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: 숫자가 아닌 값 {value!r}") from None
+    if fmt == "f":
+        return number if number != number or abs(number) <= FLOAT32_MAX else math.copysign(FLOAT32_MAX, number)
+    if number != number:
+        raise ValueError(f"{name}: 정수 필드에 NaN")
+    low, high = _INT_RANGES[fmt]
+    return low if number <= low else high if number >= high else int(number)
+
+
+def encode_record(data):
+    """센서 레코드 dict → bytes
+    - 스키마에 없는 키(device_key 등)와 None 값은 제외, 존재 여부는 비트마스크로 기록
+    - 델타 페이로드처럼 일부 필드만 있어도 인코딩 가능
+    - 범위 밖 숫자는 형식의 경계값으로 고정, 숫자가 아니거나 너무 긴 문자열이면 ValueError
+    """
+    mask = 0
+    values = []
+    for idx, name, fmt in _numeric_fields:
+        value = data.get(name)
+        if value is not None:
+            mask |= 1 << idx
+            values.append(_coerce(name, fmt, value))
+    strings = []
+    for idx, name in _string_fields:
+        value = data.get(name)
+        if value is not None:
+            mask |= 1 << idx
+            encoded = str(value).encode("utf-8")
+            if len(encoded) > 0xFFFF:
+                raise ValueError(f"{name}: 문자열이 너무 김 ({len(encoded)} 바이트)")
+            strings.append(STRING_LENGTH.pack(len(encoded)) + encoded)
+    return HEADER.pack(TELEMETRY_CODEC_VERSION, mask) + _numeric_struct(mask).pack(*values) + b"".join(strings)
+
+
+def decode_record(payload):
+    """bytes → 센서 레코드 dict (인코딩된 필드만 포함, float32 라 소수점 아래 오차 있음)"""
+    version, mask = HEADER.unpack_from(payload, 0)
+    if not 1 <= version <= TELEMETRY_CODEC_VERSION:
+        raise ValueError(f"지원하지 않는 텔레메트리 버전: {version}")
+    offset = HEADER.size
+    packer = _numeric_struct(mask)
+    values = packer.unpack_from(payload, offset)
+    offset += packer.size
+
+    names = [name for idx, name, _ in _numeric_fields if mask >> idx & 1]
+    record = dict(zip(names, values))
+    for idx, name in _string_fields:
+        if mask >> idx & 1:
+            (length,) = STRING_LENGTH.unpack_from(payload, offset)
+            offset += STRING_LENGTH.size
+            record[name] = bytes(payload[offset:offset + length]).decode("utf-8")
+            offset += length
+    return record
+
+
+def wrap_binary(data):
+    """Socket.IO 전송 형태: device_key 는 서버 라우팅용으로 최상위, 나머지는 bin"""
+    return {"device_key": data.get("device_key"), "bin": encode_record(data)}
+
+
+def unwrap_binary(message):
+    record = decode_record(message["bin"])
+    record["device_key"] = message.get("device_key")
+    return record
+
+
+class BinaryTelemetryEncoder:
+    def __init__(self, inner=None):
+        """sensor_data 바이너리 인코더 (inner 가 있으면 델타 인코딩 후 바이너리로 변환)"""
+        self.inner = inner
+
+    def reset(self):
+        if self.inner is not None:
+            self.inner.reset()
+
+    def encode(self, data):
+        if self.inner is not None:
+            data = self.inner.encode(data)
+        try:
+            return wrap_binary(data)
+        except ValueError as e:
+            # 바이너리로 표현할 수 없는 값이 있으면 이 레코드만 JSON 그대로 전송 (대시보드는 두 형식 모두 처리)
+            print(f"⚠️ 바이너리 인코딩 실패, JSON 으로 전송: {e}")
+            return data
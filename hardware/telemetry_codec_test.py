@@ -0,0 +1,132 @@
+import os
+import re
+
+import pytest
+
+from telemetry_codec import (HEADER, TELEMETRY_CODEC_VERSION, TELEMETRY_FIELDS, BinaryTelemetryEncoder,
+                             decode_record, encode_record, unwrap_binary, wrap_binary)
+from telemetry_delta import TelemetryDeltaEncoder
+
+TS_CODEC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "client", "lib", "telemetryCodec.ts")
+
+
+def sample_record():
+    return {
+        "device_key": "device-1",
+        "air_quality_score": 87.5,
+        "air_quality": 2,
+        "tvoc": 120,
+        "eco2": 640,
+        "temp": 23.5,
+        "humidity": 41.25,
+        "adc_raw": 312,
+        "pm25_raw": 18.5,
+        "pm25_filtered": 17.25,
+        "pm10_estimate": 27.75,
+        "mq135_raw": 41000,
+        "mq135_co2_ppm": 410.5,
+        "mq7_raw": 12000,
+        "mq7_co_ppm": 1.5,
+        "mq4_raw": 9000,
+        "mq4_methane_ppm": 2.25,
+        "motionDetectedTime": 1700000000,
+        "isPurifierOn": True,
+        "purifierSpeed": 3,
+        "purifierAutoOn": 540,
+        "purifierAutoOff": 1080,
+        "purifierMode": 1,
+        "isDiffuserOn": False,
+        "diffuserSpeed": 2,
+        "diffuserPeriod": 600,
+        "diffuserType": 1,
+        "diffuserMode": 0,
+        "predicted_air_quality": 1.5,
+        "current_smell": -1,
+        "aiRecommendation_code": 4,
+        "aiRecommendation": "환기를 권장합니다",
+        "smell_status": "좋음",
+        "pm25_stderr": 0.5,
+        "samples_used": 31,
+        "jitter_ms": 0.25,
+        "jitter_max_ms": 1.5,
+    }
+
+
+def test_round_trip_all_fields():
+    record = sample_record()
+    decoded = unwrap_binary(wrap_binary(record))
+    assert decoded == record
+
+
+def test_partial_record_only_contains_present_fields():
+    decoded = decode_record(encode_record({"temp": 21.5, "smell_status": "보통", "device_key": "x", "unknown": 1}))
+    assert decoded == {"temp": 21.5, "smell_status": "보통"}
+
+
+def test_decodes_version_1_payload():
+    # 버전 1 은 버전 2 필드(pm25_stderr ~ jitter_max_ms)가 없을 뿐 같은 배치
+    record = {"temp": 20.0, "purifierSpeed": 2, "smell_status": "좋음"}
+    payload = bytearray(encode_record(record))
+    payload[0] = 1
+    assert decode_record(bytes(payload)) == record
+
+
+def test_rejects_unknown_version():
+    payload = bytearray(encode_record({"temp": 20.0}))
+    payload[0] = TELEMETRY_CODEC_VERSION + 1
+    with pytest.raises(ValueError):
+        decode_record(bytes(payload))
+
+
+def test_clamps_out_of_range_control_values():
+    decoded = decode_record(encode_record({
+        "purifierAutoOn": -5,
+        "purifierAutoOff": "1500",
+        "purifierSpeed": 300,
+        "diffuserPeriod": 10 ** 12,
+        "current_smell": -500,
+        "temp": 1e50,
+    }))
+    assert decoded["purifierAutoOn"] == 0
+    assert decoded["purifierAutoOff"] == 1500
+    assert decoded["purifierSpeed"] == 255
+    assert decoded["diffuserPeriod"] == 2 ** 32 - 1
+    assert decoded["current_smell"] == -128
+    assert decoded["temp"] > 3e38
+
+
+def test_non_numeric_value_raises_value_error():
+    with pytest.raises(ValueError):
+        encode_record({"diffuserSpeed": "fast"})
+
+
+def test_encoder_falls_back_to_json_for_unencodable_record():
+    encoder = BinaryTelemetryEncoder()
+    record = {"device_key": "device-1", "diffuserSpeed": "fast", "temp": 20.0}
+    assert encoder.encode(record) == record
+    assert "bin" in encoder.encode({"device_key": "device-1", "temp": 20.0})
+
+
+def test_delta_binary_round_trip():
+    encoder = BinaryTelemetryEncoder(TelemetryDeltaEncoder(keyframe_interval=3))
+    state = {}
+    for tick in range(5):
+        record = dict(sample_record(), tvoc=100 + tick)
+        state.update(unwrap_binary(encoder.encode(record)))
+        assert state["tvoc"] == 100 + tick
+    assert state["smell_status"] == "좋음"
+
+
+def test_header_layout():
+    payload = encode_record({"air_quality_score": 1.0})
+    version, mask = HEADER.unpack_from(payload, 0)
+    assert version == TELEMETRY_CODEC_VERSION
+    assert mask == 1
+
+
+def test_dashboard_decoder_uses_same_fields():
+    with open(TS_CODEC_FILE, encoding="utf-8") as f:
+        source = f.read()
+    ts_fields = re.findall(r'\["(\w+(?:\.\w+)?)", "(.)"\]', source)
+    assert ts_fields == [tuple(field) for field in TELEMETRY_FIELDS]
+    assert f"TELEMETRY_CODEC_VERSION = {TELEMETRY_CODEC_VERSION};" in source
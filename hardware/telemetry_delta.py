@@ -0,0 +1,118 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# full: 매 틱 전체 상태 (기존 방식), delta: 키프레임 + 변경 필드만
+# binary / delta-binary: 위 방식을 telemetry_codec 바이너리로 전송 ({device_key, bin})
+TELEMETRY_MODE = os.getenv("TELEMETRY_MODE", "full")
+TELEMETRY_KEYFRAME_INTERVAL = int(os.getenv("TELEMETRY_KEYFRAME_INTERVAL", "15"))  # 틱 (2초 간격 → 30초)
+
+# 소수점 자릿수 (센서 분해능보다 세밀한 변화는 보내지 않음)
+DEFAULT_PRECISION = {
+    "temp": 1,
+    "humidity": 1,
+    "pm25_raw": 1,
+    "pm25_filtered": 1,
+    "pm10_estimate": 1,
+    "pm25_stderr": 1,
+    "jitter_ms": 0,  # ms 단위 변화만 전송 (매 틱 달라지는 잡음)
+    "jitter_max_ms": 0,
+    "mq135_co2_ppm": 1,
+    "mq7_co_ppm": 2,
+    "mq4_methane_ppm": 2,
+    "predicted_air_quality": 2,
+}
+
+
+class TelemetryDeltaEncoder:
+    def __init__(self, keyframe_interval=TELEMETRY_KEYFRAME_INTERVAL, precision=None, always_keys=("device_key",)):
+        """sensor_data 델타 인코더
+        - keyframe_interval 틱마다 전체 상태(키프레임), 그 사이에는 이전 전송값과 달라진 필드만 전송
+        - precision 이 주어진 float 필드는 반올림 후 비교 (자릿수 아래 변화는 보내지 않음)
+        - always_keys(device_key 등 서버 라우팅용)는 항상 최상위에 포함
+        - 메타 필드: seq (틱 번호), keyframe (키프레임 여부)
+          대시보드는 기존처럼 받은 필드를 상태에 덮어쓰면 되고, seq 가 건너뛰면 다음 키프레임까지 일부 값이 늦을 수 있음
+        """
+        self.keyframe_interval = keyframe_interval
+        self.precision = DEFAULT_PRECISION if precision is None else precision
+        self.always_keys = always_keys
+        self.seq = 0
+        self._last = {}
+        self._force_keyframe = True
+
+    def reset(self):
+        """다음 틱을 키프레임으로 (재연결 시 호출)"""
+        self._force_keyframe = True
+
+    def quantize(self, key, value):
+        digits = self.precision.get(key)
+        if digits is not None and isinstance(value, float):
+            return round(value, digits)
+        return value
+
+    def encode(self, data):
+        state = {key: self.quantize(key, value) for key, value in data.items()}
+        keyframe = self._force_keyframe or self.seq % self.keyframe_interval == 0
+
+        if keyframe:
+            payload = dict(state)
+            self._force_keyframe = False
+        else:
+            payload = {key: state[key] for key in self.always_keys if key in state}
+            for key, value in state.items():
+                if key not in self._last or self._last[key] != value:
+                    payload[key] = value
+
+        payload["seq"] = self.seq
+        payload["keyframe"] = keyframe
+        self._last = state
+        self.seq += 1
+        return payload
+
+
+class TelemetryDeltaDecoder:
+    def __init__(self):
+        """델타 페이로드 → 전체 상태 복원 (키프레임 전까지는 None 반환)"""
+        self.state = None
+        self.seq = None
+        self.gaps = 0
+
+    def decode(self, payload):
+        payload = dict(payload)
+        seq = payload.pop("seq", None)
+        keyframe = payload.pop("keyframe", True)
+
+        if keyframe:
+            self.state = payload
+        elif self.state is None:
+            return None
+        else:
+            if self.seq is not None and seq != self.seq + 1:
+                self.gaps += 1  # 중간 패킷 유실, 다음 키프레임까지 일부 값이 오래되었을 수 있음
+            self.state.update(payload)
+        self.seq = seq
+        return dict(self.state)
+
+
+class FullTelemetryEncoder:
+    """기존 방식 (매 틱 전체 상태)"""
+
+    def reset(self):
+        pass
+
+    def encode(self, data):
+        return data
+
+
+def make_telemetry_encoder(mode=None):
+    mode = mode or TELEMETRY_MODE
+    if mode == "delta":
+        return TelemetryDeltaEncoder()
+    if mode in ("binary", "delta-binary"):
+        from telemetry_codec import BinaryTelemetryEncoder
+        return BinaryTelemetryEncoder(TelemetryDeltaEncoder() if mode == "delta-binary" else None)
+    if mode != "full":
+        print(f"⚠️ 알 수 없는 TELEMETRY_MODE: {mode}, full 사용")
+    return FullTelemetryEncoder()
@@ -0,0 +1,55 @@
+import time
+
+
+class FixedRateTicker:
+    def __init__(self, period, clock=time, overrun="coalesce"):
+        """고정 주기 스케줄러 (단조 시계 기준, 작업 시간만큼 대기를 줄여 주기 유지)
+        - 틱 시각은 시작 시각 + k × period 격자에 고정 → 작업 시간이 늘어도 주기가 밀리지 않음
+        - 작업이 주기를 넘기면(overrun) 밀린 틱을 쌓아두지 않음
+          coalesce: 밀린 틱들을 하나로 합쳐 바로 실행, 이후 격자에 다시 맞춤
+          skip: 밀린 틱은 건너뛰고 다음 격자 시각까지 대기
+        - clock: monotonic(), sleep() 을 가진 객체 (기본 time 모듈, 시뮬레이션/테스트용 시계 주입 가능)
+        """
+        if overrun not in ("coalesce", "skip"):
+            raise ValueError(f"overrun 은 coalesce 또는 skip: {overrun}")
+        self.period = period
+        self.clock = clock
+        self.overrun = overrun
+        self.next_time = None
+        self.ticks = 0
+        self.overruns = 0  # 주기를 넘긴 횟수
+        self.missed = 0  # 합쳐지거나 건너뛴 틱 수
+        self.lateness = 0.0  # 마지막 틱이 예정 시각보다 늦은 시간(초)
+
+    def reset(self):
+        """지금부터 다시 시작 (첫 틱은 한 주기 뒤)"""
+        self.next_time = self.clock.monotonic() + self.period
+
+    def wait(self):
+        """다음 틱 시각까지 대기, 이번에 합쳐지거나 건너뛴 틱 수 반환"""
+        if self.next_time is None:
+            self.reset()
+        now = self.clock.monotonic()
+        missed = 0
+        if now > self.next_time + self.period:
+            # 🔹 한 주기 이상 늦음: 밀린 틱을 한 번에 정리하고 격자에 다시 맞춤
+            late_slots = int((now - self.next_time) // self.period) + 1  # 이미 지난 격자 시각 수
+            self.overruns += 1
+            if self.overrun == "coalesce":
+                missed = late_slots - 1
+                self.missed += missed
+                self.lateness = now - self.next_time
+                self.next_time += late_slots * self.period
+                self.ticks += 1
+                return missed
+            missed = late_slots
+            self.missed += missed
+            self.next_time += late_slots * self.period
+
+        delay = self.next_time - now
+        if delay > 0:
+            self.clock.sleep(delay)
+        self.lateness = max(0.0, self.clock.monotonic() - self.next_time)
+        self.next_time += self.period
+        self.ticks += 1
+        return missed
@@ -0,0 +1,284 @@
+"""센서/제어 기록(TRACE_FILE) 재생 하네스
+
+기록된 드라이버 출력과 control 이벤트를 main.py 의 실제 루프 코드
+(collect_sensor_data → predict_func.collect_data → 예측 → drive_by_ai → 디퓨저 → 전송 인코딩)에
+CPU 가 허용하는 최대 속도로 흘려 넣고 다음을 출력
+- 처리량 (틱/초, 레코드/초)
+- 단계별 지연 히스토그램 (p50/p95/p99)
+- 팬/디퓨저 명령 순서 (--commands-out 으로 저장, --expect 로 이전 결과와 비교)
+
+사용 예)
+  TRACE_FILE=trace.jsonl.gz python main.py              # 장치에서 기록
+  python trace_replay.py trace.jsonl.gz --commands-out cmds.json
+  python trace_replay.py trace.jsonl.gz --expect cmds.json   # 제어 결정이 바뀌면 종료 코드 1
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+# 🔹 main import 전에 설정: 하드웨어 없이 생성, 보관/기록 파일은 임시 경로
+TMP_DIR = tempfile.mkdtemp(prefix="trace_replay_")
+os.environ["HARDWARE_BACKEND"] = "sim"
+os.environ["OUTBOX_FILE"] = os.path.join(TMP_DIR, "outbox.db")
+os.environ["TRACE_FILE"] = ""
+
+from metrics import LatencyHistogram, format_summary, timed
+from sensor_trace import read_trace
+
+SKIP_CONTROLS = {"webcamStream", "getStatus"}  # 소켓 응답만 하는 제어 (재생에서 무시)
+
+
+class ReplayClock:
+    """기록 시각을 돌려주는 시계 (sleep 없음)"""
+    speed = float("inf")
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        pass
+
+
+class ReplayPoller:
+    """SensorPoller 대신 기록된 최신값 테이블 제공"""
+
+    def __init__(self):
+        self.latest = {}
+
+    def snapshot(self):
+        return dict(self.latest)
+
+
+class ReplayMotion:
+    def __init__(self):
+        self.last_motion_time = 0
+        self._delivered = 0
+
+    def get_events(self):
+        """기록된 감지 시각이 바뀌었으면 이벤트 하나로 전달 (MotionSensor.get_events 와 같은 형태)"""
+        if self.last_motion_time > self._delivered:
+            self._delivered = self.last_motion_time
+            return [self.last_motion_time]
+        return []
+
+
+class ReplayPipeline:
+    """run_prediction_pipeline 을 스레드 대신 재생 틱마다 동기로 한 단계씩 실행
+    - AI 모드가 된 틱에 시작: start_training(force=True) 후 다음 센서 행부터 셈
+    - 이후 prediction_due 로 판단해 새 센서 행 PREDICTION_EVERY 개마다 step 실행
+    - 모드 종료(stop_prediction) 후 다시 AI 모드가 되면 처음부터 다시 시작
+    """
+
+    def __init__(self, predict_func, step):
+        self.predict_func = predict_func
+        self.step = step
+        self.target = None  # 다음 예측 목표 행 수 (정지 상태면 None)
+        self.starts = 0
+
+    @staticmethod
+    def is_alive():
+        # sensor_tick 이 실제 예측 스레드를 띄우지 않도록
+        return True
+
+    def tick(self, shared_prediction, ai_mode):
+        """sensor_tick 직후 호출, 이번 틱에 예측했으면 True"""
+        pf = self.predict_func
+        if not ai_mode:
+            self.target = None
+            return False
+        if self.target is None or pf.stop_prediction:
+            pf.stop_prediction = False
+            pf.start_training(force=True)
+            self.target = pf.sensor_history.total + 1
+            self.starts += 1
+            return False
+        due, self.target = pf.prediction_due(self.target, pf.sensor_history.total)
+        if due:
+            self.step(shared_prediction)
+        return due
+
+
+class CommandLog:
+    def __init__(self, clock):
+        self.clock = clock
+        self.start = None
+        self.commands = []  # [기록 시작 후 초, 장치, 값]
+        self.state = {}
+
+    def log(self, device, value):
+        if self.state.get(device) == value:
+            return
+        self.state[device] = value
+        self.commands.append([round(self.clock.time() - self.start, 3), device, value])
+
+
+class ReplayFan:
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def set_speed(self, level):
+        self.log.log(self.name, level)
+
+    def cleanup(self):
+        pass
+
+
+class ReplayUltrasonic:
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def turn_on(self):
+        self.log.log(self.name, True)
+
+    def turn_off(self):
+        self.log.log(self.name, False)
+
+    def cleanup(self):
+        pass
+
+
+def replay(records, predict=True, verbose=False):
+    """기록을 main.py 루프에 재생, (단계별 히스토그램, 명령 순서, 통계) 반환"""
+    import main
+    from ai import predict_func
+    from ai.telemetry_store import TelemetryStore
+    from ai.train_worker import NullTrainingWorker
+
+    clock = ReplayClock()
+    poller = ReplayPoller()
+    motion = ReplayMotion()
+    log = CommandLog(clock)
+
+    # 🔹 main/predict_func 의 하드웨어, 시계, 전송, 저장소를 재생용으로 교체
+    main.clock = clock
+    main.sensor_poller = poller
+    main.motion = motion
+    main.fan1, main.fan2 = ReplayFan(log, "fan1"), ReplayFan(log, "fan2")
+    main.ultrasonic1, main.ultrasonic2 = ReplayUltrasonic(log, "ultrasonic1"), ReplayUltrasonic(log, "ultrasonic2")
+    predict_func.telemetry_store = TelemetryStore(os.path.join(TMP_DIR, "telemetry"))
+    # 파이프라인 시작/낮은 결정계수 때 요청되는 재학습은 실제 모델 파일을 덮어쓰므로 횟수만 셈
+    predict_func.training_worker = NullTrainingWorker()
+    predict_func.sensor_history.clear()
+
+    stages = {name: LatencyHistogram() for name in
+              ["collect_sensor_data", "collect_data", "predict", "drive_by_ai", "send_sensor_data", "tick"]}
+    main.collect_sensor_data = timed(main.collect_sensor_data, stages["collect_sensor_data"])
+    predict_func.collect_data = timed(predict_func.collect_data, stages["collect_data"])
+    main.drive_by_ai = timed(main.drive_by_ai, stages["drive_by_ai"])
+    # 네트워크 대신 전송 인코딩까지만 실행
+    main.send_sensor_data = timed(main.telemetry_encoder.encode, stages["send_sensor_data"])
+    sensor_tick = timed(main.sensor_tick, stages["tick"])
+    pipeline = ReplayPipeline(predict_func, timed(predict_func.prediction_step, stages["predict"]))
+    main.prediction_thread = pipeline
+
+    can_predict = predict and predict_func.model_holder.get() is not None
+    stats = {"records": len(records), "ticks": 0, "controls": 0, "restarts": 0, "predictions": 0, "model": can_predict}
+
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    started = time.perf_counter()
+    with quiet:
+        for record in records:
+            clock.now = record["t"]
+            if log.start is None:
+                log.start = clock.now
+            kind = record["k"]
+            if kind == "sensor":
+                poller.latest[record["n"]] = record["d"]
+            elif kind == "control" or kind == "status":
+                controls = [record["d"]] if kind == "control" else [
+                    {"device": device, "state": state} for device, state in record["d"].items()]
+                for control in controls:
+                    if control.get("device") not in SKIP_CONTROLS:
+                        main.on_control(control)
+                        stats["controls"] += 1
+            elif kind == "meta":
+                stats["restarts"] += 1
+            elif kind == "tick":
+                motion.last_motion_time = record["d"].get("motion") or 0
+                sensor_tick()
+                stats["ticks"] += 1
+                # 🔹 run_prediction_pipeline 과 같은 흐름으로 예측 (결과는 다음 틱부터 반영)
+                if can_predict:
+                    try:
+                        stats["predictions"] += pipeline.tick(main.latest_prediction, main.purifier_mode == 1)
+                    except Exception as e:
+                        # 저장된 모델이 현재 특성 구성과 맞지 않는 경우 등 → 예측 없이 계속
+                        stats["predict_error"] = str(e)
+                        can_predict = False
+    stats["wall_s"] = time.perf_counter() - started
+    stats["trace_s"] = clock.now - (log.start or clock.now)
+    stats["pipeline_starts"] = pipeline.starts
+    stats["training_requests"] = predict_func.training_worker.requests
+    return stages, log.commands, stats
+
+
+def compare_commands(expected, actual):
+    """처음으로 달라진 명령 위치 (같으면 None)"""
+    for idx, (a, b) in enumerate(zip(expected, actual)):
+        if a != b:
+            return idx
+    return None if len(expected) == len(actual) else min(len(expected), len(actual))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="센서/제어 기록을 main.py 루프에 최대 속도로 재생")
+    parser.add_argument("trace", help="TRACE_FILE 로 기록한 .jsonl.gz")
+    parser.add_argument("--no-predict", action="store_true", help="모델 예측 단계 생략")
+    parser.add_argument("--commands-out", help="명령 순서를 JSON 으로 저장")
+    parser.add_argument("--expect", help="이전 --commands-out 결과와 비교 (다르면 종료 코드 1)")
+    parser.add_argument("--show", type=int, default=20, help="출력할 명령 수")
+    parser.add_argument("--verbose", action="store_true", help="루프의 print 출력 표시")
+    args = parser.parse_args()
+
+    records = read_trace(args.trace)
+    stages, commands, stats = replay(records, predict=not args.no_predict, verbose=args.verbose)
+
+    wall = stats["wall_s"]
+    print(f"📼 {args.trace}: 레코드 {stats['records']}건, 틱 {stats['ticks']}회, 제어 {stats['controls']}건, "
+          f"기록 시작 {stats['restarts']}회, 기록 구간 {stats['trace_s'] / 3600:.2f}시간")
+    print(f"⚡ 처리량: {stats['ticks'] / wall:,.0f} 틱/s, {stats['records'] / wall:,.0f} 레코드/s "
+          f"(총 {wall:.2f}s, 실시간 대비 x{stats['trace_s'] / wall:,.0f})")
+    if not stats["model"]:
+        print("⚠️ 모델 없음 또는 --no-predict: 예측 단계 생략")
+    else:
+        print(f"🔹 예측 {stats['predictions']}회, 파이프라인 시작 {stats['pipeline_starts']}회, "
+              f"재학습 요청 {stats['training_requests']}회 (실행 안 함)")
+        if "predict_error" in stats:
+            print(f"⚠️ 예측 실패로 {stats['predictions']}회 이후 예측 단계 생략: {stats['predict_error']}")
+    for name, histogram in stages.items():
+        if histogram.count:
+            print(format_summary(name, histogram))
+
+    print(f"🔹 명령 {len(commands)}건")
+    for offset, device, value in commands[:args.show]:
+        print(f"  +{offset:10.1f}s  {device:>12} → {value}")
+    if len(commands) > args.show:
+        print(f"  ... ({len(commands) - args.show}건 생략)")
+
+    if args.commands_out:
+        with open(args.commands_out, "w") as f:
+            json.dump(commands, f)
+        print(f"✅ 명령 순서 저장: {args.commands_out}")
+
+    if args.expect:
+        with open(args.expect) as f:
+            expected = json.load(f)
+        idx = compare_commands(expected, commands)
+        if idx is None:
+            print(f"✅ 명령 순서 일치 ({len(commands)}건)")
+        else:
+            print(f"❌ 명령 순서 불일치: {idx}번째 기대 {expected[idx:idx + 1]} / 실제 {commands[idx:idx + 1]}")
+            sys.exit(1)
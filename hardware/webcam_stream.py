@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+WEBCAM_STREAM_MAX_FPS = float(os.getenv("WEBCAM_STREAM_MAX_FPS", "10"))
+WEBCAM_STREAM_DEFAULT_FPS = float(os.getenv("WEBCAM_STREAM_DEFAULT_FPS", "5"))
+WEBCAM_STREAM_MAX_PENDING = int(os.getenv("WEBCAM_STREAM_MAX_PENDING", "2"))
+
+
+class WebcamStreamer:
+    def __init__(self, frame_broker, emit, pending=None, max_fps=WEBCAM_STREAM_MAX_FPS, max_pending=WEBCAM_STREAM_MAX_PENDING):
+        """웹캠 연속 전송 (소켓 채널 재사용)
+        - frame_broker 의 최신 프레임 JPEG 을 정해진 fps 로 emit(seq, jpeg) 호출
+        - 같은 프레임(seq)은 다시 보내지 않음
+        - pending() 이 max_pending 을 넘으면(소켓 송신 대기 패킷이 쌓이면) 그 프레임은 보내지 않고 버림
+          → 네트워크가 느려도 송신 큐가 무한히 늘어나지 않음
+        - 전송 스레드마다 자기 정지 이벤트를 가짐 → stop() 직후 start() 해도 종료 중인 이전 스레드를 기다리지 않고 새로 시작
+        """
+        self.frame_broker = frame_broker
+        self.emit = emit
+        self.pending = pending or (lambda: 0)
+        self.max_fps = max_fps
+        self.max_pending = max_pending
+
+        self.fps = 0  # 0 이면 정지
+        self.sent = 0
+        self.dropped = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def negotiate(self, requested):
+        """요청 fps → 실제 fps (True 는 기본값, 0/False 는 정지, 최대 max_fps)"""
+        if requested is True:
+            return min(WEBCAM_STREAM_DEFAULT_FPS, self.max_fps)
+        try:
+            requested = float(requested or 0)
+        except (TypeError, ValueError):
+            return 0
+        return max(0, min(requested, self.max_fps))
+
+    def start(self, requested=True):
+        fps = self.negotiate(requested)
+        if fps <= 0:
+            self.stop()
+            return 0
+        self.fps = fps
+        if not self.running:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), name="webcam-stream", daemon=True)
+            self._thread.start()
+        print(f"🎥 웹캠 스트리밍 {fps:g}fps")
+        return fps
+
+    def stop(self):
+        if self.running:
+            print(f"🎥 웹캠 스트리밍 종료 (전송 {self.sent}, 버림 {self.dropped})")
+        self.fps = 0
+        self._stop.set()
+
+    def _run(self, stop):
+        last_seq = None
+        next_time = time.monotonic()
+        while not stop.is_set():
+            interval = 1.0 / self.fps if self.fps else 1.0
+            next_time = max(next_time + interval, time.monotonic())
+
+            # 🔹 송신 대기 패킷이 쌓여 있으면 이번 프레임은 버림 (큐에 쌓지 않음)
+            if self.pending() > self.max_pending:
+                self.dropped += 1
+            else:
+                seq, jpeg = self.frame_broker.get_jpeg(wait=interval)
+                if jpeg is not None and seq != last_seq:
+                    try:
+                        self.emit(seq, jpeg)
+                        self.sent += 1
+                        last_seq = seq
+                    except Exception as e:
+                        print("❌ 스트리밍 프레임 전송 실패:", e)
+
+            stop.wait(max(0, next_time - time.monotonic()))
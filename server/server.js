@@ -48,6 +48,25 @@ io.on("connection", (socket) => {
     }
   });
 
+  // 3️⃣-1 연결이 끊긴 동안 보관된 센서 데이터 (원래 측정 시각 포함 배치)
+  // 서버 측 전용: 대시보드는 실시간 값과 최근 60초 차트만 그리므로 과거 시각 데이터는 전달하지 않음
+  // (이력 저장이 필요하면 여기서 records 를 저장한 뒤 ack)
+  socket.on("sensor_data_batch", (data, ack) => {
+    const { device_key, records = [] } = data;
+    console.log(`📦 보관 데이터 수신: ${device_key} ${records.length}건`);
+    if (typeof ack === "function") ack(true);
+  });
+
+  // 3️⃣-2 디바이스 메인 루프 단계별 지연/기한 초과 통계
+  socket.on("device_metrics", (data) => {
+    const { device_key } = data;
+    for (const [clientId, key] of dashboards.entries()) {
+      if (key === device_key) {
+        io.to(clientId).emit("deviceMetrics", data);
+      }
+    }
+  });
+
   // 4️⃣ 대시보드 → 디바이스 제어
   socket.on("control", ({ device, state }) => {
     const device_key = dashboards.get(socket.id);